@@ -15,6 +15,7 @@ from ._helpers import dump_request
 from ._helpers import get_network
 from ._helpers import too_many_requests
 from . import config
+from . import link_token
 from . import valkeydb
 from .trusted_proxies import ProxyFix
 
@@ -23,3 +24,4 @@ def init(cfg: config.Config, valkey_client: valkey.Valkey | None):
     config.set_global_cfg(cfg)
     if valkey_client:
         valkeydb.set_valkey_client(valkey_client)
+        link_token.clear_cache()
@@ -1,9 +1,14 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # pylint: disable=missing-module-docstring, invalid-name
 
+import functools
+import threading
+import time
 import typing as t
 
-__all__ = ["log_error_only_once", "dump_request", "get_network", "logger", "too_many_requests"]
+from collections import OrderedDict
+
+__all__ = ["log_error_only_once", "dump_request", "get_network", "logger", "too_many_requests", "TTLCache"]
 
 from ipaddress import (
     IPv4Network,
@@ -72,11 +77,70 @@ def get_network(real_ip: IPv4Address | IPv6Address, cfg: "config.Config") -> IPv
     prefix: int = cfg["botdetection.ipv4_prefix"]
     if real_ip.version == 6:
         prefix = cfg["botdetection.ipv6_prefix"]
-    network = ip_network(f"{real_ip}/{prefix}", strict=False)
+    network = _ip_network(real_ip, prefix)
     # logger.debug("get_network(): %s", network.compressed)
     return network
 
 
+@functools.lru_cache(maxsize=4096)
+def _ip_network(real_ip: IPv4Address | IPv6Address, prefix: int) -> IPv4Network | IPv6Network:
+    # The network of a client is needed several times in a request (e.g. the
+    # limiter and the link_token method), the networks are immutable and are
+    # parsed once per (client) IP.
+    return ip_network(f"{real_ip}/{prefix}", strict=False)
+
+
+class TTLCache:
+    """Worker-local (in-process) LRU cache with a *time to live* of the
+    items, used to avoid round trips to the valkey DB for values that do not
+    change (or whose change is not relevant) within a few seconds.
+
+    The cache is not shared between the workers, a value that is changed in the
+    valkey DB by another worker is seen (at the latest) after ``ttl`` seconds.
+    Values that are changed by the worker itself have to be invalidated
+    explicitly (:py:obj:`TTLCache.delete`, :py:obj:`TTLCache.clear`).
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+        self._lock: threading.Lock = threading.Lock()
+        # key --> (value, expire time / time.monotonic)
+        self._items: OrderedDict[t.Hashable, tuple[t.Any, float]] = OrderedDict()
+
+    def get(self, key: t.Hashable, default: t.Any = None) -> t.Any:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return default
+            if item[1] < time.monotonic():
+                del self._items[key]
+                return default
+            self._items.move_to_end(key)
+            return item[0]
+
+    def set(self, key: t.Hashable, value: t.Any, ttl: float | None = None):
+        """Stores ``value`` under ``key``, the item expires after ``ttl``
+        seconds (not longer than :py:obj:`TTLCache.ttl`)."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            self._items[key] = (value, time.monotonic() + ttl)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def delete(self, key: t.Hashable):
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
 _logged_errors: list[str] = []
 
 
@@ -107,6 +107,7 @@ class Config:
         self.cfg_schema: dict[str, typing.Any] = cfg_schema
         self.deprecated: dict[str, str] = deprecated
         self.cfg: dict[str, typing.Any] = copy.deepcopy(cfg_schema)
+        self._compiled: dict[tuple[str, typing.Callable[..., typing.Any]], typing.Any] = {}
 
     def __getitem__(self, key: str) -> typing.Any:
         return self.get(key)
@@ -121,6 +122,7 @@ class Config:
         """Update this configuration by ``upd_cfg``."""
 
         dict_deepupdate(self.cfg, upd_cfg)
+        self._compiled.clear()
 
     def default(self, name: str):
         """Returns default value of field ``name`` in ``self.cfg_schema``."""
@@ -152,6 +154,28 @@ class Config:
         """
         parent = self._get_parent_dict(name)
         parent[name.split('.')[-1]] = val
+        self._compiled.clear()
+
+    def compiled(
+        self,
+        name: str,
+        factory: typing.Callable[[typing.Any, str], typing.Any],
+        default: typing.Any = UNSET,
+    ) -> typing.Any:
+        """Returns the object ``factory(value, name)`` compiled from the value
+        to which ``name`` points in the configuration (e.g. a
+        :py:obj:`searx.botdetection.ip_matcher.IPMatcher` from a list of
+        networks).
+
+        The object is compiled once and cached until the configuration is
+        changed by :py:obj:`Config.set` or :py:obj:`Config.update`.
+        """
+        key = (name, factory)
+        obj = self._compiled.get(key, UNSET)
+        if obj is UNSET:
+            obj = factory(self.get(name, default), name)
+            self._compiled[key] = obj
+        return obj
 
     def _get_parent_dict(self, name: str) -> dict[str, typing.Any]:
         parent_name = '.'.join(name.split('.')[:-1])
@@ -32,6 +32,37 @@ for a longer time.  IPs stored in this sliding window have a maximum of
 makes a request that is not suspicious, the sliding window for this IP is
 dropped.
 
+All sliding windows and the ping of the :py:obj:`.link_token` method are
+evaluated by one Lua script (:py:obj:`FILTER_REQUEST`), a request costs one
+round trip to the valkey DB.
+
+By default the sliding windows are *logs*: each request of a network is stored
+in the valkey DB until it leaves the window, the memory required for a network
+grows with its request rate (in the :py:obj:`SUSPICIOUS_IP_WINDOW` and
+:py:obj:`API_WINDOW` for up to hours).  Instances with a high load can switch
+to *approximate* sliding windows with constant memory per network:
+
+.. code:: toml
+
+   [botdetection.ip_limit]
+   sliding_window = "approximate"
+
+An approximate sliding window is a HASH_ with the index of the current fixed
+window (``i``), the count of the current window (``c``) and the count of the
+previous window (``p``).  The number of requests in the sliding window is
+estimated by weighting the count of the previous window by the part that
+overlaps with the sliding window::
+
+  p * (1 - elapsed / window) + c
+
+The approximation assumes that the requests in the previous window are evenly
+distributed, a burst at the end of the previous window is slightly
+under-estimated, a burst at the beginning over-estimated.  Other values than
+``"log"`` and ``"approximate"`` (:py:obj:`SLIDING_WINDOWS`) are rejected when
+the configuration is loaded.
+
+.. _HASH: https://valkey.io/topics/hashes/
+
 .. _X-Forwarded-For:
    https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/X-Forwarded-For
 
@@ -45,7 +76,7 @@ from ipaddress import (
 import flask
 import werkzeug
 
-from searx.valkeylib import incr_sliding_window, drop_counter
+from searx.valkeylib import lua_script_storage, counter_key
 
 from . import link_token
 from . import config
@@ -88,6 +119,98 @@ SUSPICIOUS_IP_WINDOW = 3600 * 24 * 30
 SUSPICIOUS_IP_MAX = 3
 """Maximum requests from one suspicious IP in the :py:obj:`SUSPICIOUS_IP_WINDOW`."""
 
+SLIDING_WINDOWS = ("log", "approximate")
+"""Implementations of the sliding windows (``botdetection.ip_limit.sliding_window``)."""
+
+
+FILTER_REQUEST = """
+local api = tonumber(ARGV[1])
+local link_token = tonumber(ARGV[2])
+local ping_live_time = tonumber(ARGV[3])
+local api_window, api_max = tonumber(ARGV[4]), tonumber(ARGV[5])
+local suspicious_ip_window, suspicious_ip_max = tonumber(ARGV[6]), tonumber(ARGV[7])
+local burst_window, burst_max, burst_max_suspicious = tonumber(ARGV[8]), tonumber(ARGV[9]), tonumber(ARGV[10])
+local long_window, long_max, long_max_suspicious = tonumber(ARGV[11]), tonumber(ARGV[12]), tonumber(ARGV[13])
+local approximate = tonumber(ARGV[14])
+
+local current_time = redis.call('TIME')
+local now = tonumber(current_time[1]) + tonumber(current_time[2]) / 1000000
+
+local function incr_approx_sliding_window(name, window)
+    local index = math.floor(now / window)
+    local state = redis.call('HMGET', name, 'i', 'c', 'p')
+    local i, c, p = tonumber(state[1]), tonumber(state[2]) or 0, tonumber(state[3]) or 0
+    if i ~= index then
+        if i == index - 1 then p = c else p = 0 end
+        c = 0
+    end
+    c = c + 1
+    redis.call('HSET', name, 'i', index, 'c', c, 'p', p)
+    redis.call('EXPIRE', name, 2 * window)
+    return math.floor(p * (1 - (now % window) / window) + c)
+end
+
+local function incr_sliding_window(name, expire)
+    if approximate == 1 then
+        return incr_approx_sliding_window(name, expire)
+    end
+    redis.call('ZREMRANGEBYSCORE', name, 0, current_time[1] - expire)
+    redis.call('ZADD', name, current_time[1], current_time[1] .. current_time[2])
+    local result = redis.call('ZCOUNT', name, 0, current_time[1] + 1)
+    redis.call('EXPIRE', name, expire)
+    return result
+end
+
+if api == 1 and incr_sliding_window(KEYS[1], api_window) > api_max then
+    return {1, 0}
+end
+
+if link_token == 1 then
+    if redis.call('GET', KEYS[2]) then
+        redis.call('SET', KEYS[2], 1, 'EX', ping_live_time)
+        redis.call('DEL', KEYS[3])
+        return {0, 0}
+    end
+    if incr_sliding_window(KEYS[3], suspicious_ip_window) > suspicious_ip_max then
+        return {2, 1}
+    end
+    if incr_sliding_window(KEYS[4], burst_window) > burst_max_suspicious then
+        return {3, 1}
+    end
+    if incr_sliding_window(KEYS[5], long_window) > long_max_suspicious then
+        return {4, 1}
+    end
+    return {0, 1}
+end
+
+if incr_sliding_window(KEYS[4], burst_window) > burst_max then
+    return {5, 0}
+end
+if incr_sliding_window(KEYS[5], long_window) > long_max then
+    return {6, 0}
+end
+return {0, 0}
+"""
+"""Lua script that evaluates all sliding windows of the ``ip_limit`` method and
+the ping of the :py:obj:`.link_token` method in one call (one round trip to the
+valkey DB).  The sliding windows are *logs* as in
+:py:obj:`searx.valkeylib.INCR_SLIDING_WINDOW` or (``sliding_window =
+"approximate"``) HASHes with the counts of the current and the previous window.
+
+The script returns the *verdict* and whether the request is *suspicious*, a
+verdict other than ``0`` means the request is blocked (see
+:py:obj:`VERDICT_MESSAGES`)."""
+
+VERDICT_MESSAGES = {
+    1: "too many request in API_WINDOW",
+    2: "too many request in SUSPICIOUS_IP_WINDOW",
+    3: "too many request in BURST_WINDOW (BURST_MAX_SUSPICIOUS)",
+    4: "too many request in LONG_WINDOW (LONG_MAX_SUSPICIOUS)",
+    5: "too many request in BURST_WINDOW (BURST_MAX)",
+    6: "too many request in LONG_WINDOW (LONG_MAX)",
+}
+"""Messages of the verdicts returned by :py:obj:`FILTER_REQUEST`."""
+
 
 def filter_request(
     network: IPv4Network | IPv6Network,
@@ -95,54 +218,63 @@ def filter_request(
     cfg: config.Config,
 ) -> werkzeug.Response | None:
 
-    # pylint: disable=too-many-return-statements
     valkey_client = valkeydb.get_valkey_client()
 
     if network.is_link_local and not cfg['botdetection.ip_limit.filter_link_local']:
         logger.debug("network %s is link-local -> not monitored by ip_limit method", network.compressed)
         return None
 
-    if request.args.get('format', 'html') != 'html':
-        c = incr_sliding_window(valkey_client, 'ip_limit.API_WINDOW:' + network.compressed, API_WINDOW)
-        if c > API_MAX:
-            return too_many_requests(network, "too many request in API_WINDOW")
-
-    if cfg['botdetection.ip_limit.link_token']:
-
-        suspicious = link_token.is_suspicious(network, request, True)
-
-        if not suspicious:
-            # this IP is no longer suspicious: release ip again / delete the counter of this IP
-            drop_counter(valkey_client, 'ip_limit.SUSPICIOUS_IP_WINDOW' + network.compressed)
-            return None
-
-        # this IP is suspicious: count requests from this IP
-        c = incr_sliding_window(
-            valkey_client, 'ip_limit.SUSPICIOUS_IP_WINDOW' + network.compressed, SUSPICIOUS_IP_WINDOW
-        )
-        if c > SUSPICIOUS_IP_MAX:
-            logger.error("BLOCK: too many request from %s in SUSPICIOUS_IP_WINDOW (redirect to /)", network)
-            response = flask.redirect(flask.url_for('index'), code=302)
-            response.headers["Cache-Control"] = "no-store, max-age=0"
-            return response
-
-        c = incr_sliding_window(valkey_client, 'ip_limit.BURST_WINDOW' + network.compressed, BURST_WINDOW)
-        if c > BURST_MAX_SUSPICIOUS:
-            return too_many_requests(network, "too many request in BURST_WINDOW (BURST_MAX_SUSPICIOUS)")
-
-        c = incr_sliding_window(valkey_client, 'ip_limit.LONG_WINDOW' + network.compressed, LONG_WINDOW)
-        if c > LONG_MAX_SUSPICIOUS:
-            return too_many_requests(network, "too many request in LONG_WINDOW (LONG_MAX_SUSPICIOUS)")
-
+    api = request.args.get('format', 'html') != 'html'
+    use_link_token = bool(cfg['botdetection.ip_limit.link_token'])
+    # the ping-key is not used by the script if the link_token method is off
+    ping_key = link_token.get_ping_key(network, request) if use_link_token else link_token.PING_KEY
+    approximate = cfg['botdetection.ip_limit.sliding_window'] == 'approximate'
+    # the counters of the approximate windows are HASHes, not sorted sets: they
+    # need their own keys (switching the implementation starts new windows)
+    prefix = 'ip_limit.approximate.' if approximate else 'ip_limit.'
+
+    script = lua_script_storage(valkey_client, FILTER_REQUEST)
+    verdict, suspicious = script(
+        keys=[
+            counter_key(prefix + 'API_WINDOW:' + network.compressed),
+            ping_key,
+            counter_key(prefix + 'SUSPICIOUS_IP_WINDOW' + network.compressed),
+            counter_key(prefix + 'BURST_WINDOW' + network.compressed),
+            counter_key(prefix + 'LONG_WINDOW' + network.compressed),
+        ],
+        args=[
+            int(api),
+            int(use_link_token),
+            link_token.PING_LIVE_TIME,
+            API_WINDOW,
+            API_MAX,
+            SUSPICIOUS_IP_WINDOW,
+            SUSPICIOUS_IP_MAX,
+            BURST_WINDOW,
+            BURST_MAX,
+            BURST_MAX_SUSPICIOUS,
+            LONG_WINDOW,
+            LONG_MAX,
+            LONG_MAX_SUSPICIOUS,
+            int(approximate),
+        ],
+    )
+
+    if use_link_token and verdict != 1:
+        if suspicious:
+            logger.info("missing ping (IP: %s) / request: %s", network.compressed, ping_key)
+        else:
+            logger.debug("found ping for (client) network %s -> %s", network.compressed, ping_key)
+            # the script has renewed the ping
+            link_token.LOCAL_CACHE.set(ping_key, True)
+
+    if verdict == 0:
         return None
 
-    # vanilla limiter without extensions counts BURST_MAX and LONG_MAX
-    c = incr_sliding_window(valkey_client, 'ip_limit.BURST_WINDOW' + network.compressed, BURST_WINDOW)
-    if c > BURST_MAX:
-        return too_many_requests(network, "too many request in BURST_WINDOW (BURST_MAX)")
-
-    c = incr_sliding_window(valkey_client, 'ip_limit.LONG_WINDOW' + network.compressed, LONG_WINDOW)
-    if c > LONG_MAX:
-        return too_many_requests(network, "too many request in LONG_WINDOW (LONG_MAX)")
+    if verdict == 2:
+        logger.error("BLOCK: too many request from %s in SUSPICIOUS_IP_WINDOW (redirect to /)", network)
+        response = flask.redirect(flask.url_for('index'), code=302)
+        response.headers["Cache-Control"] = "no-store, max-age=0"
+        return response
 
-    return None
+    return too_many_requests(network, VERDICT_MESSAGES[verdict])
@@ -22,19 +22,24 @@ The ``ip_lists`` method implements :py:obj:`block-list <block_ip>` and
      '257.1.1.1',       # invalid IP --> will be ignored, logged in ERROR class
    ]
 
+The lists are compiled into a :py:obj:`IPMatcher
+<searx.botdetection.ip_matcher.IPMatcher>` once (and again when the
+configuration is changed), the costs of a lookup do not depend on the length of
+the lists: long lists (e.g. the ranges of data centers) can be used.
+
 """
 # pylint: disable=unused-argument
 
 
 from typing import Tuple
 from ipaddress import (
-    ip_network,
     IPv4Address,
     IPv6Address,
 )
 
 from . import config
 from ._helpers import logger
+from .ip_matcher import IPMatcher
 
 logger = logger.getChild('ip_limit')
 
@@ -45,6 +50,8 @@ SEARXNG_ORG = [
 ]
 """Passlist of IPs from the SearXNG organization, e.g. `check.searx.space`."""
 
+SEARXNG_ORG_MATCHER = IPMatcher(SEARXNG_ORG, "SEARXNG_ORG")
+
 
 def pass_ip(real_ip: IPv4Address | IPv6Address, cfg: config.Config) -> Tuple[bool, str]:
     """Checks if the IP on the subnet is in one of the members of the
@@ -52,10 +59,9 @@ def pass_ip(real_ip: IPv4Address | IPv6Address, cfg: config.Config) -> Tuple[boo
     """
 
     if cfg.get('botdetection.ip_lists.pass_searxng_org', default=True):
-        for net in SEARXNG_ORG:
-            net = ip_network(net, strict=False)
-            if real_ip.version == net.version and real_ip in net:
-                return True, f"IP matches {net.compressed} in SEARXNG_ORG list."
+        net = SEARXNG_ORG_MATCHER.match(real_ip)
+        if net is not None:
+            return True, f"IP matches {net.compressed} in SEARXNG_ORG list."
     return ip_is_subnet_of_member_in_list(real_ip, 'botdetection.ip_lists.pass_ip', cfg)
 
 
@@ -73,12 +79,7 @@ def block_ip(real_ip: IPv4Address | IPv6Address, cfg: config.Config) -> Tuple[bo
 def ip_is_subnet_of_member_in_list(
     real_ip: IPv4Address | IPv6Address, list_name: str, cfg: config.Config
 ) -> Tuple[bool, str]:
-    for net in cfg.get(list_name, default=[]):
-        try:
-            net = ip_network(net, strict=False)
-        except ValueError:
-            logger.error("invalid IP %s in %s", net, list_name)
-            continue
-        if real_ip.version == net.version and real_ip in net:
-            return True, f"IP matches {net.compressed} in {list_name}."
+    net = cfg.compiled(list_name, IPMatcher, default=[]).match(real_ip)
+    if net is not None:
+        return True, f"IP matches {net.compressed} in {list_name}."
     return False, f"IP is not a member of an item in the f{list_name} list"
@@ -0,0 +1,88 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Matcher to look up an IP in a (large) list of networks, used for the
+:ref:`botdetection.ip_lists` and the ``botdetection.trusted_proxies``.
+
+A matcher is compiled once from the list of a :py:obj:`config.Config
+<searx.botdetection.config.Config>`: :py:obj:`Config.compiled
+<searx.botdetection.config.Config.compiled>` caches the matcher and builds a new
+one when the configuration is changed.
+
+.. code:: python
+
+   matcher = cfg.compiled('botdetection.ip_lists.pass_ip', IPMatcher, default=[])
+   net = matcher.match(real_ip)
+
+"""
+
+from __future__ import annotations
+
+__all__ = ["IPMatcher"]
+
+import logging
+import typing as t
+
+from ipaddress import (
+    IPv4Address,
+    IPv6Address,
+    IPv4Network,
+    IPv6Network,
+    ip_network,
+)
+
+log = logging.getLogger(__name__)
+
+ADDRESS_BITS = {4: 32, 6: 128}
+
+
+class IPMatcher:
+    """Longest prefix match of an IP address in a list of networks.
+
+    The networks are compiled into one hash table per IP version and prefix
+    length, the key of a table is the (integer) network address.  To look up an
+    address, the address is masked by the prefix lengths of the tables, from the
+    longest to the shortest prefix.  A lookup costs at most one dict lookup per
+    distinct prefix length in the list (not more than 33 for IPv4 / 129 for IPv6),
+    independent of the number of networks in the list.
+
+    Invalid items in the list are logged (once) and ignored.
+    """
+
+    def __init__(self, networks: t.Iterable[str | IPv4Network | IPv6Network] = (), name: str = "networks"):
+        self.name = name
+        tables: dict[int, dict[int, dict[int, IPv4Network | IPv6Network]]] = {4: {}, 6: {}}
+
+        for net in networks:
+            try:
+                net = ip_network(net, strict=False)
+            except ValueError:
+                log.error("invalid IP %s in %s", net, name)
+                continue
+            tables[net.version].setdefault(net.prefixlen, {})[int(net.network_address)] = net
+
+        self._len: int = sum(len(table) for by_prefix in tables.values() for table in by_prefix.values())
+        self._tables: dict[int, list[tuple[int, dict[int, IPv4Network | IPv6Network]]]] = {}
+        for version, by_prefix in tables.items():
+            bits = ADDRESS_BITS[version]
+            self._tables[version] = [
+                (((1 << prefixlen) - 1) << (bits - prefixlen), by_prefix[prefixlen])
+                for prefixlen in sorted(by_prefix, reverse=True)
+            ]
+
+    def match(self, addr: IPv4Address | IPv6Address) -> IPv4Network | IPv6Network | None:
+        """Returns the longest network in the list that contains ``addr`` or
+        ``None`` if there is no such network in the list."""
+        i = int(addr)
+        for mask, table in self._tables[addr.version]:
+            net = table.get(i & mask)
+            if net is not None:
+                return net
+        return None
+
+    def __contains__(self, addr: IPv4Address | IPv6Address) -> bool:
+        return self.match(addr) is not None
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.name} ({self._len} networks)>"
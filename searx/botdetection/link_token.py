@@ -33,6 +33,11 @@ And in the HTML template from flask a stylesheet link is needed (the value of
 .. _X-Forwarded-For:
    https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/X-Forwarded-For
 
+The token is needed to render each page and the ping is sent with each page a
+client loads.  To avoid a round trip to the valkey DB for each of them, the
+current token and the recently stored pings are cached in the worker
+(:py:obj:`LOCAL_CACHE`) for :py:obj:`LOCAL_CACHE_TTL` seconds.
+
 """
 
 from ipaddress import (
@@ -42,12 +47,14 @@ from ipaddress import (
 )
 
 import string
+import typing
 import random
 import flask
 
 from searx.valkeylib import secret_hash
 
 from ._helpers import (
+    TTLCache,
     get_network,
     logger,
 )
@@ -67,9 +74,26 @@ PING_KEY = 'SearXNG_limiter.ping'
 TOKEN_KEY = 'SearXNG_limiter.token'
 """Key for which the current token is stored in the DB"""
 
+LOCAL_CACHE_TTL = 10
+"""Time (sec) the current token and the pings are cached in the worker."""
+
+LOCAL_CACHE = TTLCache(maxsize=10000, ttl=LOCAL_CACHE_TTL)
+"""Worker-local cache of the current token (:py:obj:`TOKEN_KEY`, not longer
+than the token lives in the valkey DB) and of the ping-keys this worker has
+stored in the valkey DB (a cached ping lives at least :py:obj:`PING_LIVE_TIME`
+minus :py:obj:`LOCAL_CACHE_TTL` seconds in the DB).  The cache is invalidated by
+:py:obj:`clear_cache`."""
+
 logger = logger.getChild('botdetection.link_token')
 
 
+def clear_cache():
+    """Drops the worker-local cache (:py:obj:`LOCAL_CACHE`), needed when the
+    tokens and pings in the valkey DB are dropped or the valkey DB is
+    changed."""
+    LOCAL_CACHE.clear()
+
+
 def is_suspicious(network: IPv4Network | IPv6Network, request: flask.Request, renew: bool = False):
     """Checks whether a valid ping is exists for this (client) network, if not
     this request is rated as *suspicious*.  If a valid ping exists and argument
@@ -77,14 +101,19 @@ def is_suspicious(network: IPv4Network | IPv6Network, request: flask.Request, re
     :py:obj:`PING_LIVE_TIME`.
 
     """
-    valkey_client = valkeydb.get_valkey_client()
     ping_key = get_ping_key(network, request)
+    if LOCAL_CACHE.get(ping_key):
+        logger.debug("found (cached) ping for (client) network %s -> %s", network.compressed, ping_key)
+        return False
+
+    valkey_client = valkeydb.get_valkey_client()
     if not valkey_client.get(ping_key):
         logger.info("missing ping (IP: %s) / request: %s", network.compressed, ping_key)
         return True
 
     if renew:
         valkey_client.set(ping_key, 1, ex=PING_LIVE_TIME)
+        LOCAL_CACHE.set(ping_key, True)
 
     logger.debug("found ping for (client) network %s -> %s", network.compressed, ping_key)
     return False
@@ -106,10 +135,14 @@ def ping(request: flask.Request, token: str):
     network = get_network(real_ip, cfg)
 
     ping_key = get_ping_key(network, request)
+    if LOCAL_CACHE.get(ping_key):
+        # the ping has been stored recently (by this worker)
+        return
     logger.debug(
         "store ping_key for (client) network %s (IP %s) -> %s", network.compressed, real_ip.compressed, ping_key
     )
     valkey_client.set(ping_key, 1, ex=PING_LIVE_TIME)
+    LOCAL_CACHE.set(ping_key, True)
 
 
 def get_ping_key(network: IPv4Network | IPv6Network, request: flask.Request) -> str:
@@ -127,19 +160,30 @@ def get_ping_key(network: IPv4Network | IPv6Network, request: flask.Request) ->
 
 def token_is_valid(token) -> bool:
     valid = token == get_token()
+    if not valid and LOCAL_CACHE.get(TOKEN_KEY):
+        # the cached token may be outdated, compare with the token from the DB
+        LOCAL_CACHE.delete(TOKEN_KEY)
+        valid = token == get_token()
     logger.debug("token is valid --> %s", valid)
     return valid
 
 
 def get_token() -> str:
     """Returns current token.  If there is no currently active token a new token
-    is generated randomly and stored in the Valkey DB.  Without without a
-    database connection, string "12345678" is returned.
+    is generated randomly and stored in the Valkey DB (``SET .. NX``: if
+    several workers generate a token at the same time, the first one stored
+    wins and is returned by all of them).  Without without a database
+    connection, string "12345678" is returned.
 
     - :py:obj:`TOKEN_LIVE_TIME`
     - :py:obj:`TOKEN_KEY`
 
+    The token is cached in the :py:obj:`LOCAL_CACHE`.
     """
+    token = LOCAL_CACHE.get(TOKEN_KEY)
+    if token:
+        return token
+
     try:
         valkey_client = valkeydb.get_valkey_client()
     except ValueError:
@@ -147,10 +191,22 @@ def get_token() -> str:
         # (see render function in webapp.py)
         return '12345678'
 
-    token = valkey_client.get(TOKEN_KEY)
-    if token:
-        token = token.decode('UTF-8')  # type: ignore
-    else:
+    def _get() -> list[typing.Any]:
+        # token and its remaining lifetime in one round trip
+        pipe = valkey_client.pipeline(transaction=False)
+        pipe.get(TOKEN_KEY)
+        pipe.ttl(TOKEN_KEY)
+        return pipe.execute()
+
+    value, ttl = _get()
+    if not value:
         token = ''.join(random.choices(string.ascii_lowercase + string.digits, k=16))
-        valkey_client.set(TOKEN_KEY, token, ex=TOKEN_LIVE_TIME)
+        ttl = TOKEN_LIVE_TIME
+        if not valkey_client.set(TOKEN_KEY, token, ex=TOKEN_LIVE_TIME, nx=True):
+            # another worker has stored a token in the meantime: use the winner
+            value, ttl = _get()
+    if value:
+        token = value.decode('UTF-8')  # type: ignore
+    if ttl > 0:
+        LOCAL_CACHE.set(TOKEN_KEY, token, ttl=ttl)
     return token
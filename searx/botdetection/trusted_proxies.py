@@ -7,11 +7,12 @@
 import typing as t
 
 from collections import abc
-from ipaddress import IPv4Address, IPv6Address, ip_address, ip_network, IPv4Network, IPv6Network
+from ipaddress import IPv4Address, IPv6Address, ip_address
 from werkzeug.http import parse_list_header
 
 from . import config
 from ._helpers import log_error_only_once, logger
+from .ip_matcher import IPMatcher
 
 if t.TYPE_CHECKING:
     from _typeshed.wsgi import StartResponse
@@ -58,29 +59,25 @@ class ProxyFix:
     def __init__(self, wsgi_app: "WSGIApplication") -> None:
         self.wsgi_app = wsgi_app
 
-    def trusted_proxies(self) -> list[IPv4Network | IPv6Network]:
+    def trusted_proxies(self) -> IPMatcher:
+        """Returns the (compiled) ``botdetection.trusted_proxies`` of the
+        global botdetection config."""
         cfg = config.get_global_cfg()
-        proxy_list: list[str] = cfg.get("botdetection.trusted_proxies", default=[])
-        return [ip_network(net, strict=False) for net in proxy_list]
+        return cfg.compiled("botdetection.trusted_proxies", IPMatcher, default=[])
 
     def is_trusted_proxy(
         self,
         addr: IPv4Address | IPv6Address | None,
-        trusted_proxies: list[IPv4Network | IPv6Network],
+        trusted_proxies: IPMatcher,
     ) -> bool:
         if addr is None:
             return False
-
-        for net in trusted_proxies:
-            if addr.version == net.version and addr in net:
-                return True
-
-        return False
+        return addr in trusted_proxies
 
     def trusted_remote_addr(
         self,
         x_forwarded_for: list[IPv4Address | IPv6Address],
-        trusted_proxies: list[IPv4Network | IPv6Network],
+        trusted_proxies: IPMatcher,
     ) -> str:
         # always rtl
         for addr in reversed(x_forwarded_for):
@@ -1,13 +1,25 @@
 """Implementation of caching solutions.
 
 - :py:obj:`searx.cache.ExpireCache` and its :py:obj:`searx.cache.ExpireCacheCfg`
+- :py:obj:`searx.cache.ExpireCacheSQLite`: cache in a SQLite DB (default)
+- :py:obj:`searx.cache.ExpireCacheValkey`: cache in the :ref:`Valkey DB
+  <settings valkey>`, shared by all SearXNG nodes connected to the DB
 
 ----
 """
 
-__all__ = ["ExpireCacheCfg", "ExpireCacheStats", "ExpireCache", "ExpireCacheSQLite"]
+__all__ = [
+    "ExpireCacheCfg",
+    "ExpireCacheCounters",
+    "ExpireCacheStats",
+    "ExpireCache",
+    "ExpireCacheSQLite",
+    "ExpireCacheValkey",
+]
 
 import abc
+import atexit
+from collections import OrderedDict
 from collections.abc import Iterator
 import dataclasses
 import datetime
@@ -15,15 +27,19 @@ import hashlib
 import hmac
 import os
 import pickle
+import re
 import sqlite3
 import string
 import tempfile
+import threading
 import time
 import typing
 
 import msgspec
+import valkey
 
 from searx import sqlitedb
+from searx import valkeydb
 from searx import logger
 from searx import get_setting
 
@@ -38,6 +54,12 @@ class ExpireCacheCfg(msgspec.Struct):  # pylint: disable=too-few-public-methods
     name: str
     """Name of the cache."""
 
+    backend: typing.Literal["sqlite", "valkey"] = "sqlite"
+    """Type of the DB, the values of a ``valkey`` cache
+    (:py:obj:`ExpireCacheValkey`) are stored in the Valkey DB.  The backend of
+    a cache is set to ``valkey`` if the name of the cache is listed in
+    :ref:`valkey.caches <settings valkey>`."""
+
     db_url: str = ""
     """URL of the SQLite DB, the path to the database file.  If unset a default
     DB will be created in `/tmp/sxng_cache_{self.name}.db`"""
@@ -64,6 +86,26 @@ class ExpireCacheCfg(msgspec.Struct):  # pylint: disable=too-few-public-methods
       if required.
     """
 
+    MEMORY_CACHE_SIZE: int = 0
+    """Max. number of values held in an in-process LRU cache in front of the
+    DB (``0`` disables the LRU cache).  A value found in the LRU cache is
+    returned without a DB query, until it expires or is evicted from the LRU
+    cache.  A value that is changed by another process is therefore not seen
+    by this process as long as the old value is in its LRU cache, use the LRU
+    cache only for values that don't change during their lifetime (tokens,
+    API keys, ..)."""
+
+    WRITE_BEHIND_DELAY: float = 0
+    """Delay (sec.) after which the values set by :py:obj:`ExpireCache.set`
+    are written to the DB (``0`` writes the value immediately).  The values
+    are queued and written in one transaction (``executemany``), values that
+    are still in the queue are returned by :py:obj:`ExpireCache.get` but are
+    not seen by other processes."""
+
+    WRITE_BEHIND_BATCH: int = 100
+    """Max. number of values in the queue of :py:obj:`WRITE_BEHIND_DELAY`, the
+    queue is written to the DB when it is full."""
+
     password: bytes = get_setting("server.secret_key").encode()
     """Password used by :py:obj:`ExpireCache.secret_hash`.
 
@@ -77,6 +119,59 @@ class ExpireCacheCfg(msgspec.Struct):  # pylint: disable=too-few-public-methods
         # if db_url is unset, use a default DB in /tmp/sxng_cache_{name}.db
         if not self.db_url:
             self.db_url = tempfile.gettempdir() + os.sep + f"sxng_cache_{ExpireCache.normalize_name(self.name)}.db"
+        if self.name in (get_setting("valkey.caches") or []):
+            self.backend = "valkey"
+
+
+@dataclasses.dataclass
+class ExpireCacheCounters:
+    """Counters of the cache operations in this process."""
+
+    get: int = 0
+    """Number of :py:obj:`ExpireCache.get` calls."""
+
+    hit: int = 0
+    """Number of :py:obj:`ExpireCache.get` calls that returned a value."""
+
+    memory_hit: int = 0
+    """Number of values returned without a DB query (from the LRU cache
+    :py:obj:`ExpireCacheCfg.MEMORY_CACHE_SIZE` or from the write-behind queue
+    :py:obj:`ExpireCacheCfg.WRITE_BEHIND_DELAY`)."""
+
+    get_time: float = 0.0
+    """Total time (sec.) of the :py:obj:`ExpireCache.get` calls."""
+
+    set: int = 0
+    """Number of :py:obj:`ExpireCache.set` calls."""
+
+    set_time: float = 0.0
+    """Total time (sec.) of the :py:obj:`ExpireCache.set` calls."""
+
+    flush: int = 0
+    """Number of writes of the write-behind queue to the DB."""
+
+    flush_rows: int = 0
+    """Number of values written from the write-behind queue to the DB."""
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hit / self.get if self.get else 0.0
+
+    @property
+    def memory_hit_rate(self) -> float:
+        return self.memory_hit / self.get if self.get else 0.0
+
+    def report(self) -> str:
+        get_ms = self.get_time / self.get * 1000 if self.get else 0.0
+        set_ms = self.set_time / self.set * 1000 if self.set else 0.0
+        return "\n".join(
+            [
+                f"get: {self.get} (hit rate: {self.hit_rate:.1%}, memory hit rate: {self.memory_hit_rate:.1%},"
+                f" avg: {get_ms:.3f} msec)",
+                f"set: {self.set} (avg: {set_ms:.3f} msec)",
+                f"write-behind: {self.flush_rows} values in {self.flush} transactions",
+            ]
+        )
 
 
 @dataclasses.dataclass
@@ -98,6 +193,9 @@ class ExpireCacheStats:
        }
     """
 
+    counters: ExpireCacheCounters | None = None
+    """Counters of the cache operations in this process."""
+
     def report(self):
         c_ctx = 0
         c_kv = 0
@@ -124,6 +222,8 @@ class ExpireCacheStats:
 
         lines.append(f"Number of contexts: {c_ctx}")
         lines.append(f"number of key/value pairs: {c_kv}")
+        if self.counters:
+            lines.append(self.counters.report())
         return "\n".join(lines)
 
 
@@ -155,10 +255,19 @@ class ExpireCache(abc.ABC):
         or a default prefix in a Key/Value DB.
         """
 
+    @abc.abstractmethod
+    def setmany(self, opt_list: list[CacheRowType], ctx: str | None = None) -> int:
+        """Sets the key/value pairs of ``opt_list`` (tuples with the arguments
+        of :py:obj:`ExpireCache.set`), returns the number of pairs set."""
+
     @abc.abstractmethod
     def get(self, key: str, default: typing.Any = None, ctx: str | None = None) -> typing.Any:
         """Return *value* of *key*.  If key is unset, ``None`` is returned."""
 
+    @abc.abstractmethod
+    def pairs(self, ctx: str) -> Iterator[tuple[str, typing.Any]]:
+        """Iterate over the key/value pairs of the context ``ctx``."""
+
     @abc.abstractmethod
     def maintenance(self, force: bool = False, truncate: bool = False) -> bool:
         """Performs maintenance on the cache.
@@ -178,15 +287,11 @@ class ExpireCache(abc.ABC):
         about the status of the cache."""
 
     @staticmethod
-    def build_cache(cfg: ExpireCacheCfg) -> "ExpireCacheSQLite":
-        """Factory to build a caching instance.
-
-        .. note::
-
-           Currently, only the SQLite adapter is available, but other database
-           types could be implemented in the future, e.g. a Valkey (Redis)
-           adapter.
-        """
+    def build_cache(cfg: ExpireCacheCfg) -> "ExpireCache":
+        """Factory to build a caching instance, the type of the instance is
+        given by :py:obj:`ExpireCacheCfg.backend`."""
+        if cfg.backend == "valkey":
+            return ExpireCacheValkey(cfg)
         return ExpireCacheSQLite(cfg)
 
     @staticmethod
@@ -228,6 +333,9 @@ class ExpireCacheSQLite(sqlitedb.SQLiteAppl, ExpireCache):
     - :py:obj:`ExpireCacheCfg.MAXHOLD_TIME`
     - :py:obj:`ExpireCacheCfg.MAINTENANCE_PERIOD`
     - :py:obj:`ExpireCacheCfg.MAINTENANCE_MODE`
+    - :py:obj:`ExpireCacheCfg.MEMORY_CACHE_SIZE`
+    - :py:obj:`ExpireCacheCfg.WRITE_BEHIND_DELAY`
+    - :py:obj:`ExpireCacheCfg.WRITE_BEHIND_BATCH`
     """
 
     DB_SCHEMA: int = 1
@@ -242,9 +350,24 @@ class ExpireCacheSQLite(sqlitedb.SQLiteAppl, ExpireCache):
         :py:obj:`config <ExpireCacheCfg>`."""
 
         self.cfg: ExpireCacheCfg = cfg
+        self.counters: ExpireCacheCounters = ExpireCacheCounters()
+
+        self._lock: threading.Lock = threading.Lock()
+        # reentrant: writing to the DB can trigger a truncate (see maintenance)
+        self._flush_lock: threading.RLock = threading.RLock()
+        # LRU cache and write-behind queue: (table, key) --> (serialized value, expire)
+        self._memory: OrderedDict[tuple[str, str], tuple[bytes, int]] = OrderedDict()
+        self._pending: dict[tuple[str, str], tuple[bytes, int]] = {}
+        # values of the write-behind queue that are currently written to the DB
+        self._flushing: dict[tuple[str, str], tuple[bytes, int]] = {}
+        self._flush_timer: threading.Timer | None = None
+        self._flush_pid: int = 0
+
         if cfg.db_url == ":memory:":
             log.critical("don't use SQLite DB in :memory: in production!!")
         super().__init__(cfg.db_url)
+        if cfg.WRITE_BEHIND_DELAY > 0:
+            atexit.register(self.flush)
 
     def init(self, conn: sqlite3.Connection) -> bool:
         ret_val = super().init(conn)
@@ -272,7 +395,13 @@ class ExpireCacheSQLite(sqlitedb.SQLiteAppl, ExpireCache):
         self.properties.set("LAST_MAINTENANCE", "")  # hint: this (also) sets the m_time of the property!
 
         if truncate:
-            self.truncate_tables(self.table_names)
+            # a running flush must not write its values into the truncated tables
+            with self._flush_lock:
+                with self._lock:
+                    self._memory.clear()
+                    self._pending.clear()
+                    self._flushing.clear()
+                self.truncate_tables(self.table_names)
             return True
 
         # drop items by expire time stamp ..
@@ -348,14 +477,28 @@ class ExpireCacheSQLite(sqlitedb.SQLiteAppl, ExpireCache):
         generated from the :py:obj:`ExpireCacheCfg.name`.  If DB table does not
         exists, it will be created (on demand) by :py:obj:`self.create_table
         <ExpireCacheSQLite.create_table>`.
+
+        If :py:obj:`ExpireCacheCfg.WRITE_BEHIND_DELAY` is set, the value is
+        queued and written later to the DB (:py:obj:`ExpireCacheSQLite.flush`).
         """
-        c, err_msg_list = self._setmany([(key, value, expire)], ctx=ctx)
-        if c:
+        _start = time.perf_counter()
+        sql_rows, err_msg_list = self._sql_rows([(key, value, expire)], ctx)
+        if sql_rows:
+            table = self._table_name(ctx)
+            if self.cfg.WRITE_BEHIND_DELAY > 0:
+                self._enqueue(table, sql_rows)
+            else:
+                self._write(ctx, sql_rows)
+            self._memorize(table, sql_rows)
+        self.counters.set += 1
+        self.counters.set_time += time.perf_counter() - _start
+
+        if sql_rows:
             log.debug("%s -- %s: key '%s' updated or inserted (%s errors)", self.cfg.name, ctx, key, len(err_msg_list))
         else:
             for msg in err_msg_list:
                 log.error("%s -- %s: %s", self.cfg.name, ctx, msg)
-        return bool(c)
+        return bool(sql_rows)
 
     def setmany(
         self,
@@ -388,58 +531,140 @@ class ExpireCacheSQLite(sqlitedb.SQLiteAppl, ExpireCache):
         ctx: str | None = None,
     ) -> tuple[int, list[str]]:
 
-        table = ctx
-        self.maintenance()
+        sql_rows, err_msg_list = self._sql_rows(opt_list, ctx)
+        if not sql_rows:
+            return 0, err_msg_list
 
-        table_name = table
-        if not table_name:
-            table_name = self.normalize_name(self.cfg.name)
-        self.create_table(table_name)
+        # drop older values of the keys from the LRU cache and from the
+        # write-behind queue (the queue would overwrite the new values), a
+        # flush in progress is completed before the new values are written
+        table = self._table_name(ctx)
+        with self._flush_lock:
+            with self._lock:
+                for key, _, _ in sql_rows:
+                    self._memory.pop((table, key), None)
+                    self._pending.pop((table, key), None)
+                    self._flushing.pop((table, key), None)
+            self._write(ctx, sql_rows)
+        return len(sql_rows), err_msg_list
 
-        sql_str = (
-            f"INSERT INTO {table_name} (key, value, expire) VALUES (?, ?, ?)"
-            f"    ON CONFLICT DO "
-            f"UPDATE SET value=?, expire=?"
-        )
+    def _table_name(self, ctx: str | None) -> str:
+        return ctx or self.normalize_name(self.cfg.name)
 
-        sql_rows: list[
-            tuple[
-                str,  # key
-                typing.Any,  # value
-                int | None,  # expire
-                typing.Any,  # value
-                int | None,  # expire
-            ]
-        ] = []
+    def _sql_rows(
+        self,
+        opt_list: list[CacheRowType],
+        ctx: str | None = None,
+    ) -> tuple[list[tuple[str, bytes, int]], list[str]]:
+        # serialized values (key, value, expire) of the options
 
+        sql_rows: list[tuple[str, bytes, int]] = []
         err_msg_list: list[str] = []
         for key, _val, expire in opt_list:
 
             value: bytes = self.serialize(value=_val)
             if len(value) > self.cfg.MAX_VALUE_LEN:
-                err_msg_list.append(f"{table}.key='{key}' - serialized value too big to cache (len: {len(value)}) ")
+                err_msg_list.append(f"{ctx}.key='{key}' - serialized value too big to cache (len: {len(value)}) ")
                 continue
 
             if not expire:
                 expire = self.cfg.MAXHOLD_TIME
             expire = int(time.time()) + expire
+            sql_rows.append((key, value, expire))
 
-            # positional arguments of the INSERT INTO statement
-            sql_args = (key, value, expire, value, expire)
-            sql_rows.append(sql_args)
+        return sql_rows, err_msg_list
 
-        if not sql_rows:
-            return 0, err_msg_list
+    def _write(self, ctx: str | None, sql_rows: list[tuple[str, bytes, int]]):
+
+        table = ctx
+        self.maintenance()
+
+        table_name = self._table_name(table)
+        self.create_table(table_name)
+
+        sql_str = (
+            f"INSERT INTO {table_name} (key, value, expire) VALUES (?, ?, ?)"
+            f"    ON CONFLICT DO "
+            f"UPDATE SET value=?, expire=?"
+        )
+        # positional arguments of the INSERT INTO statement
+        sql_args = [(key, value, expire, value, expire) for key, value, expire in sql_rows]
 
         if table:
             with self.DB:
-                self.DB.executemany(sql_str, sql_rows)
+                self.DB.executemany(sql_str, sql_args)
         else:
             with self.connect() as conn:
-                conn.executemany(sql_str, sql_rows)
+                conn.executemany(sql_str, sql_args)
             conn.close()
 
-        return len(sql_rows), err_msg_list
+    def _memorize(self, table: str, sql_rows: list[tuple[str, bytes, int]]):
+        # add the serialized values to the LRU cache
+        if not self.cfg.MEMORY_CACHE_SIZE:
+            return
+        with self._lock:
+            for key, value, expire in sql_rows:
+                self._memory[(table, key)] = (value, expire)
+                self._memory.move_to_end((table, key))
+            while len(self._memory) > self.cfg.MEMORY_CACHE_SIZE:
+                self._memory.popitem(last=False)
+
+    def _enqueue(self, table: str, sql_rows: list[tuple[str, bytes, int]]):
+        # add the serialized values to the write-behind queue, the queue is
+        # written by a timer thread after WRITE_BEHIND_DELAY seconds (or now,
+        # if the queue is full)
+        timer = None
+        with self._lock:
+            for key, value, expire in sql_rows:
+                self._pending[(table, key)] = (value, expire)
+            full = len(self._pending) >= self.cfg.WRITE_BEHIND_BATCH
+            # a forked process doesn't inherit the timer thread of its parent
+            if not full and (self._flush_timer is None or self._flush_pid != os.getpid()):
+                timer = self._flush_timer = threading.Timer(self.cfg.WRITE_BEHIND_DELAY, self.flush)
+                timer.daemon = True
+                self._flush_pid = os.getpid()
+        if full:
+            self.flush()
+        elif timer is not None:
+            timer.start()
+
+    def flush(self) -> int:
+        """Writes the values of the write-behind queue
+        (:py:obj:`ExpireCacheCfg.WRITE_BEHIND_DELAY`) to the DB in one
+        transaction per table, returns the number of values written."""
+
+        with self._flush_lock:
+            with self._lock:
+                self._flushing, self._pending = self._pending, {}
+                self._flush_timer = None
+            if not self._flushing:
+                return 0
+
+            tables: dict[str, list[tuple[str, bytes, int]]] = {}
+            for (table, key), (value, expire) in self._flushing.items():
+                tables.setdefault(table, []).append((key, value, expire))
+            try:
+                for table, sql_rows in tables.items():
+                    self._write(table, sql_rows)
+            finally:
+                with self._lock:
+                    self._flushing = {}
+
+        count = sum(len(sql_rows) for sql_rows in tables.values())
+        self.counters.flush += 1
+        self.counters.flush_rows += count
+        log.debug("%s: %s values of the write-behind queue written to the DB", self.cfg.name, count)
+        return count
+
+    def _get_memory(self, table: str, key: str) -> tuple[bytes, int] | None:
+        # value from the write-behind queue or the LRU cache
+        with self._lock:
+            row = self._pending.get((table, key)) or self._flushing.get((table, key))
+            if row is None and self.cfg.MEMORY_CACHE_SIZE:
+                row = self._memory.get((table, key))
+                if row is not None:
+                    self._memory.move_to_end((table, key))
+        return row
 
     def get(self, key: str, default: typing.Any = None, ctx: str | None = None) -> typing.Any:
         """Get value of ``key`` from table given by argument ``ctx``.  If
@@ -447,10 +672,25 @@ class ExpireCacheSQLite(sqlitedb.SQLiteAppl, ExpireCache):
         from the :py:obj:`ExpireCacheCfg.name`.  If ``key`` not exists in
         the table or the table not exists, the ``default`` value is returned.
         """
-        table = ctx
-
-        if not table:
-            table = self.normalize_name(self.cfg.name)
+        _start = time.perf_counter()
+        try:
+            return self._get(key, default, ctx)
+        finally:
+            self.counters.get += 1
+            self.counters.get_time += time.perf_counter() - _start
+
+    def _get(self, key: str, default: typing.Any, ctx: str | None) -> typing.Any:
+
+        table = self._table_name(ctx)
+
+        row = self._get_memory(table, key)
+        if row is not None:
+            (value, expire) = row
+            if expire < time.time():
+                return default
+            self.counters.memory_hit += 1
+            self.counters.hit += 1
+            return self.deserialize(value)
 
         if table not in self.table_names:
             return default
@@ -473,16 +713,16 @@ class ExpireCacheSQLite(sqlitedb.SQLiteAppl, ExpireCache):
             # statement must be executed for every cache.get request anyways.
             return default
 
+        self._memorize(table, [(key, value, expire)])
+        self.counters.hit += 1
         return self.deserialize(value)
 
     def pairs(self, ctx: str) -> Iterator[tuple[str, typing.Any]]:
         """Iterate over key/value pairs from table given by argument ``ctx``.
         If ``ctx`` argument is ``None`` (the default), a table name is
         generated from the :py:obj:`ExpireCacheCfg.name`."""
-        table = ctx
-
-        if not table:
-            table = self.normalize_name(self.cfg.name)
+        table = self._table_name(ctx)
+        self.flush()
 
         if table in self.table_names:
             # Before values are taken from the table, a maintenance interval may
@@ -492,9 +732,194 @@ class ExpireCacheSQLite(sqlitedb.SQLiteAppl, ExpireCache):
                 yield row[0], self.deserialize(row[1])
 
     def state(self) -> ExpireCacheStats:
+        self.flush()
         cached_items: dict[str, list[CacheRowType]] = {}
         for table in self.table_names:
             cached_items[table] = []
             for row in self.DB.execute(f"SELECT key, value, expire FROM {table}"):
                 cached_items[table].append((row[0], self.deserialize(row[1]), row[2]))
-        return ExpireCacheStats(cached_items=cached_items)
+        return ExpireCacheStats(cached_items=cached_items, counters=dataclasses.replace(self.counters))
+
+
+class ExpireCacheValkey(ExpireCache):
+    """Cache that manages key/value pairs in the :ref:`Valkey DB <settings
+    valkey>` (:py:obj:`searx.valkeydb.client`), the cache is shared by all
+    SearXNG nodes that are connected to the DB.
+
+    The key of a value in the DB is ``SearXNG_cache|<name>|<ctx>|<key>``, the
+    expire time is set as TTL of the key: the values are removed by the DB, no
+    maintenance is required.  As long as there is no connection to a Valkey
+    DB, the values are stored in a :py:obj:`ExpireCacheSQLite`.
+
+    The following configurations are required / supported:
+
+    - :py:obj:`ExpireCacheCfg.MAXHOLD_TIME`
+    - :py:obj:`ExpireCacheCfg.MAX_VALUE_LEN`
+    """
+
+    KEY_PREFIX: str = "SearXNG_cache"
+
+    def __init__(self, cfg: ExpireCacheCfg):
+        self.cfg: ExpireCacheCfg = cfg
+        self.counters: ExpireCacheCounters = ExpireCacheCounters()
+        self.prefix: str = f"{self.KEY_PREFIX}|{self.normalize_name(cfg.name)}"
+        self._init_client: typing.Any = None
+        self._fallback: ExpireCacheSQLite | None = None
+
+    def client(self):
+        """Returns the Valkey client, or ``None`` if there is no connection to
+        a Valkey DB.  When a client is used for the first time, the hash of the
+        :py:obj:`password <ExpireCacheCfg.password>` is checked: if the
+        password has been changed, all values of the cache are deleted."""
+        client = valkeydb.client()
+        if client is not None and client is not self._init_client:
+            self._init_client = client
+            new = hashlib.sha256(self.cfg.password).hexdigest()
+            try:
+                old = client.getset(f"{self.prefix}|{self.hash_token}", new)
+                if old is not None and old.decode() != new:
+                    log.warning("[%s] hash token changed: delete all values of the cache", self.cfg.name)
+                    self._delete(client, "*")
+            except valkey.exceptions.ValkeyError as e:
+                log.error("[%s] can't check the hash token: %s", self.cfg.name, e)
+        return client
+
+    @property
+    def fallback(self) -> ExpireCacheSQLite:
+        """Cache used when there is no connection to a Valkey DB."""
+        if self._fallback is None:
+            log.warning("[%s] no Valkey DB, the values are stored in %s", self.cfg.name, self.cfg.db_url)
+            self._fallback = ExpireCacheSQLite(self.cfg)
+        return self._fallback
+
+    def _key(self, ctx: str | None, key: str = "") -> str:
+        return f"{self.prefix}|{ctx or self.normalize_name(self.cfg.name)}|{key}"
+
+    def _scan(self, client: typing.Any, ctx: str | None) -> Iterator[str]:
+        # keys of the context ctx in the DB ("*": keys of all contexts)
+        if ctx == "*":
+            pattern = re.sub(r"([*?\[\]\\])", r"\\\1", self.prefix) + "|*|*"
+        else:
+            pattern = re.sub(r"([*?\[\]\\])", r"\\\1", self._key(ctx)) + "*"
+        for key in client.scan_iter(match=pattern, count=1000):
+            yield key.decode()
+
+    def _delete(self, client: typing.Any, ctx: str) -> int:
+        count = 0
+        pipe = client.pipeline(transaction=False)
+        for key in self._scan(client, ctx):
+            pipe.unlink(key)
+            count += 1
+        pipe.execute()
+        return count
+
+    def _values(self, opt_list: list[CacheRowType], ctx: str | None) -> list[tuple[str, bytes, int]]:
+        # serialized values (DB key, value, TTL) of the options
+        rows: list[tuple[str, bytes, int]] = []
+        for key, _val, expire in opt_list:
+            value = self.serialize(value=_val)
+            if len(value) > self.cfg.MAX_VALUE_LEN:
+                log.error(
+                    "%s -- %s.key='%s' - serialized value too big to cache (len: %s)",
+                    self.cfg.name,
+                    ctx,
+                    key,
+                    len(value),
+                )
+                continue
+            rows.append((self._key(ctx, key), value, expire or self.cfg.MAXHOLD_TIME))
+        return rows
+
+    # implement ABC methods of ExpireCache
+
+    def set(self, key: str, value: typing.Any, expire: int | None, ctx: str | None = None) -> bool:
+        """Set key/value in the DB, the context is a part of the key in the
+        DB.  If expire is unset the default is taken from
+        :py:obj:`ExpireCacheCfg.MAXHOLD_TIME`."""
+        _start = time.perf_counter()
+        try:
+            return self.setmany([(key, value, expire)], ctx=ctx) == 1
+        finally:
+            self.counters.set += 1
+            self.counters.set_time += time.perf_counter() - _start
+
+    def setmany(self, opt_list: list[CacheRowType], ctx: str | None = None) -> int:
+        """Sets the key/value pairs of ``opt_list`` in one pipeline (one round
+        trip to the DB)."""
+        client = self.client()
+        if client is None:
+            return self.fallback.setmany(opt_list, ctx=ctx)
+
+        rows = self._values(opt_list, ctx)
+        if not rows:
+            return 0
+        pipe = client.pipeline(transaction=False)
+        for db_key, value, ttl in rows:
+            pipe.set(db_key, value, ex=ttl)
+        try:
+            pipe.execute()
+        except valkey.exceptions.ValkeyError as e:
+            log.error("%s -- %s: can't store %s values: %s", self.cfg.name, ctx, len(rows), e)
+            return 0
+        return len(rows)
+
+    def get(self, key: str, default: typing.Any = None, ctx: str | None = None) -> typing.Any:
+        """Get value of ``key`` in the context ``ctx`` from the DB.  If ``key``
+        not exists (or is expired), the ``default`` value is returned."""
+        client = self.client()
+        if client is None:
+            return self.fallback.get(key, default=default, ctx=ctx)
+
+        _start = time.perf_counter()
+        try:
+            value = client.get(self._key(ctx, key))
+        except valkey.exceptions.ValkeyError as e:
+            log.error("%s -- %s: can't get key '%s': %s", self.cfg.name, ctx, key, e)
+            value = None
+        finally:
+            self.counters.get += 1
+            self.counters.get_time += time.perf_counter() - _start
+        if value is None:
+            return default
+        self.counters.hit += 1
+        return self.deserialize(value)
+
+    def pairs(self, ctx: str) -> Iterator[tuple[str, typing.Any]]:
+        client = self.client()
+        if client is None:
+            yield from self.fallback.pairs(ctx)
+            return
+
+        prefix = self._key(ctx)
+        for db_key in self._scan(client, ctx):
+            value = client.get(db_key)
+            if value is not None:
+                yield db_key[len(prefix) :], self.deserialize(value)
+
+    def maintenance(self, force: bool = False, truncate: bool = False) -> bool:
+        """The expired values are removed by the DB (TTL), only ``truncate``
+        needs to be carried out (deletes all values of the cache)."""
+        client = self.client()
+        if client is None:
+            return self.fallback.maintenance(force=force, truncate=truncate)
+        if truncate:
+            self._delete(client, "*")
+        return True
+
+    def state(self) -> ExpireCacheStats:
+        client = self.client()
+        if client is None:
+            return self.fallback.state()
+
+        now = int(time.time())
+        cached_items: dict[str, list[CacheRowType]] = {}
+        for db_key in self._scan(client, "*"):
+            ctx, key = db_key[len(self.prefix) + 1 :].split("|", 1)
+            pipe = client.pipeline(transaction=False)
+            pipe.get(db_key)
+            pipe.ttl(db_key)
+            value, ttl = pipe.execute()
+            if value is None:
+                continue
+            cached_items.setdefault(ctx, []).append((key, self.deserialize(value), now + ttl if ttl > 0 else None))
+        return ExpireCacheStats(cached_items=cached_items, counters=dataclasses.replace(self.counters))
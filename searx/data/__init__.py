@@ -3,15 +3,23 @@
 
 make data.all
 
+The large JSON files are loaded from memory-mapped snapshots (see
+:py:obj:`searx.data.snapshot`) if the snapshots have been build, the objects
+of these files are read-only mappings (:py:obj:`collections.abc.Mapping`).
+
 """
 # pylint: disable=invalid-name
 
 __all__ = ["ahmia_blacklist_loader", "data_dir", "get_cache"]
 
 import json
+import pathlib
 import typing as t
+from collections.abc import Mapping
 
 from .core import log, data_dir, get_cache
+from . import snapshot
+from .ahmia_blacklist import AhmiaBlacklist
 from .currencies import CurrenciesDB
 from .tracker_patterns import TrackerPatternsDB
 
@@ -40,16 +48,16 @@ class LocalesType(t.TypedDict):
 
 
 USER_AGENTS: UserAgentType
-WIKIDATA_UNITS: dict[str, WikiDataUnitType]
+WIKIDATA_UNITS: Mapping[str, WikiDataUnitType]
 TRACKER_PATTERNS: TrackerPatternsDB
 LOCALES: LocalesType
 CURRENCIES: CurrenciesDB
 
 EXTERNAL_URLS: dict[str, dict[str, dict[str, str | dict[str, str]]]]
-EXTERNAL_BANGS: dict[str, dict[str, t.Any]]
-OSM_KEYS_TAGS: dict[str, dict[str, t.Any]]
-ENGINE_DESCRIPTIONS: dict[str, dict[str, t.Any]]
-ENGINE_TRAITS: dict[str, dict[str, t.Any]]
+EXTERNAL_BANGS: Mapping[str, Mapping[str, t.Any]]
+OSM_KEYS_TAGS: Mapping[str, Mapping[str, t.Any]]
+ENGINE_DESCRIPTIONS: Mapping[str, Mapping[str, t.Any]]
+ENGINE_TRAITS: Mapping[str, Mapping[str, t.Any]]
 
 
 lazy_globals = {
@@ -76,6 +84,21 @@ data_json_files = {
     "LOCALES": "locales.json",
 }
 
+data_snapshots = {
+    "EXTERNAL_BANGS",
+    "OSM_KEYS_TAGS",
+    "ENGINE_DESCRIPTIONS",
+    "WIKIDATA_UNITS",
+    "ENGINE_TRAITS",
+}
+"""Names of the objects that are loaded from a snapshot (if available)."""
+
+
+def snapshot_file(name: str) -> pathlib.Path:
+    """Returns the path of the snapshot of the JSON file of the object
+    ``name``."""
+    return (data_dir / data_json_files[name]).with_suffix(".snapshot")
+
 
 def __getattr__(name: str) -> t.Any:
     # lazy init of the global objects
@@ -88,20 +111,29 @@ def __getattr__(name: str) -> t.Any:
 
     log.debug("init searx.data.%s", name)
 
-    with open(data_dir / data_json_files[name], encoding='utf-8') as f:
+    json_file = data_dir / data_json_files[name]
+    if name in data_snapshots:
+        data = snapshot.load(snapshot_file(name), json_file)
+        if data is not None:
+            lazy_globals[name] = data
+            return data
+        log.debug("no snapshot of %s, load JSON file", json_file.name)
+
+    with open(json_file, encoding='utf-8') as f:
         lazy_globals[name] = json.load(f)
 
     return lazy_globals[name]
 
 
-def ahmia_blacklist_loader() -> list[str]:
-    """Load data from `ahmia_blacklist.txt` and return a list of MD5 values of onion
-    names.  The MD5 values are fetched by::
+def ahmia_blacklist_loader() -> AhmiaBlacklist:
+    """Load data from `ahmia_blacklist.bin` and return the index of the MD5
+    values of onion names (:py:obj:`AhmiaBlacklist
+    <searx.data.ahmia_blacklist.AhmiaBlacklist>`).  The MD5 values are fetched
+    by::
 
       searxng_extra/update/update_ahmia_blacklist.py
 
     This function is used by :py:mod:`searx.plugins.ahmia_filter`.
 
     """
-    with open(data_dir / 'ahmia_blacklist.txt', encoding='utf-8') as f:
-        return f.read().split()
+    return AhmiaBlacklist.from_file(data_dir / 'ahmia_blacklist.bin')
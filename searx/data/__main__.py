@@ -3,6 +3,7 @@
 
 import typer
 
+from . import data_dir, data_json_files, data_snapshots, snapshot, snapshot_file
 from .core import get_cache
 
 app = typer.Typer()
@@ -17,4 +18,19 @@ def state():
             print(f"cache table {table} holds {row[0]} key/value pairs")
 
 
+@app.command("snapshot")
+def build_snapshots():
+    """build the snapshots of the JSON files"""
+    for name in sorted(data_snapshots):
+        file_name = snapshot_file(name)
+        snapshot.dump(data_dir / data_json_files[name], file_name)
+        print(f"snapshot {file_name.name}: {file_name.stat().st_size} bytes")
+
+    # pylint: disable=import-outside-toplevel
+    from searx.external_bang import BANG_TRIE_FILE, EXTERNAL_BANGS_FILE, BangTrie, EXTERNAL_BANGS
+
+    snapshot.dump(EXTERNAL_BANGS_FILE, BANG_TRIE_FILE, BangTrie.build(EXTERNAL_BANGS).to_snapshot())
+    print(f"snapshot {BANG_TRIE_FILE.name}: {BANG_TRIE_FILE.stat().st_size} bytes")
+
+
 app()
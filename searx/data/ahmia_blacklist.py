@@ -0,0 +1,75 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Index of `Ahmia's blacklist`_ for onion sites.
+
+The blacklist is stored in :origin:`searx/data/ahmia_blacklist.bin`: the MD5
+digests (16 bytes) of the banned onion names, sorted and concatenated.  The
+file is memory-mapped, the pages are shared by all the worker processes and a
+lookup is a binary search (``O(log n)``) in the sorted digests.
+
+.. _Ahmia's blacklist: https://ahmia.fi/blacklist/
+"""
+
+__all__ = ["AhmiaBlacklist"]
+
+import mmap
+import pathlib
+
+DIGEST_SIZE = 16
+"""Size of a MD5 digest in bytes."""
+
+
+class AhmiaBlacklist:
+    """Sorted MD5 digests of the onion names in the blacklist, test membership
+    with the MD5 digest (or its hex value) of an onion name:
+
+    .. code:: python
+
+       md5(hostname.encode()).digest() in blacklist
+    """
+
+    def __init__(self, data: bytes | mmap.mmap = b""):
+        if len(data) % DIGEST_SIZE:
+            raise ValueError(f"size of the data is not a multiple of {DIGEST_SIZE}")
+        self._data: bytes | mmap.mmap = data
+
+    @classmethod
+    def from_file(cls, file_name: pathlib.Path) -> "AhmiaBlacklist":
+        """Memory-maps the blacklist from the (binary) file ``file_name``."""
+        with open(file_name, "rb") as f:
+            if not f.seek(0, 2):
+                # an empty file can't be mapped
+                return cls()
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @staticmethod
+    def dump(digests: list[str], file_name: pathlib.Path):
+        """Writes the MD5 values (hex) in ``digests`` to the file ``file_name``
+        in the format of the :py:obj:`AhmiaBlacklist`."""
+        data = sorted({bytes.fromhex(d) for d in digests})
+        with open(file_name, "wb") as f:
+            f.write(b"".join(data))
+
+    def __len__(self) -> int:
+        return len(self._data) // DIGEST_SIZE
+
+    def __contains__(self, digest: bytes | str) -> bool:
+        if isinstance(digest, str):
+            try:
+                digest = bytes.fromhex(digest)
+            except ValueError:
+                return False
+        if len(digest) != DIGEST_SIZE:
+            return False
+
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = mid * DIGEST_SIZE
+            value = self._data[offset : offset + DIGEST_SIZE]
+            if value == digest:
+                return True
+            if value < digest:
+                lo = mid + 1
+            else:
+                hi = mid
+        return False
@@ -19,9 +19,11 @@ def get_cache():
     global _DATA_CACHE  # pylint: disable=global-statement
 
     if _DATA_CACHE is None:
-        _DATA_CACHE = ExpireCacheSQLite.build_cache(
+        # the data cache stores its state in the properties of the SQLite DB
+        _DATA_CACHE = ExpireCacheSQLite(
             ExpireCacheCfg(
                 name="DATA_CACHE",
+                MEMORY_CACHE_SIZE=1000,
                 # MAX_VALUE_LEN=1024 * 200,  # max. 200kB length for a *serialized* value.
                 # MAXHOLD_TIME=60 * 60 * 24 * 7 * 4,  # 4 weeks
             )
@@ -0,0 +1,275 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Read-only snapshots of the JSON data files.
+
+A snapshot is a binary copy of a JSON file (e.g. ``external_bangs.json``) that
+is memory-mapped instead of being parsed by :py:obj:`json.load`: the pages of
+the file are shared by all the worker processes and the values are only
+decoded when they are looked up.  The snapshots are build by::
+
+  $ python -m searx.data snapshot
+
+A snapshot stores the SHA256 digest of its JSON file, a snapshot that does not
+match the JSON file is not used (:py:obj:`load` returns ``None``) and the JSON
+file is loaded instead.
+
+The objects of a JSON file are represented by :py:obj:`SnapshotMap` (a
+read-only :py:obj:`Mapping <collections.abc.Mapping>`), the arrays and the
+scalar values are decoded to Python objects when they are looked up, binary
+data is a :py:obj:`memoryview` of the file.
+
+Format of the file (little-endian, offsets are relative to the start of the
+file):
+
+- header: magic ``SXNGSNAP``, version (u32), offset of the root value (u32),
+  SHA256 digest of the JSON file (32 bytes)
+- value: a type byte followed by the data of the value
+
+  - ``n``, ``t``, ``f``: ``null``, ``true``, ``false``
+  - ``i``: integer (i64), ``d``: float (f64)
+  - ``s``: string (u32 length, UTF-8 bytes), ``J``: integer out of the range
+    of i64 (u32 length, JSON text)
+  - ``B``: binary data (u32 length, bytes aligned to 8 bytes), not a JSON type,
+    see :py:obj:`dump`
+  - ``L``: array (u32 count, offsets of the items)
+  - ``M``: object (u32 count, offsets of the key and the value of the items in
+    the order of the JSON file, followed by the indexes of the items sorted by
+    the UTF-8 bytes of the keys)
+
+Equal values are only stored once.
+"""
+
+__all__ = ["SnapshotMap", "dump", "load"]
+
+import typing as t
+
+import hashlib
+import json
+import mmap
+import os
+import pathlib
+import struct
+from collections.abc import Iterator, Mapping
+
+MAGIC = b"SXNGSNAP"
+VERSION = 1
+HEADER = struct.Struct("<8sII32s")
+
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+
+def _digest(json_file: pathlib.Path) -> bytes:
+    with open(json_file, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+class _Writer:  # pylint: disable=too-few-public-methods
+
+    def __init__(self):
+        self.data = bytearray(HEADER.size)
+        self.offsets: dict[t.Any, int] = {}
+
+    def _store(self, key: t.Any, data: bytes) -> int:
+        offset = self.offsets.get(key)
+        if offset is None:
+            offset = self.offsets[key] = len(self.data)
+            self.data += data
+        return offset
+
+    def _scalar(self, data: bytes) -> int:
+        return self._store(data, data)
+
+    def _str(self, tag: bytes, value: str) -> int:
+        b = value.encode("utf-8")
+        return self._scalar(tag + _U32.pack(len(b)) + b)
+
+    def add(self, value: t.Any) -> int:
+        # pylint: disable=too-many-return-statements
+        if value is None:
+            return self._scalar(b"n")
+        if value is True:
+            return self._scalar(b"t")
+        if value is False:
+            return self._scalar(b"f")
+        if isinstance(value, int):
+            if -(2**63) <= value < 2**63:
+                return self._scalar(b"i" + _I64.pack(value))
+            return self._str(b"J", str(value))
+        if isinstance(value, float):
+            return self._scalar(b"d" + _F64.pack(value))
+        if isinstance(value, str):
+            return self._str(b"s", value)
+        if isinstance(value, bytes):
+            data = b"B" + _U32.pack(len(value)) + value
+            if data not in self.offsets:
+                # align the bytes, the data can be cast to an array of numbers
+                self.data += bytes(-(len(self.data) + 5) % 8)
+            return self._scalar(data)
+        if isinstance(value, list):
+            items = tuple(self.add(v) for v in value)
+            return self._store(("L", items), b"L" + struct.pack(f"<{len(items) + 1}I", len(items), *items))
+        if isinstance(value, dict):
+            items = tuple((self.add(k), self.add(v)) for k, v in value.items())
+            keys = [k.encode("utf-8") for k in value]
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            flat = [o for item in items for o in item]
+            return self._store(
+                ("M", items),
+                b"M" + struct.pack(f"<{len(flat) + len(order) + 1}I", len(items), *flat, *order),
+            )
+        raise TypeError(f"type {type(value)} can't be stored in a snapshot")
+
+
+def dump(json_file: pathlib.Path, snapshot_file: pathlib.Path, value: t.Any = None):
+    """Builds the snapshot ``snapshot_file`` of the ``json_file``.
+
+    If ``value`` is given, the snapshot contains this value instead of the
+    content of the ``json_file`` (e.g. an index build from the JSON file), the
+    value can contain :py:obj:`bytes`."""
+    with open(json_file, "rb") as f:
+        raw = f.read()
+    writer = _Writer()
+    root = writer.add(json.loads(raw) if value is None else value)
+    writer.data[: HEADER.size] = HEADER.pack(MAGIC, VERSION, root, hashlib.sha256(raw).digest())
+
+    # write to a temporary file first, the snapshot might be in use
+    tmp_file = snapshot_file.with_name(snapshot_file.name + f".{os.getpid()}.tmp")
+    with open(tmp_file, "wb") as f:
+        f.write(writer.data)
+    os.replace(tmp_file, snapshot_file)
+
+
+def load(snapshot_file: pathlib.Path, json_file: pathlib.Path) -> t.Any:
+    """Returns the root value of the snapshot, or ``None`` if the snapshot does
+    not exists or does not match the ``json_file``."""
+    try:
+        with open(snapshot_file, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(buf) < HEADER.size:
+        return None
+    magic, version, root, digest = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != VERSION or digest != _digest(json_file):
+        return None
+    return _decode(buf, root)
+
+
+def _decode(buf: mmap.mmap, offset: int) -> t.Any:
+    # pylint: disable=too-many-return-statements
+    tag = buf[offset : offset + 1]
+    if tag == b"M":
+        return SnapshotMap(buf, offset)
+    if tag == b"s":
+        (size,) = _U32.unpack_from(buf, offset + 1)
+        return buf[offset + 5 : offset + 5 + size].decode("utf-8")
+    if tag == b"i":
+        return _I64.unpack_from(buf, offset + 1)[0]
+    if tag == b"d":
+        return _F64.unpack_from(buf, offset + 1)[0]
+    if tag == b"L":
+        (count,) = _U32.unpack_from(buf, offset + 1)
+        return [_to_python(_decode(buf, o)) for o in struct.unpack_from(f"<{count}I", buf, offset + 5)]
+    if tag == b"n":
+        return None
+    if tag == b"t":
+        return True
+    if tag == b"f":
+        return False
+    if tag == b"J":
+        (size,) = _U32.unpack_from(buf, offset + 1)
+        return json.loads(buf[offset + 5 : offset + 5 + size])
+    if tag == b"B":
+        (size,) = _U32.unpack_from(buf, offset + 1)
+        return memoryview(buf)[offset + 5 : offset + 5 + size]
+    raise ValueError(f"invalid value at offset {offset}")
+
+
+def _to_python(value: t.Any) -> t.Any:
+    if isinstance(value, SnapshotMap):
+        return value.to_dict()
+    return value
+
+
+class SnapshotMap(Mapping[str, t.Any]):
+    """A JSON object in a snapshot, the lookup of a key is a binary search in
+    the sorted keys of the object.
+
+    A copy (:py:obj:`copy.copy`, :py:obj:`copy.deepcopy`, :py:obj:`pickle`) of
+    the object is a :py:obj:`dict`."""
+
+    __slots__ = ("_buf", "_offset", "_count")
+
+    def __init__(self, buf: mmap.mmap, offset: int):
+        self._buf = buf
+        self._offset = offset + 5
+        (self._count,) = _U32.unpack_from(buf, offset + 1)
+
+    def _item(self, index: int) -> tuple[int, int]:
+        return struct.unpack_from("<II", self._buf, self._offset + 8 * index)
+
+    def _key_bytes(self, key_offset: int) -> bytes:
+        (size,) = _U32.unpack_from(self._buf, key_offset + 1)
+        return self._buf[key_offset + 5 : key_offset + 5 + size]
+
+    def _find(self, key: str) -> int | None:
+        # returns the offset of the value of the key
+        if not isinstance(key, str):
+            return None
+        key_bytes = key.encode("utf-8")
+        order_offset = self._offset + 8 * self._count
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            (index,) = _U32.unpack_from(self._buf, order_offset + 4 * mid)
+            key_offset, value_offset = self._item(index)
+            mid_key = self._key_bytes(key_offset)
+            if mid_key == key_bytes:
+                return value_offset
+            if mid_key < key_bytes:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def __getitem__(self, key: str) -> t.Any:
+        value_offset = self._find(key)
+        if value_offset is None:
+            raise KeyError(key)
+        return _decode(self._buf, value_offset)
+
+    def __contains__(self, key: object) -> bool:
+        return self._find(key) is not None  # type: ignore
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._count):
+            yield self._key_bytes(self._item(index)[0]).decode("utf-8")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def iter_items(self) -> Iterator[tuple[str, t.Any]]:
+        """Iterates over the items without looking up the keys."""
+        for index in range(self._count):
+            key_offset, value_offset = self._item(index)
+            yield self._key_bytes(key_offset).decode("utf-8"), _decode(self._buf, value_offset)
+
+    def copy(self) -> dict[str, t.Any]:
+        return dict(self.iter_items())
+
+    def to_dict(self) -> dict[str, t.Any]:
+        """Returns the object (recursively) as a :py:obj:`dict`."""
+        return {k: _to_python(v) for k, v in self.iter_items()}
+
+    def __copy__(self) -> dict[str, t.Any]:
+        return self.copy()
+
+    def __deepcopy__(self, memo: dict[int, t.Any]) -> dict[str, t.Any]:
+        return self.to_dict()
+
+    def __reduce__(self):
+        return (dict, (self.to_dict(),))
+
+    def __repr__(self) -> str:
+        return f"<SnapshotMap with {self._count} items>"
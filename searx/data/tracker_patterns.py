@@ -7,9 +7,16 @@ import typing as t
 __all__ = ["TrackerPatternsDB"]
 
 import re
+import time
+import uuid
 from collections.abc import Iterator
 from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
 
+try:
+    import re._parser as sre_parse  # pylint: disable=ungrouped-imports
+except ImportError:  # Python < 3.11
+    import sre_parse  # pylint: disable=deprecated-module
+
 from httpx import HTTPError
 
 from searx.data.core import get_cache, log
@@ -22,6 +29,53 @@ if t.TYPE_CHECKING:
 RuleType = tuple[str, list[str], list[str]]
 
 
+class CompiledRule(t.NamedTuple):
+    """A :py:obj:`RuleType` with precompiled regular expressions."""
+
+    keyword: str | None
+    """A literal string that must be contained in every URL matched by
+    ``url_regexp`` (``None`` if no such literal could be determined).  URLs
+    that do not contain the keyword are skipped without running the regular
+    expressions of the rule."""
+
+    url_regexp: re.Pattern[str]
+    url_ignore: list[re.Pattern[str]]
+    del_args: list[re.Pattern[str]]
+
+
+def required_literal(pattern: str) -> str | None:
+    """Returns the longest literal string that must appear in every string
+    matched by the regular expression ``pattern``.
+
+    Only literals on the top level of the pattern are considered (literals in
+    groups, alternatives or repetitions are optional).  If the pattern is case
+    insensitive or no literal of at least three characters is found, ``None``
+    is returned.
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return None
+    if parsed.state.flags & re.IGNORECASE:
+        return None
+
+    best = ""
+    current: list[str] = []
+    for op, arg in list(parsed) + [(None, None)]:  # pyright: ignore[reportArgumentType]
+        if op is not None and op.name == "LITERAL":
+            current.append(chr(arg))
+            continue
+        # on equal length prefer the later literal, the first one is often
+        # the "http" of the scheme
+        if current and len(current) >= len(best):
+            best = "".join(current)
+        current = []
+
+    if len(best) < 3:
+        return None
+    return best
+
+
 @t.final
 class TrackerPatternsDB:
     # pylint: disable=missing-class-docstring
@@ -41,8 +95,15 @@ class TrackerPatternsDB:
         url_ignore: t.Final = 1  # URL (regular expression) to ignore
         del_args: t.Final = 2  # list of URL arguments (regular expression) to delete
 
+    RULES_CHECK_INTERVAL: int = 60
+    """Interval (sec.) in which the compiled rules are checked against the
+    version of the rule table in the cache (:py:obj:`compiled_rules`)."""
+
     def __init__(self):
         self.cache = get_cache()
+        self._compiled: list[CompiledRule] | None = None
+        self._compiled_version: str | None = None
+        self._next_check: float = 0
 
     def init(self):
         if self.cache.properties("tracker_patterns loaded") != "OK":
@@ -66,6 +127,7 @@ class TrackerPatternsDB:
             rows.append((key, value, None))
 
         self.cache.setmany(rows, ctx=self.ctx_name)
+        self.cache.properties.set("tracker_patterns version", uuid.uuid4().hex)
 
     def add(self, rule: RuleType):
         key = rule[self.Fields.url_regexp]
@@ -74,12 +136,48 @@ class TrackerPatternsDB:
             rule[self.Fields.del_args],
         )
         self.cache.set(key=key, value=value, ctx=self.ctx_name, expire=None)
+        self.cache.properties.set("tracker_patterns version", uuid.uuid4().hex)
+        self._compiled = None
 
     def rules(self) -> Iterator[RuleType]:
         self.init()
         for key, value in self.cache.pairs(ctx=self.ctx_name):
             yield key, value[0], value[1]
 
+    def compiled_rules(self) -> list[CompiledRule]:
+        """Returns the rules with precompiled regular expressions.
+
+        The compiled rules are held in the memory of the process.  At the
+        latest after :py:obj:`RULES_CHECK_INTERVAL` seconds, the version of the
+        rule table in the cache is checked and the rules are recompiled if the
+        table has been changed (by another process).
+        """
+        now = time.monotonic()
+        if self._compiled is not None and now < self._next_check:
+            return self._compiled
+
+        self.init()
+        version = self.cache.properties("tracker_patterns version")
+        if self._compiled is None or version != self._compiled_version:
+            log.debug("TRACKER_PATTERNS: compile rules (version %s)", version)
+            self._compiled = list(self.compile_rules(self.rules()))
+            self._compiled_version = version
+        self._next_check = now + self.RULES_CHECK_INTERVAL
+        return self._compiled
+
+    @classmethod
+    def compile_rules(cls, rules: "t.Iterable[RuleType]") -> Iterator[CompiledRule]:
+        for rule in rules:
+            try:
+                yield CompiledRule(
+                    keyword=required_literal(rule[cls.Fields.url_regexp]),
+                    url_regexp=re.compile(rule[cls.Fields.url_regexp]),
+                    url_ignore=[re.compile(p) for p in rule[cls.Fields.url_ignore]],
+                    del_args=[re.compile(p) for p in rule[cls.Fields.del_args]],
+                )
+            except re.error as exc:
+                log.warning("TRACKER_PATTERNS: ignore rule %s (%s)", rule[cls.Fields.url_regexp], exc)
+
     def iter_clear_list(self) -> Iterator[RuleType]:
         resp = None
         for url in self.CLEAR_LIST_URL:
@@ -118,7 +216,7 @@ class TrackerPatternsDB:
         new_url = url
         parsed_new_url = urlparse(url=new_url)
 
-        for rule in self.rules():
+        for rule in self.compiled_rules():
 
             query_str: str = parsed_new_url.query
             if not query_str:
@@ -126,13 +224,17 @@ class TrackerPatternsDB:
                 # which rules can be applied, stop iterating over the rules.
                 break
 
-            if not re.match(rule[self.Fields.url_regexp], new_url):
+            if rule.keyword is not None and rule.keyword not in new_url:
+                # the URL can't match the url_regexp of this rule
+                continue
+
+            if not rule.url_regexp.match(new_url):
                 # no match / ignore pattern
                 continue
 
             do_ignore = False
-            for pattern in rule[self.Fields.url_ignore]:
-                if re.match(pattern, new_url):
+            for pattern in rule.url_ignore:
+                if pattern.match(new_url):
                     do_ignore = True
                     break
 
@@ -148,12 +250,13 @@ class TrackerPatternsDB:
                 # remove tracker arguments from the url-query part
                 for name, val in query_args.copy():
                     # remove URL arguments
-                    for pattern in rule[self.Fields.del_args]:
-                        if re.match(pattern, name):
+                    for pattern in rule.del_args:
+                        if pattern.match(name):
                             log.debug(
                                 "TRACKER_PATTERNS: %s remove tracker arg: %s='%s'", parsed_new_url.netloc, name, val
                             )
                             query_args.remove((name, val))
+                            break
 
                 parsed_new_url = parsed_new_url._replace(query=urlencode(query_args))
                 new_url = urlunparse(parsed_new_url)
@@ -163,8 +266,8 @@ class TrackerPatternsDB:
                 # - 'http://example.org?q='       --> query_str is 'q=' and query_args is []
                 # - 'http://example.org?/foo/bar' --> query_str is 'foo/bar' and  query_args is []
                 # is a simple string and not a key/value dict.
-                for pattern in rule[self.Fields.del_args]:
-                    if re.match(pattern, query_str):
+                for pattern in rule.del_args:
+                    if pattern.match(query_str):
                         log.debug("TRACKER_PATTERNS: %s remove tracker arg: '%s'", parsed_new_url.netloc, query_str)
                         parsed_new_url = parsed_new_url._replace(query="")
                         new_url = urlunparse(parsed_new_url)
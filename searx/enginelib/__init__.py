@@ -34,7 +34,8 @@ import string
 import typer
 import msgspec
 
-from ..cache import ExpireCacheSQLite, ExpireCacheCfg
+from .. import valkeydb, get_setting
+from ..cache import ExpireCache, ExpireCacheSQLite, ExpireCacheValkey, ExpireCacheCfg
 
 if t.TYPE_CHECKING:
     from searx.enginelib import traits
@@ -43,17 +44,22 @@ if t.TYPE_CHECKING:
     from searx.result_types import EngineResults
     from searx.search.processors import OfflineParamTypes, OnlineParamTypes, ProcessorType
 
-ENGINES_CACHE: ExpireCacheSQLite = ExpireCacheSQLite.build_cache(
+ENGINES_CACHE: ExpireCache = ExpireCache.build_cache(
     ExpireCacheCfg(
         name="ENGINES_CACHE",
         MAXHOLD_TIME=60 * 60 * 24 * 7,  # 7 days
         MAINTENANCE_PERIOD=60 * 60,  # 1h
         MAX_VALUE_LEN=1024 * 1024 * 1024,  # 1MB
+        MEMORY_CACHE_SIZE=get_setting("search.engines_cache.memory_cache_size"),
+        WRITE_BEHIND_DELAY=get_setting("search.engines_cache.write_behind_delay"),
     )
 )
-"""Global :py:obj:`searx.cache.ExpireCacheSQLite` instance where the cached
-values from all engines are stored.  The `MAXHOLD_TIME` is 7 days and the
-`MAINTENANCE_PERIOD` is set to two hours."""
+"""Global :py:obj:`searx.cache.ExpireCache` instance where the cached
+values from all engines are stored (:py:obj:`searx.cache.ExpireCacheSQLite`
+or, if ``ENGINES_CACHE`` is listed in :ref:`valkey.caches <settings valkey>`,
+:py:obj:`searx.cache.ExpireCacheValkey`).  The `MAXHOLD_TIME` is 7 days and the
+`MAINTENANCE_PERIOD` is set to two hours.  The memory tier and the write-behind
+of the cache are opt-in (:ref:`search.engines_cache <settings search>`)."""
 
 app = typer.Typer()
 
@@ -62,29 +68,33 @@ app = typer.Typer()
 def state():
     """Show state for the caches of the engines."""
 
+    if isinstance(ENGINES_CACHE, ExpireCacheValkey):
+        valkeydb.initialize()
     title = "cache tables and key/values"
     print(title)
     print("=" * len(title))
     print(ENGINES_CACHE.state().report())
-    print()
-    title = f"properties of {ENGINES_CACHE.cfg.name}"
-    print(title)
-    print("=" * len(title))
-    print(str(ENGINES_CACHE.properties))
+    if isinstance(ENGINES_CACHE, ExpireCacheSQLite):
+        print()
+        title = f"properties of {ENGINES_CACHE.cfg.name}"
+        print(title)
+        print("=" * len(title))
+        print(str(ENGINES_CACHE.properties))
 
 
 @app.command()
 def maintenance(force: bool = True, truncate: bool = False):
     """Carry out maintenance on cache of the engines."""
+    if isinstance(ENGINES_CACHE, ExpireCacheValkey):
+        valkeydb.initialize()
     ENGINES_CACHE.maintenance(force=force, truncate=truncate)
 
 
 class EngineCache:
-    """Persistent (SQLite) key/value cache that deletes its values again after
-    ``expire`` seconds (default/max: :py:obj:`MAXHOLD_TIME
+    """Persistent (SQLite or Valkey) key/value cache that deletes its values
+    again after ``expire`` seconds (default/max: :py:obj:`MAXHOLD_TIME
     <searx.cache.ExpireCacheCfg.MAXHOLD_TIME>`).  This class is a wrapper around
-    :py:obj:`ENGINES_CACHE` (:py:obj:`ExpireCacheSQLite
-    <searx.cache.ExpireCacheSQLite>`).
+    :py:obj:`ENGINES_CACHE` (:py:obj:`ExpireCache <searx.cache.ExpireCache>`).
 
     In the :origin:`searx/engines/demo_offline.py` engine you can find an
     exemplary implementation of such a cache other examples are implemented
@@ -159,14 +169,17 @@ class EngineCache:
     discarded).
     """
 
-    def __init__(self, engine_name: str, expire: int | None = None):
-        self.expire: int = expire or ENGINES_CACHE.cfg.MAXHOLD_TIME
+    def __init__(self, engine_name: str, expire: int | None = None, cache: ExpireCache | None = None):
+        self.cache: ExpireCache = cache or ENGINES_CACHE
+        """The :py:obj:`ExpireCache <searx.cache.ExpireCache>` in which the
+        values are stored (default: :py:obj:`ENGINES_CACHE`)."""
+        self.expire: int = expire or self.cache.cfg.MAXHOLD_TIME
         _valid = "-_." + string.ascii_letters + string.digits
         # engine_name is a table and SQL table names must start with a letter
         self.table_name: str = "eng_" + "".join([c if c in _valid else "_" for c in engine_name])
 
     def set(self, key: str, value: t.Any, expire: int | None = None) -> bool:
-        return ENGINES_CACHE.set(
+        return self.cache.set(
             key=key,
             value=value,
             expire=expire or self.expire,
@@ -174,10 +187,10 @@ class EngineCache:
         )
 
     def get(self, key: str, default: t.Any = None) -> t.Any:
-        return ENGINES_CACHE.get(key, default=default, ctx=self.table_name)
+        return self.cache.get(key, default=default, ctx=self.table_name)
 
     def secret_hash(self, name: str | bytes) -> str:
-        return ENGINES_CACHE.secret_hash(name=name)
+        return self.cache.secret_hash(name=name)
 
 
 class EngineAbout(msgspec.Struct, kw_only=True):
@@ -351,6 +364,19 @@ class Engine(abc.ABC):  # pylint: disable=too-few-public-methods
     weight: float = 1.0
     """Weighting of the results of this engine (:ref:`weight <settings engines>`)."""
 
+    cache_ttl: int = 0
+    """Time (sec.) the parsed responses of this (``online``) engine are held in
+    the :py:obj:`response cache
+    <searx.search.processors.online.get_response_cache>`.  The same request (query, page, language, safe
+    search, time range) to the engine is answered from the cache within this
+    time, without sending a HTTP request and without parsing the response.
+    ``0`` (default) disables the response cache of the engine."""
+
+    result_cache_ttl: int | None = None
+    """Time (sec.) the results of this engine are held in the result cache
+    (:py:obj:`searx.search.result_cache`), ``0`` disables caching of the
+    results of this engine.  If unset, ``search.result_cache.ttl`` is used."""
+
     proxies: dict[str, dict[str, str]]
     """Set proxies for a specific engine (YAML):
 
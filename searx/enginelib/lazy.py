@@ -0,0 +1,238 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Lazy loading of the engine modules (:ref:`search.lazy_engines <settings
+search>`).
+
+Most of the engines in the settings are *disabled* (off by default in the
+preferences), but to build the preferences and the UI SearXNG needs the
+attributes of all engines: on startup all engine modules are imported.  In the
+lazy mode, an engine is registered as a :py:obj:`LazyEngine`: a namespace with
+the (simple) attributes of the module read from the :py:obj:`EngineManifest`,
+the module is imported on the first access to an attribute that is not in the
+manifest (e.g. the ``request`` function when the engine is used in a search).
+
+The manifest is build by SearXNG itself: when a module is not in the manifest
+(or the source of the module has been changed), the module is imported as
+usual and its attributes are added to the manifest.  The manifest is stored in
+a JSON file (:py:obj:`EngineManifest.MANIFEST_FILE`), the next start of a
+worker (or a reload) reads the attributes from this file.
+
+Engines with a ``setup`` or ``init`` function are never lazy, these functions
+are called at startup and need the module.
+"""
+
+from __future__ import annotations
+
+__all__ = ["EngineManifest", "LazyEngine"]
+
+import copy
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+import threading
+import types
+import typing as t
+
+import msgspec
+
+from searx import logger
+from searx.version import VERSION_STRING
+
+log = logger.getChild("enginelib.lazy")
+
+JSONTypes = (str, int, float, bool, type(None))
+
+
+def is_json_value(value: t.Any) -> bool:
+    """Returns ``True`` if the ``value`` survives a JSON round trip unchanged
+    (the type of a tuple or a set for instance does not)."""
+    if isinstance(value, JSONTypes):
+        return True
+    if type(value) is list:  # pylint: disable=unidiomatic-typecheck
+        return all(is_json_value(v) for v in value)
+    if type(value) is dict:  # pylint: disable=unidiomatic-typecheck
+        return all(isinstance(k, str) and is_json_value(v) for k, v in value.items())
+    return False
+
+
+class ManifestEntry(t.TypedDict):
+    """Entry of an engine module in the :py:obj:`EngineManifest`."""
+
+    digest: str
+    """Digest of the source of the module (and the SearXNG version)."""
+
+    attributes: dict[str, t.Any]
+    """Attributes of the module with a JSON value."""
+
+    names: list[str]
+    """Names of the other attributes of the module (functions, classes, ..) and
+    of the constants (``UPPER_CASE``, e.g. data tables the module has imported
+    from :py:obj:`searx.data`)."""
+
+
+class EngineManifest:
+    """Attributes of the engine modules, read from (and stored in) the file
+    :py:obj:`EngineManifest.MANIFEST_FILE`.  An entry of a module is only valid
+    as long as the source of the module is unchanged (:py:obj:`ManifestEntry.digest`).
+    """
+
+    MANIFEST_FILE: pathlib.Path = pathlib.Path(tempfile.gettempdir()) / "sxng_engines_manifest.json"
+
+    def __init__(self, engine_dir: str):
+        self.engine_dir: str = engine_dir
+        self.modules: dict[str, ManifestEntry] = {}
+        self.changed: bool = False
+        self._digests: dict[str, str] = {}
+
+    @classmethod
+    def load(cls, engine_dir: str) -> "EngineManifest":
+        manifest = cls(engine_dir)
+        try:
+            with open(cls.MANIFEST_FILE, encoding="utf-8") as f:
+                manifest.modules = json.load(f)
+        except FileNotFoundError:
+            log.debug("no engine manifest %s", cls.MANIFEST_FILE)
+        except (OSError, ValueError) as exc:
+            log.error("can't read engine manifest %s: %s", cls.MANIFEST_FILE, exc)
+        return manifest
+
+    def save(self):
+        """Writes the manifest (if changed), the file is replaced atomically:
+        workers starting in parallel read a complete manifest."""
+        if not self.changed:
+            return
+        try:
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=self.MANIFEST_FILE.parent, delete=False, suffix=".tmp"
+            ) as f:
+                json.dump(self.modules, f)
+            os.replace(f.name, self.MANIFEST_FILE)
+            self.changed = False
+        except OSError as exc:
+            log.error("can't write engine manifest %s: %s", self.MANIFEST_FILE, exc)
+
+    def digest(self, module_name: str) -> str:
+        digest = self._digests.get(module_name)
+        if digest is None:
+            h = hashlib.sha256(VERSION_STRING.encode())
+            with open(os.path.join(self.engine_dir, module_name + ".py"), "rb") as f:
+                h.update(f.read())
+            digest = self._digests[module_name] = h.hexdigest()
+        return digest
+
+    def get(self, module_name: str) -> ManifestEntry | None:
+        """Returns the entry of the module or ``None`` if there is no (valid)
+        entry of the module in the manifest."""
+        entry = self.modules.get(module_name)
+        if entry is None or entry["digest"] != self.digest(module_name):
+            return None
+        return entry
+
+    def add(self, module_name: str, module: types.ModuleType):
+        """Adds the attributes of the (just imported) ``module`` to the
+        manifest."""
+        attributes: dict[str, t.Any] = {}
+        names: list[str] = []
+        for name, value in vars(module).items():
+            if name.startswith("__"):
+                continue
+            if isinstance(value, msgspec.Struct):
+                # e.g. EngineAbout: update_engine_attributes builds the struct
+                # from the dict
+                value = msgspec.to_builtins(value)
+            if is_json_value(value) and not name.isupper():
+                # copy: the engine's settings are set in the module (e.g. the
+                # list of categories is modified in place)
+                attributes[name] = copy.deepcopy(value)
+            else:
+                names.append(name)
+        self.modules[module_name] = {"digest": self.digest(module_name), "attributes": attributes, "names": names}
+        self.changed = True
+
+    @staticmethod
+    def is_lazy(entry: ManifestEntry) -> bool:
+        """A module with a ``setup`` or ``init`` function can't be lazy."""
+        return "setup" not in entry["names"] and "init" not in entry["names"]
+
+
+class LazyEngine:
+    """Namespace of an engine whose module is imported on first use.
+
+    The namespace is initialized from the attributes of the module in the
+    :py:obj:`EngineManifest`, the attributes from the settings are set as in
+    the module of an engine.  When an attribute is accessed that is not in the
+    namespace but the module has it (e.g. a function), the module is imported
+    by ``loader``, the attributes of the namespace are set in the module and
+    from now on all attributes are read from (and set in) the module.
+    """
+
+    __slots__ = ("_lazy_module", "_lazy_attributes", "_lazy_names", "_lazy_loader", "_lazy_lock", "__dict__")
+
+    _lazy_module: types.ModuleType | None
+    _lazy_attributes: dict[str, t.Any]
+    _lazy_names: frozenset[str]
+    _lazy_loader: t.Callable[["LazyEngine"], types.ModuleType]
+    _lazy_lock: threading.RLock
+
+    def __init__(self, entry: ManifestEntry, loader: t.Callable[["LazyEngine"], types.ModuleType]):
+        object.__setattr__(self, "_lazy_module", None)
+        object.__setattr__(self, "_lazy_attributes", entry["attributes"])
+        object.__setattr__(self, "_lazy_names", frozenset(entry["names"]))
+        object.__setattr__(self, "_lazy_loader", loader)
+        object.__setattr__(self, "_lazy_lock", threading.RLock())
+        self.__dict__.update(copy.deepcopy(entry["attributes"]))
+
+    @property
+    def lazy_loaded(self) -> bool:
+        """``True`` if the module of the engine has been imported."""
+        return self._lazy_module is not None
+
+    def lazy_load(self) -> types.ModuleType:
+        """Imports the module of the engine (if not already done)."""
+        with self._lazy_lock:
+            if self._lazy_module is None:
+                module = self._lazy_loader(self)
+                for name, value in self.__dict__.items():
+                    # values unchanged since the manifest was build are not
+                    # set, the module keeps its own value (the value of a
+                    # module may be generated at import, e.g. a random token)
+                    if name in self._lazy_attributes and self._lazy_attributes[name] == value:
+                        continue
+                    setattr(module, name, value)
+                object.__setattr__(self, "_lazy_module", module)
+                self.__dict__.clear()
+                log.debug("engine %s: module %s loaded", getattr(module, "name", "?"), module.__name__)
+        return self._lazy_module  # type: ignore
+
+    def __getattr__(self, name: str) -> t.Any:
+        # called if the attribute is not in the namespace
+        module = self._lazy_module
+        if module is None:
+            if name not in self._lazy_names or name.startswith("__"):
+                raise AttributeError(f"engine has no attribute {name!r}")
+            module = self.lazy_load()
+        return getattr(module, name)
+
+    def __setattr__(self, name: str, value: t.Any):
+        with self._lazy_lock:
+            if self._lazy_module is None:
+                object.__setattr__(self, name, value)
+            else:
+                setattr(self._lazy_module, name, value)
+
+    def __delattr__(self, name: str):
+        with self._lazy_lock:
+            if self._lazy_module is None:
+                object.__delattr__(self, name)
+            else:
+                delattr(self._lazy_module, name)
+
+    def __dir__(self) -> t.Iterable[str]:
+        if self._lazy_module is None:
+            return sorted(set(self.__dict__) | self._lazy_names)
+        return dir(self._lazy_module)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._lazy_module is not None else "not loaded"
+        return f"<{self.__class__.__name__} {getattr(self, 'name', '?')} ({state})>"
@@ -9,17 +9,24 @@ To load traits from the persistence :py:obj:`EngineTraitsMap.from_data` can be
 used.
 """
 
+import copy
 import dataclasses
 import json
 import pathlib
-import types
 import typing as t
+from collections.abc import Mapping
 
 from searx import locales
 from searx.data import ENGINE_TRAITS, data_dir
+from searx.data.snapshot import SnapshotMap
 
 if t.TYPE_CHECKING:
+    import types
+
     from . import Engine
+    from .lazy import LazyEngine
+
+_TRAITS_MAP: "EngineTraitsMap | None" = None
 
 
 class EngineTraitsEncoder(json.JSONEncoder):
@@ -27,9 +34,13 @@ class EngineTraitsEncoder(json.JSONEncoder):
     :class:`json.JSONEncoder`."""
 
     def default(self, o: t.Any) -> t.Any:
-        """Return dictionary of a :class:`EngineTraits` object."""
+        """Return dictionary of a :class:`EngineTraits` object (or of a
+        :py:obj:`Mapping <collections.abc.Mapping>` from
+        :py:obj:`searx.data.ENGINE_TRAITS`)."""
         if isinstance(o, EngineTraits):
             return o.__dict__
+        if isinstance(o, Mapping):
+            return dict(o)
         return super().default(o)
 
 
@@ -84,6 +95,17 @@ class EngineTraits:
     """A place to store engine's custom traits, not related to the SearXNG core.
     """
 
+    def __post_init__(self):
+        # The values of searx.data.ENGINE_TRAITS are read-only mappings when
+        # they are loaded from a snapshot (searx.data.snapshot), the traits are
+        # plain dicts (modified by the engines, serialized to JSON).
+        if isinstance(self.regions, SnapshotMap):
+            self.regions = self.regions.to_dict()
+        if isinstance(self.languages, SnapshotMap):
+            self.languages = self.languages.to_dict()
+        if isinstance(self.custom, SnapshotMap):
+            self.custom = self.custom.to_dict()
+
     def get_language(self, searxng_locale: str, default: str | None = None) -> str | None:
         """Return engine's language string that *best fits* to SearXNG's locale.
 
@@ -118,10 +140,18 @@ class EngineTraits:
 
     def copy(self):
         """Create a copy of the dataclass object."""
-        return EngineTraits(**dataclasses.asdict(self))
+        # the maps of the regions and languages are flat (str -> str), only the
+        # custom traits need a deep copy
+        return EngineTraits(
+            regions=dict(self.regions),
+            languages=dict(self.languages),
+            all_locale=self.all_locale,
+            data_type=self.data_type,
+            custom=copy.deepcopy(self.custom),
+        )
 
     @classmethod
-    def fetch_traits(cls, engine: "Engine | types.ModuleType") -> "EngineTraits | None":
+    def fetch_traits(cls, engine: "Engine | types.ModuleType | LazyEngine") -> "EngineTraits | None":
         """Call a function ``fetch_traits(engine_traits)`` from engines namespace to fetch
         and set properties from the origin engine in the object ``engine_traits``.  If
         function does not exists, ``None`` is returned.
@@ -135,7 +165,7 @@ class EngineTraits:
             fetch_traits(engine_traits)
         return engine_traits
 
-    def set_traits(self, engine: "Engine | types.ModuleType") -> None:
+    def set_traits(self, engine: "Engine | types.ModuleType | LazyEngine") -> None:
         """Set traits from self object in a :py:obj:`.Engine` namespace.
 
         :param engine: engine instance build by :py:func:`searx.engines.load_engine`
@@ -199,6 +229,17 @@ class EngineTraitsMap(dict[str, EngineTraits]):
             obj[k] = EngineTraits(**v)
         return obj
 
+    @classmethod
+    def from_data_cached(cls) -> "EngineTraitsMap":
+        """Returns the :class:`EngineTraitsMap` from :py:obj:`from_data`, the
+        map is build once per process and shared (don't modify it,
+        :py:obj:`EngineTraits.set_traits` sets a copy of the traits in the
+        engine)."""
+        global _TRAITS_MAP  # pylint: disable=global-statement
+        if _TRAITS_MAP is None:
+            _TRAITS_MAP = cls.from_data()
+        return _TRAITS_MAP
+
     @classmethod
     def fetch_traits(cls, log: t.Callable[[str], None]) -> "EngineTraitsMap":
         from searx import (  # pylint: disable=cyclic-import, import-outside-toplevel
@@ -210,7 +251,7 @@ class EngineTraitsMap(dict[str, EngineTraits]):
         obj = cls()
 
         for engine_name in names:
-            engine: Engine | types.ModuleType = engines.engines[engine_name]
+            engine = engines.engines[engine_name]
             traits = None
 
             # pylint: disable=broad-exception-caught
@@ -232,7 +273,7 @@ class EngineTraitsMap(dict[str, EngineTraits]):
 
         return obj
 
-    def set_traits(self, engine: "Engine | types.ModuleType"):
+    def set_traits(self, engine: "Engine | types.ModuleType | LazyEngine"):
         """Set traits in a :py:obj:`Engine` namespace.
 
         :param engine: engine instance build by :py:func:`searx.engines.load_engine`
@@ -12,6 +12,7 @@ import typing as t
 
 import sys
 import copy
+import functools
 import os
 from os.path import realpath, dirname
 import warnings
@@ -24,10 +25,16 @@ from searx import logger, settings
 from searx.utils import load_module
 from searx.data import ENGINE_TRAITS
 from searx.enginelib import Engine, EngineAbout
+from searx.enginelib.lazy import EngineManifest, LazyEngine
 
 logger = logger.getChild('engines')
 ENGINE_DIR = dirname(realpath(__file__))
 
+EngineNamespace: t.TypeAlias = Engine | types.ModuleType | LazyEngine
+"""Namespace of an engine build by :py:obj:`load_engine`: an instance of a
+:py:obj:`searx.enginelib.Engine` class, the engine module or (in the lazy mode)
+a :py:obj:`searx.enginelib.lazy.LazyEngine`."""
+
 # Defaults for the namespace of an engine module, see load_engine()
 ENGINE_DEFAULT_ARGS: dict[str, t.Any] = {
     # Common options in the engine module
@@ -52,6 +59,7 @@ ENGINE_DEFAULT_ARGS: dict[str, t.Any] = {
     "send_accept_language_header": True,
     "tokens": [],
     "weight": 1.0,
+    "cache_ttl": 0,
 }
 """Default values that are set in an engine of type *module*, please compare
 with the class :py:obj:`searx.enginelib.Engine`."""
@@ -59,9 +67,9 @@ with the class :py:obj:`searx.enginelib.Engine`."""
 # set automatically when an engine does not have any tab category
 DEFAULT_CATEGORY = 'other'
 
-categories: "dict[str, list[Engine|types.ModuleType]]" = {'general': []}
+categories: "dict[str, list[EngineNamespace]]" = {'general': []}
 
-engines: "dict[str, Engine | types.ModuleType]" = {}
+engines: "dict[str, EngineNamespace]" = {}
 """Global registered engine instances."""
 
 engine_shortcuts = {}
@@ -74,6 +82,9 @@ engine_shortcuts = {}
 :meta hide-value:
 """
 
+_sys_modules_scanned = 0
+"""Size of :py:obj:`sys.modules` at the last scan of :py:obj:`set_loggers`."""
+
 
 def check_engine_module(module: types.ModuleType):
     # probe unintentional name collisions / for example name collisions caused
@@ -87,10 +98,13 @@ def check_engine_module(module: types.ModuleType):
         raise TypeError(msg)
 
 
-def load_engine(engine_data: dict[str, t.Any]) -> "Engine | types.ModuleType | None":
+def load_engine(engine_data: dict[str, t.Any], manifest: EngineManifest | None = None) -> "EngineNamespace | None":
     """Load engine from ``engine_data``.
 
     :param dict engine_data:  Attributes from YAML ``settings:engines/<engine>``
+    :param manifest: The :py:obj:`EngineManifest` in the lazy mode
+      (:py:obj:`searx.enginelib.lazy`), if the module is in the manifest, the
+      namespace is a :py:obj:`LazyEngine`.
     :return: initialized namespace of the ``<engine>``.
 
     1. create a namespace and load module of the ``<engine>``
@@ -108,7 +122,7 @@ def load_engine(engine_data: dict[str, t.Any]) -> "Engine | types.ModuleType | N
     - required attribute is not set :py:func:`is_missing_required_attributes`
 
     """
-    # pylint: disable=too-many-return-statements
+    # pylint: disable=too-many-return-statements,too-many-branches
 
     engine_name = engine_data.get('name')
     if engine_name is None:
@@ -128,16 +142,25 @@ def load_engine(engine_data: dict[str, t.Any]) -> "Engine | types.ModuleType | N
     if module_name is None:
         logger.error('The "engine" field is missing for the engine named "{}"'.format(engine_name))
         return None
-    try:
-        engine = load_module(module_name + '.py', ENGINE_DIR)
-    except (SyntaxError, KeyboardInterrupt, SystemExit, SystemError, ImportError, RuntimeError):
-        logger.exception('Fatal exception in engine "{}"'.format(module_name))
-        sys.exit(1)
-    except BaseException:
-        logger.exception('Cannot load engine "{}"'.format(module_name))
-        return None
 
-    check_engine_module(engine)
+    entry = manifest.get(module_name) if manifest is not None else None
+    engine: EngineNamespace
+    if entry is not None and EngineManifest.is_lazy(entry):
+        engine = LazyEngine(entry, functools.partial(load_lazy_module, module_name))
+    else:
+        try:
+            engine = load_module(module_name + '.py', ENGINE_DIR)
+        except (SyntaxError, KeyboardInterrupt, SystemExit, SystemError, ImportError, RuntimeError):
+            logger.exception('Fatal exception in engine "{}"'.format(module_name))
+            sys.exit(1)
+        except BaseException:
+            logger.exception('Cannot load engine "{}"'.format(module_name))
+            return None
+
+        check_engine_module(engine)
+        if manifest is not None and entry is None:
+            manifest.add(module_name, engine)
+
     update_engine_attributes(engine, engine_data)
     update_attributes_for_tor(engine)
 
@@ -145,7 +168,7 @@ def load_engine(engine_data: dict[str, t.Any]) -> "Engine | types.ModuleType | N
     # pylint: disable=import-outside-toplevel
     from searx.enginelib.traits import EngineTraitsMap
 
-    trait_map = EngineTraitsMap.from_data()
+    trait_map = EngineTraitsMap.from_data_cached()
     trait_map.set_traits(engine)
 
     if not is_engine_active(engine):
@@ -165,15 +188,35 @@ def load_engine(engine_data: dict[str, t.Any]) -> "Engine | types.ModuleType | N
     return engine
 
 
-def set_loggers(engine: "Engine|types.ModuleType", engine_name: str):
+def load_lazy_module(module_name: str, engine: LazyEngine) -> types.ModuleType:
+    """Loader of a :py:obj:`LazyEngine`, imports the module ``module_name``
+    on first use of the ``engine``."""
+    logger.debug("engine %s: load module %s (lazy)", engine.name, module_name)
+    module = load_module(module_name + '.py', ENGINE_DIR)
+    check_engine_module(module)
+    set_module_loggers()
+    return module
+
+
+def set_loggers(engine: EngineNamespace, engine_name: str):
     # set the logger for engine
     engine.logger = logger.getChild(engine_name)
-    # the engine may have load some other engines
-    # may sure the logger is initialized
+    set_module_loggers()
+
+
+def set_module_loggers():
+    """The engine may have load some other engines, make sure the logger of
+    these modules is initialized.  :py:obj:`sys.modules` is only scanned if
+    modules have been imported since the last scan."""
+    global _sys_modules_scanned  # pylint: disable=global-statement
+
+    if len(sys.modules) == _sys_modules_scanned:
+        return
     # use sys.modules.copy() to avoid "RuntimeError: dictionary changed size during iteration"
     # see https://github.com/python/cpython/issues/89516
     # and https://docs.python.org/3.10/library/sys.html#sys.modules
     modules = sys.modules.copy()
+    _sys_modules_scanned = len(modules)
     for module_name, module in modules.items():
         if (
             module_name.startswith("searx.engines")
@@ -184,7 +227,7 @@ def set_loggers(engine: "Engine|types.ModuleType", engine_name: str):
             module.logger = logger.getChild(module_engine_name)  # type: ignore
 
 
-def update_engine_attributes(engine: "Engine | types.ModuleType", engine_data: dict[str, t.Any]):
+def update_engine_attributes(engine: EngineNamespace, engine_data: dict[str, t.Any]):
     # pylint: disable=too-many-branches
 
     # set engine attributes from engine_data
@@ -232,31 +275,34 @@ def update_engine_attributes(engine: "Engine | types.ModuleType", engine_data: d
         raise ValueError(f"engine '{engine.name}' ({engine_data['engine']}) language_support should be set to True")
 
 
-def update_attributes_for_tor(engine: "Engine | types.ModuleType"):
+def update_attributes_for_tor(engine: EngineNamespace):
     if using_tor_proxy(engine) and hasattr(engine, 'onion_url'):
         engine.search_url = engine.onion_url + getattr(engine, 'search_path', '')  # type: ignore
         engine.timeout += settings['outgoing'].get('extra_proxy_timeout', 0)  # type: ignore
 
 
-def is_missing_required_attributes(engine: "Engine | types.ModuleType"):
+def is_missing_required_attributes(engine: EngineNamespace):
     """An attribute is required when its name doesn't start with ``_`` (underline).
     Required attributes must not be ``None``.
 
     """
     missing = False
     for engine_attr in dir(engine):
+        if isinstance(engine, LazyEngine) and engine_attr not in vars(engine):
+            # not a JSON value (see EngineManifest.add) / the value is not None
+            continue
         if not engine_attr.startswith('_') and getattr(engine, engine_attr) is None:
             logger.error('Missing engine config attribute: "{0}.{1}"'.format(engine.name, engine_attr))
             missing = True
     return missing
 
 
-def using_tor_proxy(engine: "Engine | types.ModuleType"):
+def using_tor_proxy(engine: EngineNamespace):
     """Return True if the engine configuration declares to use Tor."""
     return settings['outgoing'].get('using_tor_proxy') or getattr(engine, 'using_tor_proxy', False)
 
 
-def is_engine_active(engine: "Engine | types.ModuleType"):
+def is_engine_active(engine: EngineNamespace):
     # check if engine is inactive
     if engine.inactive is True:
         return False
@@ -268,7 +314,7 @@ def is_engine_active(engine: "Engine | types.ModuleType"):
     return True
 
 
-def call_engine_setup(engine: "Engine | types.ModuleType", engine_data: dict[str, t.Any]) -> bool:
+def call_engine_setup(engine: EngineNamespace, engine_data: dict[str, t.Any]) -> bool:
 
     setup_ok: bool | None = False
     setup_func = getattr(engine, "setup", None)
@@ -293,7 +339,7 @@ def call_engine_setup(engine: "Engine | types.ModuleType", engine_data: dict[str
     return setup_ok
 
 
-def register_engine(engine: "Engine | types.ModuleType"):
+def register_engine(engine: EngineNamespace):
     if engine.name in engines:
         logger.error('Engine config error: ambiguous name: {0}'.format(engine.name))
         sys.exit(1)
@@ -309,16 +355,21 @@ def register_engine(engine: "Engine | types.ModuleType"):
 
 
 def load_engines(engine_list: list[dict[str, t.Any]]):
-    """usage: ``engine_list = settings['engines']``"""
+    """usage: ``engine_list = settings['engines']``
+
+    If :ref:`search.lazy_engines <settings search>` is set, the engines are
+    loaded from the :py:obj:`EngineManifest` (see :py:obj:`searx.enginelib.lazy`).
+    """
     engines.clear()
     engine_shortcuts.clear()
     categories.clear()
     categories['general'] = []
+    manifest = EngineManifest.load(ENGINE_DIR) if settings['search']['lazy_engines'] else None
     for engine_data in engine_list:
         if engine_data.get("inactive") is True:
             continue
 
-        engine = load_engine(engine_data)
+        engine = load_engine(engine_data, manifest)
 
         if engine:
             register_engine(engine)
@@ -329,4 +380,6 @@ def load_engines(engine_list: list[dict[str, t.Any]]):
                 f"(PID {os.getpid()}) {engine_data.get('name', '???')}: can't register engine (loading engine failed)"
             )
             engine_data["inactive"] = True
+    if manifest is not None:
+        manifest.save()
     return engines
@@ -64,6 +64,10 @@ class SXNG_Request(flask.Request):
 
     remote_addr: str
 
+    favicon_urls: dict[str, str]
+    """Favicon URLs of the authorities prefetched by
+    :py:obj:`searx.favicons.proxy.prefetch_favicon_urls`."""
+
 
 #: A replacement for :py:obj:`flask.request` with type cast :py:`SXNG_Request`.
 sxng_request = typing.cast(SXNG_Request, flask.request)
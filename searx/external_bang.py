@@ -1,49 +1,217 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
-# pylint: disable=missing-module-docstring
+"""External bangs (``!!g``) from :origin:`searx/data/external_bangs.json`.
+
+The nested trie of the JSON file is compiled into a :py:obj:`BangTrie`, a
+character trie stored in flat arrays.  The trie is build by
+``python -m searx.data snapshot`` into a memory-mapped snapshot
+(:py:obj:`searx.data.snapshot`) that is shared by the worker processes, if
+there is no snapshot, the trie is build at the first use.
+"""
 
 __all__ = ["get_bang_url"]
 
 import typing as t
 
+from array import array
+from collections.abc import Mapping, Sequence
 from urllib.parse import quote_plus, urlparse
-from searx.data import EXTERNAL_BANGS
+
+from searx.data import EXTERNAL_BANGS, data_dir, snapshot
 
 LEAF_KEY = chr(16)
 
+EXTERNAL_BANGS_FILE = data_dir / "external_bangs.json"
+BANG_TRIE_FILE = data_dir / "external_bangs_trie.snapshot"
+"""Snapshot of the :py:obj:`BangTrie` build from :py:obj:`EXTERNAL_BANGS_FILE`."""
+
 if t.TYPE_CHECKING:
     from searx.search.models import SearchQuery
 
 
-def get_node(external_bangs_db: dict[str, t.Any], bang: str):
+def get_node(external_bangs_db: Mapping[str, t.Any], bang: str):
     node = external_bangs_db['trie']
     after = ''
     before = ''
     for bang_letter in bang:
         after += bang_letter
-        if after in node and isinstance(node, dict):
+        if after in node and isinstance(node, Mapping):
             node = node[after]
             before += after
             after = ''
     return node, before, after
 
 
-def get_bang_definition_and_ac(external_bangs_db: dict[str, t.Any], bang: str):
-    node, before, after = get_node(external_bangs_db, bang)
+def _bang_rank(bang_definition: str) -> int:
+    rank = bang_definition.split(chr(1))[-1]
+    return int(rank) if rank.isdigit() else 0
+
+
+def _collect_bangs(node: t.Any, prefix: str, bangs: dict[str, str]):
+    # collect the bangs of the nested trie of external_bangs.json
+    if isinstance(node, str):
+        bangs[prefix] = node
+    elif isinstance(node, Mapping):
+        for key, value in node.items():
+            if key == LEAF_KEY:
+                if isinstance(value, str):
+                    bangs[prefix] = value
+            else:
+                _collect_bangs(value, prefix + key, bangs)
 
-    bang_definition = None
-    bang_ac_list = []
-    if after != '':
-        for k in node:
-            if k.startswith(after):
-                bang_ac_list.append(before + k)
-    elif isinstance(node, dict):
-        bang_definition = node.get(LEAF_KEY)
-        bang_ac_list = [before + k for k in node.keys() if k != LEAF_KEY]
-    elif isinstance(node, str):
-        bang_definition = node
-        bang_ac_list = []
 
-    return bang_definition, bang_ac_list
+class BangTrie:
+    """Character trie of the external bangs stored in flat arrays of integers.
+
+    - the edges of the node ``n`` are ``edge_char[i]`` (code point, sorted) and
+      ``edge_node[i]`` for ``edge_start[n] <= i < edge_start[n + 1]``
+    - ``node_bang[n]`` is the bang of the node (``-1`` if there is no bang)
+    - the bangs that start with the name of the node ``n`` (the node itself is
+      excluded) are ``completion[i]`` for ``completion_start[n] <= i <
+      completion_start[n + 1]``, ordered by rank (descending) and name
+    - the name of the bang ``b`` is ``text[text_start[2b]:text_start[2b+1]]``
+      followed by its definition (up to ``text_start[2b+2]``)
+
+    Resolving a bang is ``O(len(bang))``, the autocomplete of a prefix is
+    ``O(len(prefix) + k)`` for ``k`` completions.
+    """
+
+    VERSION = 1
+    ARRAYS = ("edge_start", "edge_char", "edge_node", "node_bang", "completion_start", "completion", "text_start")
+
+    def __init__(self, arrays: Mapping[str, Sequence[int]], text: bytes | memoryview):
+        self.edge_start: Sequence[int] = arrays["edge_start"]
+        self.edge_char: Sequence[int] = arrays["edge_char"]
+        self.edge_node: Sequence[int] = arrays["edge_node"]
+        self.node_bang: Sequence[int] = arrays["node_bang"]
+        self.completion_start: Sequence[int] = arrays["completion_start"]
+        self.completion: Sequence[int] = arrays["completion"]
+        self.text_start: Sequence[int] = arrays["text_start"]
+        self.text: bytes | memoryview = text
+
+    @classmethod
+    def build(cls, external_bangs_db: Mapping[str, t.Any]) -> "BangTrie":
+        """Compiles the nested trie of ``external_bangs_db`` (format of
+        :origin:`searx/data/external_bangs.json`)."""
+        bangs: dict[str, str] = {}
+        _collect_bangs(external_bangs_db.get("trie", {}), "", bangs)
+        names = sorted(bangs)
+
+        text = bytearray()
+        text_start = array("i", [0])
+        for name in names:
+            text += name.encode("utf-8")
+            text_start.append(len(text))
+            text += bangs[name].encode("utf-8")
+            text_start.append(len(text))
+
+        children: list[dict[str, int]] = [{}]
+        node_bang = array("i", [-1])
+        for index, name in enumerate(names):
+            node = 0
+            for char in name:
+                child = children[node].get(char)
+                if child is None:
+                    child = children[node][char] = len(children)
+                    children.append({})
+                    node_bang.append(-1)
+                node = child
+            node_bang[node] = index
+
+        # each bang is a completion of the nodes on its path (the node of the
+        # bang excluded), in the order of the ranks
+        completions: list[list[int]] = [[] for _ in children]
+        for index in sorted(range(len(names)), key=lambda i: (-_bang_rank(bangs[names[i]]), names[i])):
+            node = 0
+            for char in names[index]:
+                completions[node].append(index)
+                node = children[node][char]
+
+        arrays: dict[str, array] = {name: array("i") for name in cls.ARRAYS}
+        arrays["node_bang"] = node_bang
+        arrays["edge_start"].append(0)
+        arrays["completion_start"].append(0)
+        for node, edges in enumerate(children):
+            for char, child in sorted(edges.items()):
+                arrays["edge_char"].append(ord(char))
+                arrays["edge_node"].append(child)
+            arrays["edge_start"].append(len(arrays["edge_char"]))
+            arrays["completion"].extend(completions[node])
+            arrays["completion_start"].append(len(arrays["completion"]))
+        arrays["text_start"] = text_start
+
+        return cls(arrays, bytes(text))
+
+    def to_snapshot(self) -> dict[str, t.Any]:
+        """Returns the value stored in the :py:obj:`snapshot
+        <searx.data.snapshot>` of the trie."""
+        value: dict[str, t.Any] = {"version": self.VERSION, "text": bytes(self.text)}
+        for name in self.ARRAYS:
+            value[name] = array("i", getattr(self, name)).tobytes()
+        return value
+
+    @classmethod
+    def from_snapshot(cls, value: Mapping[str, t.Any]) -> "BangTrie | None":
+        """Returns the trie of a :py:obj:`snapshot <searx.data.snapshot>`, the
+        arrays are not copied (``None`` if the version does not match)."""
+        if value.get("version") != cls.VERSION:
+            return None
+        return cls({name: value[name].cast("i") for name in cls.ARRAYS}, value["text"])
+
+    def _node(self, bang: str) -> int:
+        node = 0
+        for char in bang:
+            code = ord(char)
+            lo, hi = self.edge_start[node], self.edge_start[node + 1]
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self.edge_char[mid] < code:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo == self.edge_start[node + 1] or self.edge_char[lo] != code:
+                return -1
+            node = self.edge_node[lo]
+        return node
+
+    def _text(self, start: int) -> str:
+        return bytes(self.text[self.text_start[start] : self.text_start[start + 1]]).decode("utf-8")
+
+    def definition(self, bang: str) -> str | None:
+        """Returns the definition of the ``bang`` (or ``None``)."""
+        node = self._node(bang)
+        if node < 0 or self.node_bang[node] < 0:
+            return None
+        return self._text(2 * self.node_bang[node] + 1)
+
+    def autocomplete(self, prefix: str) -> list[str]:
+        """Returns the bangs that start with ``prefix`` (``prefix`` itself
+        excluded), ordered by rank."""
+        node = self._node(prefix)
+        if node < 0:
+            return []
+        start, end = self.completion_start[node], self.completion_start[node + 1]
+        return [self._text(2 * self.completion[i]) for i in range(start, end)]
+
+
+_BANG_TRIE: BangTrie | None = None
+
+
+def get_bang_trie() -> BangTrie:
+    """Returns the :py:obj:`BangTrie` of :py:obj:`searx.data.EXTERNAL_BANGS`
+    (from the snapshot :py:obj:`BANG_TRIE_FILE` if available)."""
+    global _BANG_TRIE  # pylint: disable=global-statement
+
+    if _BANG_TRIE is None:
+        value = snapshot.load(BANG_TRIE_FILE, EXTERNAL_BANGS_FILE)
+        trie = BangTrie.from_snapshot(value) if value is not None else None
+        _BANG_TRIE = trie or BangTrie.build(EXTERNAL_BANGS)
+    return _BANG_TRIE
+
+
+def _get_trie(external_bangs_db: Mapping[str, t.Any] | None) -> BangTrie:
+    if external_bangs_db is None:
+        return get_bang_trie()
+    return BangTrie.build(external_bangs_db)
 
 
 def resolve_bang_definition(bang_definition: str, query: str) -> tuple[str, int]:
@@ -62,35 +230,13 @@ def resolve_bang_definition(bang_definition: str, query: str) -> tuple[str, int]
 
 
 def get_bang_definition_and_autocomplete(
-    bang: str, external_bangs_db: dict[str, t.Any] | None = None
+    bang: str, external_bangs_db: Mapping[str, t.Any] | None = None
 ):  # pylint: disable=invalid-name
-    if external_bangs_db is None:
-        external_bangs_db = EXTERNAL_BANGS
-
-    bang_definition, bang_ac_list = get_bang_definition_and_ac(external_bangs_db, bang)
-
-    new_autocomplete = []
-    current = [*bang_ac_list]
-    done = set()
-    while len(current) > 0:
-        bang_ac = current.pop(0)
-        done.add(bang_ac)
-
-        current_bang_definition, current_bang_ac_list = get_bang_definition_and_ac(external_bangs_db, bang_ac)
-        if current_bang_definition:
-            _, order = resolve_bang_definition(current_bang_definition, '')
-            new_autocomplete.append((bang_ac, order))
-        for new_bang in current_bang_ac_list:
-            if new_bang not in done and new_bang not in current:
-                current.append(new_bang)
+    trie = _get_trie(external_bangs_db)
+    return trie.definition(bang), trie.autocomplete(bang)
 
-    new_autocomplete.sort(key=lambda t: (-t[1], t[0]))
-    new_autocomplete = list(map(lambda t: t[0], new_autocomplete))
 
-    return bang_definition, new_autocomplete
-
-
-def get_bang_url(search_query: "SearchQuery", external_bangs_db: dict[str, t.Any] | None = None) -> str | None:
+def get_bang_url(search_query: "SearchQuery", external_bangs_db: Mapping[str, t.Any] | None = None) -> str | None:
     """
     Redirects if the user supplied a correct bang search.
     :param search_query: This is a search_query object which contains preferences and the submitted queries.
@@ -98,12 +244,9 @@ def get_bang_url(search_query: "SearchQuery", external_bangs_db: dict[str, t.Any
     """
     ret_val = None
 
-    if external_bangs_db is None:
-        external_bangs_db = EXTERNAL_BANGS
-
     if search_query.external_bang:
-        bang_definition, _ = get_bang_definition_and_ac(external_bangs_db, search_query.external_bang)
-        if bang_definition and isinstance(bang_definition, str):
+        bang_definition = _get_trie(external_bangs_db).definition(search_query.external_bang)
+        if bang_definition:
             ret_val = resolve_bang_definition(bang_definition, search_query.query)[0]
 
     return ret_val
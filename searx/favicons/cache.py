@@ -27,6 +27,7 @@ import logging
 import sqlite3
 import tempfile
 import time
+from collections.abc import Iterable
 import typer
 
 import msgspec
@@ -109,6 +110,11 @@ class FaviconCacheConfig(msgspec.Struct):  # pylint: disable=too-few-public-meth
     HOLD_TIME: int = 60 * 60 * 24 * 30  # 30 days
     """Hold time (default in sec.), after which a BLOB is removed from the cache."""
 
+    FALLBACK_HOLD_TIME: int = 60 * 60 * 24  # 1 day
+    """Hold time (default in sec.) of a negative result (the resolver has not
+    found a favicon or has failed), after which the favicon is resolved
+    again."""
+
     LIMIT_TOTAL_BYTES: int = 1024 * 1024 * 50  # 50 MB
     """Maximum of bytes (default) stored in the cache of all blobs.  Note: The
     limit is only reached at each maintenance interval after which the oldest
@@ -193,6 +199,17 @@ class FaviconCache(abc.ABC):
         registered in the cache.  The ``None`` indicates that there was no entry
         in the cache."""
 
+    def get_many(self, resolver: str, authorities: Iterable[str]) -> dict[str, tuple[None | bytes, None | str]]:
+        """Returns the tuples ``(data, mime)`` of the ``authorities`` that have
+        been registered in the cache (mapped by the authority), authorities
+        without entry in the cache are not in the returned dictionary."""
+        ret_val: dict[str, tuple[None | bytes, None | str]] = {}
+        for authority in authorities:
+            data_mime = self(resolver, authority)
+            if data_mime is not None:
+                ret_val[authority] = data_mime
+        return ret_val
+
     @abc.abstractmethod
     def set(self, resolver: str, authority: str, mime: str | None, data: bytes | None) -> bool:
         """Set data and mime-type in the cache.  If data is None, the
@@ -298,6 +315,18 @@ CREATE TABLE IF NOT EXISTS blob_map (
         " ORDER BY bm.m_time ASC"
     )
 
+    SQL_SELECT_MANY = (
+        "SELECT bm.authority, bm.sha256, bm.m_time, b.data, b.mime FROM blob_map bm"
+        "  LEFT JOIN blobs b"
+        "    ON b.sha256 = bm.sha256"
+        " WHERE bm.resolver = ? AND bm.authority IN ({params})"
+    )
+    """Select the favicons of several authorities (:py:obj:`get_many`)."""
+
+    SQL_MAX_PARAMS = 500
+    """Max. number of authorities in one :py:obj:`SQL_SELECT_MANY` query (older
+    SQLite versions are limited to 999 parameters)."""
+
     SQL_INSERT_BLOBS = (
         "INSERT INTO blobs (sha256, bytes_c, mime, data) VALUES (?, ?, ?, ?)"
         "    ON CONFLICT (sha256) DO NOTHING"
@@ -319,14 +348,16 @@ CREATE TABLE IF NOT EXISTS blob_map (
 
     def __call__(self, resolver: str, authority: str) -> None | tuple[None | bytes, None | str]:
 
-        sql = "SELECT sha256 FROM blob_map WHERE resolver = ? AND authority = ?"
+        sql = "SELECT sha256, m_time FROM blob_map WHERE resolver = ? AND authority = ?"
         res = self.DB.execute(sql, (resolver, authority)).fetchone()
         if res is None:
             return None
 
         data, mime = (None, None)
-        sha256 = res[0]
+        sha256, m_time = res
         if sha256 == FALLBACK_ICON:
+            if self._fallback_expired(m_time):
+                return None
             return data, mime
 
         sql = "SELECT data, mime FROM blobs WHERE sha256 = ?"
@@ -335,6 +366,27 @@ CREATE TABLE IF NOT EXISTS blob_map (
             data, mime = res
         return data, mime
 
+    def get_many(self, resolver: str, authorities: Iterable[str]) -> dict[str, tuple[None | bytes, None | str]]:
+        """Looks up the favicons of the ``authorities`` in one query (per
+        :py:obj:`SQL_MAX_PARAMS` authorities)."""
+
+        authority_list = list(dict.fromkeys(authorities))
+        ret_val: dict[str, tuple[None | bytes, None | str]] = {}
+        for i in range(0, len(authority_list), self.SQL_MAX_PARAMS):
+            chunk = authority_list[i : i + self.SQL_MAX_PARAMS]
+            sql = self.SQL_SELECT_MANY.format(params=", ".join("?" * len(chunk)))
+            for authority, sha256, m_time, data, mime in self.DB.execute(sql, (resolver, *chunk)):
+                if sha256 == FALLBACK_ICON and self._fallback_expired(m_time):
+                    continue
+                if sha256 == FALLBACK_ICON or data is None:
+                    ret_val[authority] = (None, None)
+                else:
+                    ret_val[authority] = (data, mime)
+        return ret_val
+
+    def _fallback_expired(self, m_time: int | str) -> bool:
+        return int(m_time) < int(time.time()) - self.cfg.FALLBACK_HOLD_TIME
+
     def set(self, resolver: str, authority: str, mime: str | None, data: bytes | None) -> bool:
 
         if self.cfg.MAINTENANCE_MODE == "auto" and int(time.time()) > self.next_maintenance_time:
@@ -399,6 +451,12 @@ CREATE TABLE IF NOT EXISTS blob_map (
                 f" WHERE cast(m_time as integer) < cast(strftime('%s', 'now') as integer) - {self.cfg.HOLD_TIME}"
             )
             logger.debug("dropped %s obsolete blob_map items from db", res.rowcount)
+            res = conn.execute(
+                "DELETE FROM blob_map"
+                " WHERE sha256 = ? AND cast(m_time as integer) < cast(strftime('%s', 'now') as integer) - ?",
+                (FALLBACK_ICON, self.cfg.FALLBACK_HOLD_TIME),
+            )
+            logger.debug("dropped %s expired negative results from db", res.rowcount)
             res = conn.execute(self.SQL_DROP_LEFTOVER_BLOBS)
             logger.debug("dropped %s obsolete BLOBS from db", res.rowcount)
 
@@ -458,15 +516,17 @@ class FaviconCacheMEM(FaviconCache):
 
         self.cfg = cfg
         self._data: dict[str, t.Any] = {}
-        self._sha_mime: dict[str, tuple[str, str | None]] = {}
+        self._sha_mime: dict[str, tuple[str, str | None, float]] = {}
 
     def __call__(self, resolver: str, authority: str) -> None | tuple[bytes | None, str | None]:
 
-        sha, mime = self._sha_mime.get(f"{resolver}:{authority}", (None, None))
+        sha, mime, m_time = self._sha_mime.get(f"{resolver}:{authority}", (None, None, 0))
         if sha is None:
             return None
         data = self._data.get(sha)
         if data == FALLBACK_ICON:
+            if m_time < time.time() - self.cfg.FALLBACK_HOLD_TIME:
+                return None
             data = None
         return data, mime
 
@@ -486,7 +546,7 @@ class FaviconCacheMEM(FaviconCache):
 
         digest = hashlib.sha256(data).hexdigest()
         self._data[digest] = data
-        self._sha_mime[f"{resolver}:{authority}"] = (digest, mime)
+        self._sha_mime[f"{resolver}:{authority}"] = (digest, mime, time.time())
         return True
 
     def state(self):
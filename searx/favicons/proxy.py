@@ -3,10 +3,14 @@
 
 
 from typing import Callable
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
 
 import importlib
 import base64
+import os
 import pathlib
+import threading
 import urllib.parse
 
 import flask
@@ -14,6 +18,7 @@ from httpx import HTTPError
 import msgspec
 
 from searx import get_setting
+from searx import logger
 
 from searx.webutils import new_hmac, is_hmac_of
 from searx.exceptions import SearxEngineResponseException
@@ -22,13 +27,19 @@ from searx.extended_types import sxng_request
 from .resolvers import DEFAULT_RESOLVER_MAP
 from . import cache
 
+logger = logger.getChild('favicons.proxy')
+
 DEFAULT_FAVICON_URL = {}
 CFG: "FaviconProxyConfig" = None  # type: ignore
+PREFETCHER: "FaviconPrefetcher | None" = None
 
 
 def init(cfg: "FaviconProxyConfig"):
-    global CFG  # pylint: disable=global-statement
+    global CFG, PREFETCHER  # pylint: disable=global-statement
     CFG = cfg
+    PREFETCHER = None
+    if cfg.prefetch_workers > 0:
+        PREFETCHER = FaviconPrefetcher(cfg.prefetch_workers, cfg.prefetch_max_pending)
 
 
 def _initial_resolver_map():
@@ -80,6 +91,15 @@ class FaviconProxyConfig(msgspec.Struct):
             raise ValueError(f"resolver {fqn} is not implemented")
         return func
 
+    prefetch_workers: int = 4
+    """Number of threads that resolve the favicons of a result page in the
+    background (see :py:obj:`prefetch_favicon_urls`), ``0`` disables the
+    prefetching."""
+
+    prefetch_max_pending: int = 500
+    """Max. number of favicons in the queue of the prefetching, favicons are
+    not prefetched when the queue is full."""
+
     favicon_path: str = get_setting("ui.static_path") + "/themes/{theme}/img/empty_favicon.svg"  # type: ignore
     favicon_mime_type: str = "image/svg+xml"
 
@@ -109,6 +129,56 @@ class FaviconProxyConfig(msgspec.Struct):
         return data_url
 
 
+class FaviconPrefetcher:
+    """Resolves favicons in the background (:py:obj:`search_favicon`), the
+    resolved favicons are stored in the :py:obj:`.cache.FaviconCache`.
+
+    The resolvers are blocking functions (their HTTP requests are sent by the
+    loop of :py:obj:`searx.network`), the favicons are resolved by a pool of
+    ``workers`` threads.  A favicon that is resolved (or in the queue) is *in
+    flight*, the :py:obj:`favicon_proxy` does not wait for it."""
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending: dict[tuple[str, str], Future[tuple[None | bytes, None | str]]] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        self._pid: int = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # a forked process doesn't inherit the threads of its parent
+        if self._executor is None or self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="favicon_prefetch")
+            self._pending = {}
+            self._pid = os.getpid()
+        return self._executor
+
+    def submit(self, resolver: str, authority: str) -> bool:
+        """Adds the favicon of the ``authority`` to the queue, returns
+        ``False`` if the favicon is already in flight or the queue is full."""
+        key = (resolver, authority)
+        with self._lock:
+            executor = self._get_executor()
+            if key in self._pending or len(self._pending) >= self.max_pending:
+                return False
+            future = executor.submit(search_favicon, resolver, authority)
+            self._pending[key] = future
+        future.add_done_callback(lambda f: self._done(key, f))
+        return True
+
+    def _done(self, key: tuple[str, str], future: Future[tuple[None | bytes, None | str]]):
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+        if future.exception() is not None:
+            logger.error("prefetch favicon of %s failed: %s", key, future.exception())
+
+    def in_flight(self, resolver: str, authority: str) -> bool:
+        with self._lock:
+            return self._pid == os.getpid() and (resolver, authority) in self._pending
+
+
 def favicon_proxy():
     """REST API of SearXNG's favicon proxy service
 
@@ -143,6 +213,15 @@ def favicon_proxy():
     if not resolver or resolver not in CFG.resolver_map.keys():
         return "", 400
 
+    theme = sxng_request.preferences.get_value("theme")  # type: ignore
+    if PREFETCHER is not None and PREFETCHER.in_flight(resolver, authority):
+        # don't wait for the prefetching, return the default favicon, which
+        # must not be cached by the client
+        fav, mimetype = CFG.favicon(theme=theme)
+        resp = flask.send_from_directory(fav.parent, fav.name, mimetype=mimetype)
+        resp.headers['Cache-Control'] = "no-store"
+        return resp
+
     data, mime = search_favicon(resolver, authority)
 
     if data is not None and mime is not None:
@@ -151,7 +230,6 @@ def favicon_proxy():
         return resp
 
     # return default favicon from static path
-    theme = sxng_request.preferences.get_value("theme")  # type: ignore
     fav, mimetype = CFG.favicon(theme=theme)
     return flask.send_from_directory(fav.parent, fav.name, mimetype=mimetype)
 
@@ -192,6 +270,47 @@ def search_favicon(resolver: str, authority: str) -> tuple[None | bytes, None |
     return data, mime
 
 
+def _favicon_url(authority: str, data_mime: tuple[None | bytes, None | str] | None) -> str:
+
+    if data_mime == (None, None):
+        # we have already checked, the resolver does not have a favicon
+        theme = sxng_request.preferences.get_value("theme")  # type: ignore
+        return CFG.favicon_data_url(theme=theme)
+
+    if data_mime is not None:
+        data, mime = data_mime
+        return f"data:{mime};base64,{str(base64.b64encode(data), 'utf-8')}"  # type: ignore
+
+    h = new_hmac(CFG.secret_key, authority.encode())
+    proxy_url = flask.url_for('favicon_proxy')
+    query = urllib.parse.urlencode({"authority": authority, "h": h})
+    return f"{proxy_url}?{query}"
+
+
+def prefetch_favicon_urls(authorities: Iterable[str]):
+    """Looks up the favicons of the ``authorities`` (e.g. of all results of a
+    result page) in one query to the :py:obj:`.cache.FaviconCache` and holds
+    the URLs for :py:obj:`favicon_url` in the current request.  Is called by
+    :py:obj:`searx.webapp.render` before the templates are rendered.
+
+    The favicons that are not in the cache are resolved in the background by
+    the :py:obj:`FaviconPrefetcher`, before the client requests them from the
+    :py:obj:`favicon_proxy`."""
+
+    resolver = sxng_request.preferences.get_value('favicon_resolver')  # type: ignore
+    if not resolver or resolver not in CFG.resolver_map.keys():
+        return
+
+    authority_list = list(dict.fromkeys(a for a in authorities if a))
+    data_mimes = cache.CACHE.get_many(resolver, authority_list)
+    urls: dict[str, str] = getattr(sxng_request, "favicon_urls", {})
+    for authority in authority_list:
+        urls[authority] = _favicon_url(authority, data_mimes.get(authority))
+        if PREFETCHER is not None and authority not in data_mimes:
+            PREFETCHER.submit(resolver, authority)
+    sxng_request.favicon_urls = urls  # pylint: disable=assigning-non-slot
+
+
 def favicon_url(authority: str) -> str:
     """Function to generate the image URL used for favicons in SearXNG's result
     lists.  The ``authority`` argument (aka netloc / :rfc:`3986`) is usually a
@@ -213,25 +332,17 @@ def favicon_url(authority: str) -> str:
 
     .. _data URL: https://developer.mozilla.org/en-US/docs/Web/HTTP/Basics_of_HTTP/Data_URLs
 
+    The URLs prefetched by :py:obj:`prefetch_favicon_urls` are returned without
+    a further lookup in the cache.
     """
 
+    url = getattr(sxng_request, "favicon_urls", {}).get(authority)
+    if url is not None:
+        return url
+
     resolver = sxng_request.preferences.get_value('favicon_resolver')  # type: ignore
     # if resolver is empty or not valid, just return nothing.
     if not resolver or resolver not in CFG.resolver_map.keys():
         return ""
 
-    data_mime = cache.CACHE(resolver, authority)
-
-    if data_mime == (None, None):
-        # we have already checked, the resolver does not have a favicon
-        theme = sxng_request.preferences.get_value("theme")  # type: ignore
-        return CFG.favicon_data_url(theme=theme)
-
-    if data_mime is not None:
-        data, mime = data_mime
-        return f"data:{mime};base64,{str(base64.b64encode(data), 'utf-8')}"  # type: ignore
-
-    h = new_hmac(CFG.secret_key, authority.encode())
-    proxy_url = flask.url_for('favicon_proxy')
-    query = urllib.parse.urlencode({"authority": authority, "h": h})
-    return f"{proxy_url}?{query}"
+    return _favicon_url(authority, cache.CACHE(resolver, authority))
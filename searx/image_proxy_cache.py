@@ -0,0 +1,272 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""On-disk cache of the :ref:`image_proxy`.
+
+The images are stored *content addressed*: the file of an image is named by the
+sha256 hash of its content, the same image referenced by different URLs is
+stored only once.  The mapping from the (hashed) URL of an image to its file
+and the validators of the upstream response (``ETag`` & ``Last-Modified``) are
+managed in a SQLite DB (:py:obj:`searx.sqlitedb.SQLiteAppl`).
+
+The cache is size-bounded (:ref:`server.image_proxy_cache
+<image_proxy_cache>`), when the total size of the files exceeds the limit, the
+least recently used files are evicted.
+
+Cached images are served from the file by :py:obj:`flask.send_file`, the WSGI
+server can use ``sendfile`` (``wsgi.file_wrapper``) and there is no need to
+iterate over the content in Python.
+"""
+
+from __future__ import annotations
+
+__all__ = ["ImageProxyCache", "CachedImage", "CACHE", "init"]
+
+import dataclasses
+import hashlib
+import os
+import pathlib
+import tempfile
+import time
+import typing as t
+
+from searx import get_setting, logger
+from searx import sqlitedb
+
+logger = logger.getChild("image_proxy_cache")
+
+CACHE: "ImageProxyCache | None" = None
+"""Cache of the image proxy, is ``None`` if the cache is not enabled."""
+
+
+def init():
+    global CACHE  # pylint: disable=global-statement
+
+    CACHE = None
+    if not get_setting("server.image_proxy_cache.enabled"):
+        return
+    path = get_setting("server.image_proxy_cache.path") or os.path.join(tempfile.gettempdir(), "sxng_image_proxy")
+    CACHE = ImageProxyCache(pathlib.Path(path), get_setting("server.image_proxy_cache.max_bytes"))  # type: ignore
+    logger.debug("image proxy cache in %s (max. %s bytes)", CACHE.path, CACHE.max_bytes)
+
+
+@dataclasses.dataclass
+class CachedImage:
+    """An image in the :py:obj:`ImageProxyCache`."""
+
+    path: pathlib.Path
+    sha256: str
+    mime: str
+    etag: str | None
+    last_modified: str | None
+
+
+class ImageProxyCache(sqlitedb.SQLiteAppl):
+    """Content addressed, size-bounded cache of the proxied images.  The files
+    are stored in the folder ``<path>/files`` and the DB in ``<path>/cache.db``.
+    """
+
+    DB_SCHEMA = 1
+
+    DDL_FILES = """\
+CREATE TABLE IF NOT EXISTS files (
+  sha256     TEXT,
+  bytes_c    INTEGER,
+  a_time     INTEGER DEFAULT (strftime('%s', 'now')),  -- last access (unix epoch) time in sec.
+  PRIMARY KEY (sha256))"""
+
+    """Table of the files, the ``a_time`` is used to evict the least recently
+    used files."""
+
+    DDL_URL_MAP = """\
+CREATE TABLE IF NOT EXISTS url_map (
+  url_hash       TEXT,
+  sha256         TEXT,
+  mime           TEXT NOT NULL,
+  etag           TEXT,
+  last_modified  TEXT,
+  PRIMARY KEY (url_hash))"""
+
+    """Table to map from the URL of an image to the sha256 hash value of its
+    content (and the validators of the upstream response)."""
+
+    DDL_CREATE_TABLES = {
+        "files": DDL_FILES,
+        "url_map": DDL_URL_MAP,
+    }
+
+    SQL_SELECT = (
+        "SELECT um.sha256, um.mime, um.etag, um.last_modified, f.a_time FROM url_map um"
+        "  JOIN files f"
+        "    ON f.sha256 = um.sha256"
+        " WHERE um.url_hash = ?"
+    )
+
+    SQL_INSERT_FILES = (
+        "INSERT INTO files (sha256, bytes_c) VALUES (?, ?)"
+        "    ON CONFLICT DO UPDATE SET a_time=strftime('%s', 'now')"
+    )  # fmt: skip
+
+    SQL_INSERT_URL_MAP = (
+        "INSERT INTO url_map (url_hash, sha256, mime, etag, last_modified) VALUES (?, ?, ?, ?, ?)"
+        "    ON CONFLICT DO UPDATE"
+        "   SET sha256=excluded.sha256, mime=excluded.mime,"
+        "       etag=excluded.etag, last_modified=excluded.last_modified"
+    )
+
+    A_TIME_RESOLUTION = 60
+    """The access time of a file is updated (at most) once per
+    ``A_TIME_RESOLUTION`` seconds, a cache hit does not require a write to the
+    DB on every request."""
+
+    def __init__(self, path: pathlib.Path, max_bytes: int):
+        path.mkdir(parents=True, exist_ok=True)
+        (path / "tmp").mkdir(exist_ok=True)
+        super().__init__(str(path / "cache.db"))
+        self.path: pathlib.Path = path
+        self.max_bytes: int = max_bytes
+
+    @staticmethod
+    def url_hash(url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def file_path(self, sha256: str) -> pathlib.Path:
+        return self.path / "files" / sha256[:2] / sha256
+
+    def get(self, url: str) -> CachedImage | None:
+        """Returns the cached image of the ``url`` or ``None``."""
+
+        res = self.DB.execute(self.SQL_SELECT, (self.url_hash(url),)).fetchone()
+        if res is None:
+            return None
+        sha256, mime, etag, last_modified, a_time = res
+        if int(a_time) < int(time.time()) - self.A_TIME_RESOLUTION:
+            with self.DB as conn:
+                conn.execute("UPDATE files SET a_time=strftime('%s', 'now') WHERE sha256 = ?", (sha256,))
+        return CachedImage(self.file_path(sha256), sha256, mime, etag, last_modified)
+
+    def writer(
+        self, url: str, mime: str, etag: str | None, last_modified: str | None, max_file_bytes: int
+    ) -> "ImageWriter":
+        """Returns a :py:obj:`ImageWriter` to add the image of the ``url`` to
+        the cache while it is streamed to the client."""
+        return ImageWriter(self, url, mime, etag, last_modified, max_file_bytes)
+
+    def add(
+        self, url: str, tmp_file: pathlib.Path, sha256: str, mime: str, etag: str | None, last_modified: str | None
+    ):
+        """Moves the (complete) ``tmp_file`` into the cache, if the size of the
+        cache exceeds :py:obj:`ImageProxyCache.max_bytes`, the least recently
+        used files are evicted."""
+
+        dst = self.file_path(sha256)
+        dst.parent.mkdir(exist_ok=True, parents=True)
+        bytes_c = tmp_file.stat().st_size
+        # the rename is atomic, a file in the cache is always complete
+        tmp_file.replace(dst)
+        with self.connect() as conn:
+            conn.execute(self.SQL_INSERT_FILES, (sha256, bytes_c))
+            conn.execute(self.SQL_INSERT_URL_MAP, (self.url_hash(url), sha256, mime, etag, last_modified))
+        conn.close()
+        self.evict()
+
+    def evict(self) -> int:
+        """Evicts the least recently used files until the total size is in
+        :py:obj:`ImageProxyCache.max_bytes`, returns the number of evicted
+        files."""
+
+        total_bytes = self.DB.execute("SELECT SUM(bytes_c) FROM files").fetchone()[0] or 0
+        if total_bytes <= self.max_bytes:
+            return 0
+
+        x = total_bytes - self.max_bytes
+        c = 0
+        sha_list: list[str] = []
+        for sha256, bytes_c in self.DB.execute("SELECT sha256, bytes_c FROM files ORDER BY a_time ASC"):
+            sha_list.append(sha256)
+            c += bytes_c
+            if c >= x:
+                break
+
+        with self.connect() as conn:
+            params = ", ".join("?" * len(sha_list))
+            conn.execute(f"DELETE FROM url_map WHERE sha256 IN ({params})", sha_list)
+            conn.execute(f"DELETE FROM files WHERE sha256 IN ({params})", sha_list)
+        conn.close()
+
+        # A file that is currently sent to a client can be unlinked, the
+        # client's open file handle remains valid.
+        for sha256 in sha_list:
+            self.file_path(sha256).unlink(missing_ok=True)
+        logger.debug("evicted %s files with total size of %s bytes", len(sha_list), c)
+        return len(sha_list)
+
+    def state(self) -> dict[str, int]:
+        files, bytes_c = self.DB.execute("SELECT count(*), SUM(bytes_c) FROM files").fetchone()
+        urls = self.DB.execute("SELECT count(*) FROM url_map").fetchone()[0]
+        return {"files": files, "bytes": bytes_c or 0, "urls": urls}
+
+
+class ImageWriter:
+    """Writes the chunks of an upstream response to a temporary file, which is
+    moved into the cache by :py:obj:`ImageWriter.commit` when the response is
+    complete.  If the image is bigger than ``max_file_bytes``, the image is
+    not cached.
+
+    The temporary file is created by the first :py:obj:`ImageWriter.write`, a
+    response that is never streamed (e.g. ``HEAD``) leaves no file behind.
+    """
+
+    def __init__(
+        self,
+        cache: ImageProxyCache,
+        url: str,
+        mime: str,
+        etag: str | None,
+        last_modified: str | None,
+        max_file_bytes: int,
+    ):
+        self.cache = cache
+        self.url = url
+        self.mime = mime
+        self.etag = etag
+        self.last_modified = last_modified
+        self.max_file_bytes = max_file_bytes
+        self.bytes_c: int = 0
+        self._sha256 = hashlib.sha256()
+        self._file: t.BinaryIO | None = None
+        self._closed: bool = False
+
+    def write(self, chunk: bytes):
+        self.bytes_c += len(chunk)
+        if self._closed:
+            return
+        if self.bytes_c > self.max_file_bytes:
+            logger.debug("image to big to cache (bytes > %s): %s", self.max_file_bytes, self.url)
+            self.discard()
+            return
+        if self._file is None:
+            self._file = tempfile.NamedTemporaryFile(  # pylint: disable=consider-using-with
+                dir=self.cache.path / "tmp", delete=False
+            )
+        self._sha256.update(chunk)
+        self._file.write(chunk)
+
+    def commit(self):
+        self._closed = True
+        if self._file is None:
+            return
+        self._file.close()
+        tmp_file = pathlib.Path(self._file.name)
+        self._file = None
+        try:
+            self.cache.add(self.url, tmp_file, self._sha256.hexdigest(), self.mime, self.etag, self.last_modified)
+        except OSError as exc:
+            logger.error("can't add image to the cache: %s", exc)
+            tmp_file.unlink(missing_ok=True)
+
+    def discard(self):
+        self._closed = True
+        if self._file is None:
+            return
+        self._file.close()
+        pathlib.Path(self._file.name).unlink(missing_ok=True)
+        self._file = None
@@ -138,8 +138,15 @@ def get_cfg() -> config.Config:
         from . import settings_loader  # pylint: disable=import-outside-toplevel
 
         cfg_file = (settings_loader.get_user_cfg_folder() or Path("/etc/searxng")) / "limiter.toml"
-        CFG = config.Config.from_toml(LIMITER_CFG_SCHEMA, cfg_file, searx.compat.LIMITER_CFG_DEPRECATED)
-        searx.compat.limiter_fix_cfg(CFG, cfg_file)
+        cfg = config.Config.from_toml(LIMITER_CFG_SCHEMA, cfg_file, searx.compat.LIMITER_CFG_DEPRECATED)
+        searx.compat.limiter_fix_cfg(cfg, cfg_file)
+        sliding_window = cfg['botdetection.ip_limit.sliding_window']
+        if sliding_window not in ip_limit.SLIDING_WINDOWS:
+            raise ValueError(
+                f"{cfg_file}: botdetection.ip_limit.sliding_window {sliding_window!r}"
+                f" is not one of {ip_limit.SLIDING_WINDOWS}"
+            )
+        CFG = cfg
 
     return CFG
 
@@ -1,19 +1,25 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # pylint: disable=missing-module-docstring
 
+import os
 import math
 import contextlib
 from timeit import default_timer
 
+from searx import get_setting, logger, valkeydb
 from searx.engines import engines
+from searx.network import get_network_stats
 from searx.openmetrics import OpenMetricsFamily
 from .models import HistogramStorage, CounterStorage, VoidHistogram, VoidCounterStorage
 from .error_recorder import count_error, count_exception, errors_per_engines
+from .shared import SharedMetrics, ValkeyMetrics
 
 __all__ = [
     "initialize",
+    "sync",
     "get_engines_stats",
     "get_engine_errors",
+    "get_engine_timeout",
     "histogram",
     "histogram_observe",
     "histogram_observe_time",
@@ -30,6 +36,7 @@ ENDPOINTS = {'search'}
 
 histogram_storage: HistogramStorage = None  # type: ignore
 counter_storage: CounterStorage = None  # type: ignore
+shared_metrics: SharedMetrics | None = None
 
 
 @contextlib.contextmanager
@@ -67,11 +74,28 @@ def counter(*args):
     return counter_storage.get(*args)
 
 
+def sync():
+    """Loads the metrics of all workers of the node, if a backend to share
+    the metrics is configured in :ref:`general.metrics <settings general>`
+    (see :py:obj:`searx.metrics.shared`)."""
+    if shared_metrics is not None:
+        shared_metrics.sync()
+
+
+def _after_fork():
+    if shared_metrics is not None:
+        shared_metrics.after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
 def initialize(engine_names: list[str] | None = None, enabled: bool = True) -> None:
     """
     Initialize metrics
     """
-    global counter_storage, histogram_storage  # pylint: disable=global-statement
+    global counter_storage, histogram_storage, shared_metrics  # pylint: disable=global-statement
 
     if enabled:
         counter_storage = CounterStorage()
@@ -90,6 +114,10 @@ def initialize(engine_names: list[str] | None = None, enabled: bool = True) -> N
     histogram_width = 0.1
     histogram_size = int(1.5 * max_timeout / histogram_width)
 
+    # bytes of the image proxy served from its cache and from upstream
+    counter_storage.configure('image_proxy', 'bytes', 'cache')
+    counter_storage.configure('image_proxy', 'bytes', 'upstream')
+
     # engines
     for engine_name in engine_names or engines:
         # search count
@@ -99,6 +127,9 @@ def initialize(engine_names: list[str] | None = None, enabled: bool = True) -> N
         counter_storage.configure('engine', engine_name, 'search', 'count', 'error')
         # score of the engine
         counter_storage.configure('engine', engine_name, 'score')
+        # hits & misses of the result cache
+        counter_storage.configure('engine', engine_name, 'result_cache', 'hit')
+        counter_storage.configure('engine', engine_name, 'result_cache', 'miss')
         # result count per requests
         histogram_storage.configure(1, 100, 'engine', engine_name, 'result', 'count')
         # time doing HTTP requests
@@ -107,6 +138,24 @@ def initialize(engine_names: list[str] | None = None, enabled: bool = True) -> N
         # .time.request and ...response times may overlap .time.http time.
         histogram_storage.configure(histogram_width, histogram_size, 'engine', engine_name, 'time', 'total')
 
+    if shared_metrics is not None:
+        shared_metrics.stop()
+        shared_metrics = None
+
+    if enabled and get_setting("general.metrics.backend") == "valkey":
+        client = valkeydb.client()
+        if client is None:
+            logger.error("metrics backend 'valkey' requires a valkey DB (valkey.url), metrics are not shared")
+        else:
+            shared_metrics = ValkeyMetrics(
+                client,
+                counter_storage,
+                histogram_storage,
+                errors_per_engines,
+                flush_interval=get_setting("general.metrics.flush_interval"),
+            )
+            shared_metrics.start()
+
 
 def get_engine_errors(engline_name_list):
     result = {}
@@ -163,6 +212,27 @@ def get_reliabilities(engline_name_list):
     return reliabilities
 
 
+def get_engine_timeout(engine_name: str) -> float:
+    """Returns the effective timeout (sec.) of the engine.  If the
+    :ref:`search.adaptive_timeout <settings search>` is enabled, the timeout is
+    derived from the ``percentile`` of the recorded response times of the
+    engine (``('engine', name, 'time', 'total')``), otherwise (or when there
+    are not enough response times) it is the :ref:`timeout <settings engines>`
+    of the engine."""
+    timeout = engines[engine_name].timeout
+    cfg = get_setting("search.adaptive_timeout")
+    if not cfg["enabled"]:
+        return timeout
+
+    h = histogram('engine', engine_name, 'time', 'total', raise_on_not_found=False)
+    if h is None or h.count < cfg["min_count"]:
+        return timeout
+    value = h.percentage(cfg["percentile"])
+    if value is None:
+        return timeout
+    return round(min(max(float(value) * cfg["factor"], cfg["min"]), cfg["max"]), 1)
+
+
 def get_engines_stats(engine_name_list: list[str]):
     assert counter_storage is not None
     assert histogram_storage is not None
@@ -198,6 +268,9 @@ def get_engines_stats(engine_name_list: list[str]):
             'score': 0,
             'score_per_result': 0,
             'result_count': result_count,
+            'result_cache_hit': counter('engine', engine_name, 'result_cache', 'hit'),
+            'result_cache_miss': counter('engine', engine_name, 'result_cache', 'miss'),
+            'timeout': get_engine_timeout(engine_name),
         }
 
         if successful_count and result_count_sum:
@@ -263,6 +336,13 @@ def openmetrics(engine_stats, engine_reliabilities):
             data_info=[{'engine_name': engine['name']} for engine in engine_stats['time']],
             data=[engine['http'] or 0 for engine in engine_stats['time']],
         ),
+        OpenMetricsFamily(
+            key="searxng_engines_timeout_seconds",
+            type_hint="gauge",
+            help_hint="The effective timeout of the engine",
+            data_info=[{'engine_name': engine['name']} for engine in engine_stats['time']],
+            data=[engine['timeout'] for engine in engine_stats['time']],
+        ),
         OpenMetricsFamily(
             key="searxng_engines_result_count_total",
             type_hint="counter",
@@ -290,5 +370,50 @@ def openmetrics(engine_stats, engine_reliabilities):
                 for engine in engine_stats['time']
             ],
         ),
+        OpenMetricsFamily(
+            key="searxng_engines_result_cache_hits_total",
+            type_hint="counter",
+            help_hint="The total amount of engine requests answered from the result cache",
+            data_info=[{'engine_name': engine['name']} for engine in engine_stats['time']],
+            data=[engine['result_cache_hit'] for engine in engine_stats['time']],
+        ),
+        OpenMetricsFamily(
+            key="searxng_engines_result_cache_misses_total",
+            type_hint="counter",
+            help_hint="The total amount of engine requests not found in the result cache",
+            data_info=[{'engine_name': engine['name']} for engine in engine_stats['time']],
+            data=[engine['result_cache_miss'] for engine in engine_stats['time']],
+        ),
+        OpenMetricsFamily(
+            key="searxng_image_proxy_bytes_total",
+            type_hint="counter",
+            help_hint="The total amount of bytes sent by the image proxy (from its cache or from upstream)",
+            data_info=[{'source': 'cache'}, {'source': 'upstream'}],
+            data=[counter('image_proxy', 'bytes', 'cache'), counter('image_proxy', 'bytes', 'upstream')],
+        ),
+    ]
+    network_stats = get_network_stats()
+    metrics += [
+        OpenMetricsFamily(
+            key="searxng_network_pool_connections",
+            type_hint="gauge",
+            help_hint="The number of connections in the pools of the network",
+            data_info=[{'network': name} for name in network_stats],
+            data=[stats['connections'] for stats in network_stats.values()],
+        ),
+        OpenMetricsFamily(
+            key="searxng_network_pool_idle_connections",
+            type_hint="gauge",
+            help_hint="The number of idle (keep-alive) connections in the pools of the network",
+            data_info=[{'network': name} for name in network_stats],
+            data=[stats['idle'] for stats in network_stats.values()],
+        ),
+        OpenMetricsFamily(
+            key="searxng_network_tls_handshakes_total",
+            type_hint="counter",
+            help_hint="The total amount of TLS handshakes of the network",
+            data_info=[{'network': name} for name in network_stats],
+            data=[stats['tls_handshakes'] for stats in network_stats.values()],
+        ),
     ]
     return "".join([str(metric) for metric in metrics])
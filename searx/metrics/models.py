@@ -1,8 +1,6 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # pylint: disable=missing-module-docstring
 
-import typing as t
-
 import decimal
 import threading
 
@@ -137,7 +135,7 @@ class CounterStorage:  # pylint: disable=missing-class-docstring
 
     def clear(self):
         with self.lock:
-            self.counters: dict[t.Hashable, int] = {}
+            self.counters: dict[tuple[str, ...], int] = {}
 
     def configure(self, *args: str):
         with self.lock:
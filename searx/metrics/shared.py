@@ -0,0 +1,311 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Metrics shared by the worker processes of a node.
+
+The :py:obj:`CounterStorage <searx.metrics.models.CounterStorage>`, the
+:py:obj:`HistogramStorage <searx.metrics.models.HistogramStorage>` and the
+:py:obj:`errors_per_engines <searx.metrics.error_recorder.errors_per_engines>`
+are process local.  When SearXNG runs in N worker processes, ``/stats`` and
+``/metrics`` only show the values of the worker that answered the request.
+
+With :ref:`general.metrics.backend: valkey <settings general>` the values of all
+workers are summed up in the Valkey DB:
+
+- Recording a value is not changed: counters and histograms are updated in the
+  local storage, there is no round trip to the DB in the hot path.
+
+- A background thread of each worker *flushes* the increments since the last
+  flush to the DB every ``general.metrics.flush_interval`` seconds (the
+  increments of all counters, histograms and errors are sent in one pipeline).
+
+- Before the metrics are read (``/stats``, ``/preferences``, ``/metrics``),
+  the local increments are flushed and the totals of the node are *loaded* from
+  the DB into the local storage.
+
+The keys in the DB are prefixed by :py:obj:`PREFIX` and the hostname of the
+node.  The keys expire when they have not been written for
+:py:obj:`EXPIRE_INTERVALS` flush intervals (no worker of the node is running).
+"""
+
+__all__ = ["SharedMetrics", "ValkeyMetrics"]
+
+import typing as t
+
+import abc
+import json
+import math
+import socket
+import threading
+
+from searx import logger
+from .error_recorder import ErrorContext
+
+if t.TYPE_CHECKING:
+    import valkey
+    from .models import CounterStorage, HistogramStorage
+
+log = logger.getChild("searx.metrics.shared")
+
+PREFIX = "SearXNG_metrics"
+"""Prefix of the keys in the Valkey DB."""
+
+EXPIRE_INTERVALS = 10
+"""Number of flush intervals after which the keys of a node expire in the
+Valkey DB (at least one minute)."""
+
+HistogramStateType: t.TypeAlias = tuple[list[int], int, float]
+"""State of a histogram: quartiles, count and sum."""
+
+StateType: t.TypeAlias = tuple[dict[tuple[str, ...], int], dict[tuple[str, ...], HistogramStateType], dict[str, int]]
+"""State of the local storages: the values of the counters, the state of the
+histograms and the values of the errors."""
+
+
+def _error_field(engine_name: str, ctx: ErrorContext) -> str:
+    return json.dumps(
+        [
+            engine_name,
+            ctx.filename,
+            ctx.function,
+            ctx.line_no,
+            ctx.code,
+            ctx.exception_classname,
+            ctx.log_message,
+            list(ctx.log_parameters),
+            ctx.secondary,
+        ]
+    )
+
+
+def _error_context(field: str) -> tuple[str, ErrorContext]:
+    engine_name, *args = json.loads(field)
+    args[6] = tuple(args[6])
+    return engine_name, ErrorContext(*args)
+
+
+class SharedMetrics(abc.ABC):
+    """Abstract base class of the backends that share the metrics of the
+    worker processes.
+
+    A backend stores the state of the local storages at the time of the last
+    flush (the *base*).  The difference between the current state and the
+    base is the increment of the worker which has to be added to the totals of
+    the node.  When the totals are loaded, the local values are set to the
+    totals plus the increments recorded since the flush.
+    """
+
+    def __init__(
+        self,
+        counter_storage: "CounterStorage",
+        histogram_storage: "HistogramStorage",
+        errors_per_engines: dict[str, dict[ErrorContext, int]],
+        flush_interval: float,
+    ):
+        self.counter_storage = counter_storage
+        self.histogram_storage = histogram_storage
+        self.errors_per_engines = errors_per_engines
+        self.flush_interval = flush_interval
+
+        self._lock = threading.Lock()
+        self._counter_base: dict[tuple[str, ...], int] = {}
+        self._histogram_base: dict[tuple[str, ...], HistogramStateType] = {}
+        self._error_base: dict[str, int] = {}
+        self._stop = threading.Event()
+
+    @abc.abstractmethod
+    def push(
+        self,
+        counters: dict[str, int],
+        histograms: dict[str, HistogramStateType],
+        errors: dict[str, int],
+        load: bool,
+    ) -> tuple[dict[str, int], dict[str, dict[str, str]], dict[str, int]] | None:
+        """Adds the increments to the totals of the node.  If ``load`` is
+        true, the totals of the counters, the histograms and the errors are
+        returned (histograms are mapped by name to a dict of quartile indices,
+        ``count`` and ``sum``)."""
+
+    def _collect(
+        self,
+    ) -> tuple[tuple[dict[str, int], dict[str, HistogramStateType], dict[str, int]], StateType]:
+        # returns the increments and the state of the local storages, the base
+        # is updated once the increments have been pushed.
+        # pylint: disable=protected-access
+        state: StateType = ({}, {}, {})
+        counters: dict[str, int] = {}
+        with self.counter_storage.lock:
+            for args, value in self.counter_storage.counters.items():
+                delta = value - self._counter_base.get(args, 0)
+                if delta:
+                    counters["|".join(args)] = delta
+                state[0][args] = value
+
+        histograms: dict[str, HistogramStateType] = {}
+        for args, h in self.histogram_storage.measures.items():
+            with h._lock:
+                current: HistogramStateType = (list(h._quartiles), h._count, h._sum)
+            base = self._histogram_base.get(args)
+            if base is None:
+                base = ([0] * len(current[0]), 0, 0.0)
+            if current[1] != base[1]:
+                histograms["|".join(args)] = (
+                    [q - b for q, b in zip(current[0], base[0])],
+                    current[1] - base[1],
+                    current[2] - base[2],
+                )
+            state[1][args] = current
+
+        errors: dict[str, int] = {}
+        for engine_name, error_stats in list(self.errors_per_engines.items()):
+            for ctx, value in list(error_stats.items()):
+                field = _error_field(engine_name, ctx)
+                delta = value - self._error_base.get(field, 0)
+                if delta:
+                    errors[field] = delta
+                state[2][field] = value
+
+        return (counters, histograms, errors), state
+
+    def _load(self, counters: dict[str, int], histograms: dict[str, dict[str, str]], errors: dict[str, int]):
+        # pylint: disable=protected-access
+        with self.counter_storage.lock:
+            for args, value in self.counter_storage.counters.items():
+                total = counters.get("|".join(args), 0)
+                self.counter_storage.counters[args] = total + value - self._counter_base.get(args, 0)
+                self._counter_base[args] = total
+
+        for args, h in self.histogram_storage.measures.items():
+            data = histograms.get("|".join(args))
+            if not data:
+                continue
+            quartiles = [0] * len(h._quartiles)
+            for field, value in data.items():
+                if field not in ("count", "sum"):
+                    quartiles[min(int(field), len(quartiles) - 1)] += int(value)
+            hist_total: HistogramStateType = (quartiles, int(data.get("count", 0)), float(data.get("sum", 0)))
+            base = self._histogram_base.get(args) or ([0] * len(quartiles), 0, 0.0)
+            with h._lock:
+                h._quartiles = [x + q - b for x, q, b in zip(hist_total[0], h._quartiles, base[0])]
+                h._count = hist_total[1] + h._count - base[1]
+                h._sum = hist_total[2] + h._sum - base[2]
+            self._histogram_base[args] = hist_total
+
+        for field, error_total in errors.items():
+            engine_name, ctx = _error_context(field)
+            error_stats = self.errors_per_engines.setdefault(engine_name, {})
+            error_stats[ctx] = error_total + error_stats.get(ctx, 0) - self._error_base.get(field, 0)
+            self._error_base[field] = error_total
+
+    def sync(self, load: bool = True):
+        """Flushes the local increments and (if ``load`` is true) loads the
+        totals of the node into the local storages."""
+        with self._lock:
+            increments, state = self._collect()
+            try:
+                totals = self.push(*increments, load=load)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # the increments are pushed with the next flush
+                log.error("can't sync metrics: %s", e)
+                return
+            self._counter_base.update(state[0])
+            self._histogram_base.update(state[1])
+            self._error_base.update(state[2])
+            if totals is not None:
+                self._load(*totals)
+
+    def start(self):
+        """Starts the thread that flushes the increments every
+        ``flush_interval`` seconds.  The thread is restarted in a forked
+        worker process."""
+        self._stop.clear()
+        threading.Thread(target=self._run, name="metrics_flush", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.sync(load=False)
+
+    def after_fork(self):
+        """Resets the local storages in a forked worker process and starts the
+        flush thread of the worker.  The values inherited from the parent
+        process are flushed by the parent."""
+        # pylint: disable=protected-access
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        with self.counter_storage.lock:
+            for args in self.counter_storage.counters:
+                self.counter_storage.counters[args] = 0
+        for h in self.histogram_storage.measures.values():
+            h._quartiles = [0] * len(h._quartiles)
+            h._count = 0
+            h._sum = 0
+        self.errors_per_engines.clear()
+        self._counter_base.clear()
+        self._histogram_base.clear()
+        self._error_base.clear()
+        self.start()
+
+
+class ValkeyMetrics(SharedMetrics):
+    """Sums up the metrics of the workers in the Valkey DB
+    (:py:obj:`searx.valkeydb.client`).
+
+    - ``<prefix>|counter``: hash, field is the name of the counter
+    - ``<prefix>|histogram|<name>``: hash, fields are the quartile indices,
+      ``count`` and ``sum``
+    - ``<prefix>|errors``: hash, field is the engine name and the error context
+      (JSON)
+
+    The expire time of the keys is set on each flush (see
+    :py:obj:`EXPIRE_INTERVALS`).
+    """
+
+    def __init__(self, client: "valkey.Valkey", *args: t.Any, **kwargs: t.Any):
+        super().__init__(*args, **kwargs)
+        self.client = client
+        self.prefix = f"{PREFIX}|{socket.gethostname()}"
+        self.expire = max(math.ceil(self.flush_interval * EXPIRE_INTERVALS), 60)
+
+    def push(
+        self,
+        counters: dict[str, int],
+        histograms: dict[str, HistogramStateType],
+        errors: dict[str, int],
+        load: bool,
+    ) -> tuple[dict[str, int], dict[str, dict[str, str]], dict[str, int]] | None:
+
+        pipe = self.client.pipeline(transaction=False)
+        for field, delta in counters.items():
+            pipe.hincrby(f"{self.prefix}|counter", field, delta)
+        for name, (quartiles, count, _sum) in histograms.items():
+            key = f"{self.prefix}|histogram|{name}"
+            for i, delta in enumerate(quartiles):
+                if delta:
+                    pipe.hincrby(key, str(i), delta)
+            pipe.hincrby(key, "count", count)
+            pipe.hincrbyfloat(key, "sum", _sum)
+        for field, delta in errors.items():
+            pipe.hincrby(f"{self.prefix}|errors", field, delta)
+
+        names = ["|".join(args) for args in self.histogram_storage.measures]
+        pipe.expire(f"{self.prefix}|counter", self.expire)
+        for name in names:
+            pipe.expire(f"{self.prefix}|histogram|{name}", self.expire)
+        pipe.expire(f"{self.prefix}|errors", self.expire)
+        if load:
+            pipe.hgetall(f"{self.prefix}|counter")
+            for name in names:
+                pipe.hgetall(f"{self.prefix}|histogram|{name}")
+            pipe.hgetall(f"{self.prefix}|errors")
+
+        ret = pipe.execute()
+        if not load:
+            return None
+
+        ret = ret[len(ret) - len(names) - 2 :]
+        return (
+            {k.decode(): int(v) for k, v in ret[0].items()},
+            {name: {k.decode(): v.decode() for k, v in data.items()} for name, data in zip(names, ret[1:-1])},
+            {k.decode(): int(v) for k, v in ret[-1].items()},
+        )
@@ -1,7 +1,14 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # pylint: disable=missing-module-docstring, global-statement
 
-__all__ = ["get_network", "initialize", "check_network_configuration", "raise_for_httperror"]
+__all__ = [
+    "get_network",
+    "get_network_stats",
+    "initialize",
+    "check_network_configuration",
+    "raise_for_httperror",
+    "warmup",
+]
 
 import typing as t
 
@@ -18,7 +25,13 @@ import httpx
 import anyio
 
 from searx.extended_types import SXNG_Response
-from .network import get_network, initialize, check_network_configuration  # pylint:disable=cyclic-import
+from .network import (  # pylint:disable=cyclic-import
+    get_network,
+    get_network_stats,
+    initialize,
+    check_network_configuration,
+    warmup,
+)
 from .client import get_loop
 from .raise_for_httperror import raise_for_httperror
 
@@ -2,7 +2,7 @@
 # pylint: disable=global-statement
 # pylint: disable=missing-module-docstring, missing-class-docstring
 
-__all__ = ["get_network"]
+__all__ = ["get_network", "get_network_stats", "warmup"]
 
 import typing as t
 from collections.abc import Generator
@@ -10,8 +10,11 @@ from collections.abc import Generator
 
 import atexit
 import asyncio
+import concurrent.futures
 import ipaddress
+import math
 from itertools import cycle
+from urllib.parse import urlparse
 
 import httpx
 
@@ -40,6 +43,15 @@ PROXY_PATTERN_MAPPING = {
 
 ADDRESS_MAPPING = {'ipv4': '0.0.0.0', 'ipv6': '::'}
 
+WARMUP_TIMEOUT = 5.0
+"""Timeout of the requests sent by :py:obj:`warmup`."""
+
+WARMUP_MAX_CLIENTS = 8
+"""Max. number of HTTP clients of a network that are warmed up (see
+:py:obj:`NetworkWarmup.client_count`)."""
+
+KEEPALIVE: concurrent.futures.Future[None] | None = None
+
 
 @t.final
 class Network:
@@ -57,10 +69,13 @@ class Network:
         'max_redirects',
         'retries',
         'retry_on_http_error',
+        'warmup_urls',
         '_local_addresses_cycle',
         '_proxies_cycle',
         '_clients',
         '_logger',
+        '_tcp_connects',
+        '_tls_handshakes',
     )
 
     _TOR_CHECK_RESULT = {}
@@ -99,6 +114,9 @@ class Network:
         self._proxies_cycle = self.get_proxy_cycles()
         self._clients = {}
         self._logger = logger.getChild(logger_name) if logger_name else logger
+        self._tcp_connects = 0
+        self._tls_handshakes = 0
+        self.warmup_urls: list[str] = []
         self.check_parameters()
 
     def check_parameters(self):
@@ -155,6 +173,17 @@ class Network:
             # pylint: disable=stop-iteration-return
             yield tuple((pattern, next(proxy_url_cycle)) for pattern, proxy_url_cycle in proxy_settings.items())
 
+    async def trace(self, event_name: str, info: dict[str, t.Any]):  # pylint: disable=unused-argument
+        """Callback of the httpcore_ ``trace`` extension, counts the TCP
+        connections and TLS handshakes of the network.
+
+        .. _httpcore: https://www.encode.io/httpcore/extensions/#trace
+        """
+        if event_name == "connection.connect_tcp.complete":
+            self._tcp_connects += 1
+        elif event_name == "connection.start_tls.complete":
+            self._tls_handshakes += 1
+
     async def log_response(self, response: httpx.Response):
         request = response.request
         status = f"{response.status_code} {response.reason_phrase}"
@@ -274,6 +303,7 @@ class Network:
         was_disconnected = False
         do_raise_for_httperror = Network.extract_do_raise_for_httperror(kwargs)
         kwargs_clients = Network.extract_kwargs_clients(kwargs)
+        kwargs["extensions"] = {"trace": self.trace, **kwargs.get("extensions", {})}
         while retries >= 0:  # pragma: no cover
             client = await self.get_client(**kwargs_clients)
             cookies = kwargs.pop("cookies", None)
@@ -315,6 +345,139 @@ def get_network(name: str | None = None) -> "Network":
     return NETWORKS.get(name or DEFAULT_NAME)  # pyright: ignore[reportReturnType]
 
 
+def network_stats(network: Network) -> dict[str, int]:
+    """Occupancy of the connection pools of the ``network`` and number of the
+    TCP connections and TLS handshakes (see :py:obj:`Network.trace`)."""
+    # pylint: disable=protected-access
+    connections = idle = 0
+    for client in list(network._clients.values()):
+        for transport in [client._transport, *client._mounts.values()]:
+            for conn in getattr(getattr(transport, "_pool", None), "connections", []):
+                connections += 1
+                idle += conn.is_idle()
+    return {
+        "connections": connections,
+        "idle": idle,
+        "tcp_connects": network._tcp_connects,
+        "tls_handshakes": network._tls_handshakes,
+    }
+
+
+def get_network_stats() -> dict[str, dict[str, int]]:
+    """Returns the :py:obj:`network_stats` of the networks (a network that is
+    referenced by several engines is listed once)."""
+    networks: dict[int, tuple[str, Network]] = {}
+    for name, network in NETWORKS.items():
+        networks.setdefault(id(network), (name, network))
+    return {name: network_stats(network) for name, network in networks.values()}
+
+
+class NetworkWarmup:
+    """Opens the connections of the HTTP clients of a :py:obj:`Network` to the
+    :py:obj:`warmup_urls <Network.warmup_urls>` of the network and keeps them
+    alive (see :py:obj:`warmup`)."""
+
+    def __init__(self, network: Network):
+        self.network = network
+
+    def client_count(self) -> int:
+        """Number of HTTP clients the network cycles through (combinations of
+        the local addresses and the proxies), limited to
+        :py:obj:`WARMUP_MAX_CLIENTS`."""
+        addresses = 0
+        for address in self.network.iter_ipaddresses():
+            addresses += ipaddress.ip_network(address, False).num_addresses if '/' in address else 1
+        count = max(addresses, 1)
+        for _, proxy_urls in self.network.iter_proxies():
+            count = math.lcm(count, len(proxy_urls))
+        return min(count, WARMUP_MAX_CLIENTS)
+
+    async def ping(self, client: httpx.AsyncClient) -> int:
+        """Sends a ``HEAD`` request to each of the warmup URLs (concurrently)
+        to open a connection or to keep it alive.  Returns the number of
+        successful requests."""
+
+        log = self.network._logger  # pylint: disable=protected-access
+
+        async def head(url: str) -> int:
+            try:
+                await client.head(url, timeout=WARMUP_TIMEOUT, extensions={"trace": self.network.trace})
+            except httpx.HTTPError as e:
+                log.debug("warmup of %s failed: %s", url, e)
+                return 0
+            return 1
+
+        return sum(await asyncio.gather(*[head(url) for url in self.network.warmup_urls]))
+
+    async def warmup(self) -> int:
+        """Creates the HTTP clients of the network and opens the connections to
+        the warmup URLs."""
+        count = 0
+        for _ in range(self.client_count()):
+            count += await self.ping(await self.network.get_client())
+        return count
+
+    async def keepalive(self) -> int:
+        """Pings the warmup URLs with the existing HTTP clients so their
+        connections do not expire."""
+        count = 0
+        for client in list(self.network._clients.values()):  # pylint: disable=protected-access
+            if not client.is_closed:
+                count += await self.ping(client)
+        return count
+
+
+def engine_base_url(engine: t.Any) -> str | None:
+    """Returns the URL of the host (``scheme://netloc/``) an engine sends its
+    requests to, or ``None`` if the host is unknown (e.g. depends on the
+    language)."""
+    for attr in ('base_url', 'search_url'):
+        url = getattr(engine, attr, None)
+        if isinstance(url, list):
+            url = url[0] if url else None
+        if not isinstance(url, str):
+            continue
+        parsed = urlparse(url)
+        if parsed.scheme in ('http', 'https') and parsed.netloc and '{' not in parsed.netloc:
+            return f"{parsed.scheme}://{parsed.netloc}/"
+    return None
+
+
+def warmup(keepalive_interval: float = 0):
+    """Opens the connections of the networks to the hosts of the enabled
+    engines (:py:obj:`NetworkWarmup.warmup`), the first search requests do not
+    have to wait for TCP & TLS handshakes.  If ``keepalive_interval`` is set,
+    the connections are pinged (:py:obj:`NetworkWarmup.keepalive`) every
+    ``keepalive_interval`` seconds.
+
+    The warmup runs in the background (in the loop of the networks), the
+    function returns immediately."""
+
+    global KEEPALIVE
+
+    networks = {id(network): NetworkWarmup(network) for network in NETWORKS.values() if network.warmup_urls}
+
+    async def run():
+        count = sum(await asyncio.gather(*[network.warmup() for network in networks.values()]))
+        logger.debug("warmup: %s connections to %s networks", count, len(networks))
+        while keepalive_interval > 0:
+            await asyncio.sleep(keepalive_interval)
+            await asyncio.gather(*[network.keepalive() for network in networks.values()])
+
+    if KEEPALIVE is not None:
+        KEEPALIVE.cancel()
+    KEEPALIVE = asyncio.run_coroutine_threadsafe(run(), get_loop())
+
+
+def _collect_warmup_urls(engine_networks: t.Iterable[tuple[str, t.Any, t.Any]]):
+    """Adds the hosts of the enabled engines to the :py:obj:`warmup_urls
+    <Network.warmup_urls>` of their networks (see :py:obj:`warmup`)."""
+    for engine_name, engine, _ in engine_networks:
+        url = engine_base_url(engine)
+        if url and not getattr(engine, 'disabled', False) and url not in NETWORKS[engine_name].warmup_urls:
+            NETWORKS[engine_name].warmup_urls.append(url)
+
+
 def check_network_configuration():
     async def check():
         exception_count = 0
@@ -411,6 +574,8 @@ def initialize(
         if isinstance(network, str):
             NETWORKS[engine_name] = NETWORKS[network]
 
+    _collect_warmup_urls(iter_networks())
+
     # the /image_proxy endpoint has a dedicated network.
     # same parameters than the default network, but HTTP/2 is disabled.
     # It decreases the CPU load average, and the total time is more or less the same
@@ -430,6 +595,11 @@ def done():
     Note: since Network.aclose has to be async, it is not possible to call this method on Network.__del__
     So Network.aclose is called here using atexit.register
     """
+    global KEEPALIVE
+
+    if KEEPALIVE is not None:
+        KEEPALIVE.cancel()
+        KEEPALIVE = None
     try:
         loop = get_loop()
         if loop:
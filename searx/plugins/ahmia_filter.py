@@ -7,6 +7,7 @@ from hashlib import md5
 from flask_babel import gettext  # pyright: ignore[reportUnknownVariableType]
 
 from searx.data import ahmia_blacklist_loader
+from searx.data.ahmia_blacklist import AhmiaBlacklist
 from searx import get_setting
 from searx.plugins import Plugin, PluginInfo
 
@@ -17,7 +18,7 @@ if t.TYPE_CHECKING:
     from searx.result_types import Result
     from searx.plugins import PluginCfg
 
-ahmia_blacklist: list[str] = []
+ahmia_blacklist: AhmiaBlacklist = AhmiaBlacklist()
 
 
 @t.final
@@ -40,7 +41,7 @@ class SXNGPlugin(Plugin):
     ) -> bool:  # pylint: disable=unused-argument
         if not getattr(result, "is_onion", False) or not getattr(result, "parsed_url", False):
             return True
-        result_hash = md5(result["parsed_url"].hostname.encode()).hexdigest()
+        result_hash = md5(result["parsed_url"].hostname.encode()).digest()
         return result_hash not in ahmia_blacklist
 
     def init(self, app: "flask.Flask") -> bool:  # pylint: disable=unused-argument
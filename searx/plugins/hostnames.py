@@ -78,11 +78,24 @@ something like this:
    '(.*\\.)?youtube\\.com$': 'invidious.example.com'
    '(.*\\.)?youtu\\.be$': 'invidious.example.com'
 
+Patterns that only match a hostname literally are not evaluated as regular
+expressions (see :py:obj:`HostnameMatcher`), large lists of hostnames should
+use one of these forms:
+
+- ``'^example\\.com$'``: the hostname ``example.com``
+- ``'^(.*\\.)?example\\.com$'``: ``example.com`` and its subdomains
+- ``'(.*\\.)?example\\.com$'`` or ``'example\\.com$'``: all hostnames ending
+  with ``example.com``
+
+Note that an unescaped ``.`` matches any character, ``'(.*\\.)?facebook.com$'``
+is a *real* regular expression.
+
 """
 
 import typing as t
 
 import re
+import threading
 from urllib.parse import urlunparse, urlparse
 
 from flask_babel import gettext  # pyright: ignore[reportUnknownVariableType]
@@ -101,10 +114,144 @@ if t.TYPE_CHECKING:
     from searx.result_types import Result
     from searx.plugins import PluginCfg
 
-REPLACE: dict[re.Pattern, str] = {}
-REMOVE: set = set()
-HIGH: set = set()
-LOW: set = set()
+PriorityType: t.TypeAlias = t.Literal["", "high", "low"]
+
+
+class Verdict(t.NamedTuple):
+    """Verdict of the hostnames plugin for a hostname (*netloc*)."""
+
+    remove: bool
+    replace: re.Pattern[str] | None
+    """The pattern of :py:obj:`REPLACE` that matches the hostname."""
+    priority: PriorityType
+
+
+_LITERAL_PATTERN = re.compile(
+    r"(?P<start>\^)?(?P<subdomains>\((?:\?:)?\.\*\\\.\)\?)?(?P<name>(?:[a-zA-Z0-9_-]|\\[.-])+)\$"
+)
+_BACKREF = re.compile(r"\\[1-9]|\(\?P=")
+
+
+class HostnameMatcher:
+    """Matches a hostname against a list of regular expressions.
+
+    The patterns that only match a hostname literally are stored in hash maps
+    (exact hostnames, domains with subdomains and suffixes of the hostname),
+    the other patterns are combined into a single alternation.  The result is
+    the same as calling ``pattern.search(hostname)`` for each pattern of the
+    list."""
+
+    def __init__(self, patterns: t.Iterable[re.Pattern[str]]):
+        self.patterns: list[re.Pattern[str]] = list(patterns)
+        self._exact: dict[str, int] = {}
+        self._domains: dict[str, int] = {}
+        self._suffixes: dict[str, int] = {}
+        self._regexes: list[int] = []
+        self._combined: re.Pattern[str] | None = None
+
+        for index, pattern in enumerate(self.patterns):
+            m = _LITERAL_PATTERN.fullmatch(pattern.pattern)
+            if m is None or pattern.flags & re.IGNORECASE:
+                self._regexes.append(index)
+                continue
+            name = m["name"].replace("\\", "")
+            if m["start"] and m["subdomains"]:
+                self._domains.setdefault(name, index)
+            elif m["start"]:
+                self._exact.setdefault(name, index)
+            else:
+                # without the ^ anchor, the (optional) subdomains do not
+                # restrict the match: the hostname ends with the name
+                self._suffixes.setdefault(name, index)
+
+        regexes = [self.patterns[i] for i in self._regexes]
+        if regexes and not any(_BACKREF.search(p.pattern) for p in regexes):
+            try:
+                self._combined = re.compile("|".join(f"(?:{p.pattern})" for p in regexes))
+            except re.error:
+                # for example global flags that are not at the start
+                self._combined = None
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def match(self, hostname: str) -> re.Pattern[str] | None:
+        """Returns the first pattern (in the order of the list) that matches
+        the ``hostname``, or ``None``."""
+        best: int = len(self.patterns)
+
+        index = self._exact.get(hostname)
+        if index is not None:
+            best = index
+
+        if self._domains:
+            name = hostname
+            while True:
+                index = self._domains.get(name)
+                if index is not None and index < best:
+                    best = index
+                pos = name.find(".")
+                if pos < 0:
+                    break
+                name = name[pos + 1 :]
+
+        if self._suffixes:
+            for pos in range(len(hostname)):
+                index = self._suffixes.get(hostname[pos:])
+                if index is not None and index < best:
+                    best = index
+
+        if self._regexes and self._regexes[0] < best:
+            if self._combined is None or self._combined.search(hostname):
+                for index in self._regexes:
+                    if index >= best:
+                        break
+                    if self.patterns[index].search(hostname):
+                        best = index
+                        break
+
+        if best < len(self.patterns):
+            return self.patterns[best]
+        return None
+
+
+REPLACE: dict[re.Pattern[str], str] = {}
+REMOVE: HostnameMatcher = HostnameMatcher([])
+REPLACE_MATCHER: HostnameMatcher = HostnameMatcher([])
+HIGH: HostnameMatcher = HostnameMatcher([])
+LOW: HostnameMatcher = HostnameMatcher([])
+
+VERDICT_CACHE_SIZE = 4096
+"""Max. number of hostnames in the cache of the verdicts.  The verdicts only
+depend on the configuration, the cache is shared by all the requests and is
+emptied when it is full."""
+
+_VERDICTS: dict[str, Verdict] = {}
+_VERDICTS_LOCK = threading.Lock()
+
+
+def get_verdict(netloc: str) -> Verdict:
+    """Returns the (cached) :py:obj:`Verdict` for the ``netloc``."""
+    verdict = _VERDICTS.get(netloc)
+    if verdict is not None:
+        return verdict
+
+    priority: PriorityType = ""
+    if HIGH.match(netloc):
+        priority = "high"
+    elif LOW.match(netloc):
+        priority = "low"
+    verdict = Verdict(
+        remove=REMOVE.match(netloc) is not None,
+        replace=REPLACE_MATCHER.match(netloc),
+        priority=priority,
+    )
+
+    with _VERDICTS_LOCK:
+        if len(_VERDICTS) >= VERDICT_CACHE_SIZE:
+            _VERDICTS.clear()
+        _VERDICTS[netloc] = verdict
+    return verdict
 
 
 class SXNGPlugin(Plugin):
@@ -123,38 +270,34 @@ class SXNGPlugin(Plugin):
 
     def on_result(self, request: "SXNG_Request", search: "SearchWithPlugins", result: "Result") -> bool:
 
-        for pattern in REMOVE:
-            if result.parsed_url and pattern.search(result.parsed_url.netloc):
-                # if the link (parsed_url) of the result match, then remove the
-                # result from the result list, in any other case, the result
-                # remains in the list / see final "return True" below.
-                # log.debug("FIXME: remove [url/parsed_url] %s %s", pattern.pattern, result.url)
-                return False
+        if result.parsed_url and get_verdict(result.parsed_url.netloc).remove:
+            # if the link (parsed_url) of the result match, then remove the
+            # result from the result list, in any other case, the result
+            # remains in the list / see final "return True" below.
+            return False
 
         result.filter_urls(filter_url_field)
 
-        if isinstance(result, (MainResult, LegacyResult)):
-            for pattern in LOW:
-                if result.parsed_url and pattern.search(result.parsed_url.netloc):
-                    result.priority = "low"
-
-            for pattern in HIGH:
-                if result.parsed_url and pattern.search(result.parsed_url.netloc):
-                    result.priority = "high"
+        if isinstance(result, (MainResult, LegacyResult)) and result.parsed_url:
+            priority = get_verdict(result.parsed_url.netloc).priority
+            if priority:
+                result.priority = priority
 
         return True
 
     def init(self, app: "flask.Flask") -> bool:  # pylint: disable=unused-argument
-        global REPLACE, REMOVE, HIGH, LOW  # pylint: disable=global-statement
+        global REPLACE, REMOVE, REPLACE_MATCHER, HIGH, LOW  # pylint: disable=global-statement
 
         if not settings.get(self.id):
             # Remove plugin, if there isn't a "hostnames:" setting
             return False
 
         REPLACE = self._load_regular_expressions("replace") or {}  # type: ignore
-        REMOVE = self._load_regular_expressions("remove") or set()  # type: ignore
-        HIGH = self._load_regular_expressions("high_priority") or set()  # type: ignore
-        LOW = self._load_regular_expressions("low_priority") or set()  # type: ignore
+        REPLACE_MATCHER = HostnameMatcher(REPLACE)
+        REMOVE = HostnameMatcher(self._load_regular_expressions("remove") or [])
+        HIGH = HostnameMatcher(self._load_regular_expressions("high_priority") or [])
+        LOW = HostnameMatcher(self._load_regular_expressions("low_priority") or [])
+        _VERDICTS.clear()
 
         return True
 
@@ -186,15 +329,15 @@ def filter_url_field(result: "Result|LegacyResult", field_name: str, url_src: st
         return True
 
     url_src_parsed = urlparse(url=url_src)
+    verdict = get_verdict(url_src_parsed.netloc)
 
-    for pattern in REMOVE:
-        if pattern.search(url_src_parsed.netloc):
-            return False
+    if verdict.remove:
+        return False
 
-    for pattern, replacement in REPLACE.items():
-        if pattern.search(url_src_parsed.netloc):
-            new_url = url_src_parsed._replace(netloc=pattern.sub(replacement, url_src_parsed.netloc))
-            new_url = urlunparse(new_url)
-            return new_url
+    if verdict.replace is not None:
+        pattern = verdict.replace
+        new_url = url_src_parsed._replace(netloc=pattern.sub(REPLACE[pattern], url_src_parsed.netloc))
+        new_url = urlunparse(new_url)
+        return new_url
 
     return True
@@ -78,6 +78,16 @@ class ResultContainer:
         self.on_result: t.Callable[[Result | LegacyResult], bool] = lambda _: True
         self._lock: RLock = RLock()
         self._main_results_sorted: list[MainResult | LegacyResult] = None  # type: ignore
+        self.engine_results: dict[str, list[Result | LegacyResult]] | None = None
+        """If not ``None``, the results of each engine are recorded in this
+        dict (see :py:obj:`searx.search.result_cache`)."""
+        self.on_extend: t.Callable[[str | None, dict[str, list[t.Any]]], None] | None = None
+        """If set, this function is called each time results of an engine have
+        been added to the container.  The arguments are the name of the engine
+        and the results that have been accepted (mapped by ``results``,
+        ``answers``, ``infoboxes``, ``suggestions`` and ``corrections``).  The
+        function is called with the lock of the container held, it should not
+        block."""
 
     def extend(
         self, engine_name: str | None, results: list[Result | LegacyResult]
@@ -85,7 +95,10 @@ class ResultContainer:
         if self._closed:
             log.debug("container is closed, ignoring results: %s", results)
             return
+        if self.engine_results is not None and engine_name:
+            self.engine_results[engine_name] = list(results)  # pylint: disable=unsupported-assignment-operation
         main_count = 0
+        added: dict[str, list[t.Any]] = defaultdict(list)
 
         for result in list(results):
 
@@ -97,9 +110,11 @@ class ResultContainer:
 
                 if isinstance(result, BaseAnswer):
                     self.answers.add(result)
+                    added["answers"].append(result)
                 elif isinstance(result, MainResult):
                     main_count += 1
                     self._merge_main_result(result, main_count)
+                    added["results"].append(result)
                 else:
                     # more types need to be implemented in the future ..
                     raise NotImplementedError(f"no handler implemented to process the result of type {result}")
@@ -112,6 +127,7 @@ class ResultContainer:
                 if "suggestion" in result:
                     if self.on_result(result):
                         self.suggestions.add(result["suggestion"])
+                        added["suggestions"].append(result["suggestion"])
                     continue
 
                 if "answer" in result:
@@ -122,16 +138,19 @@ class ResultContainer:
                             DeprecationWarning,
                         )
                         self.answers.add(result)  # type: ignore
+                        added["answers"].append(result)
                     continue
 
                 if "correction" in result:
                     if self.on_result(result):
                         self.corrections.add(result["correction"])
+                        added["corrections"].append(result["correction"])
                     continue
 
                 if "infobox" in result:
                     if self.on_result(result):
                         self._merge_infobox(result)
+                        added["infoboxes"].append(result)
                     continue
 
                 if "engine_data" in result:
@@ -143,6 +162,7 @@ class ResultContainer:
                 if self.on_result(result):
                     main_count += 1
                     self._merge_main_result(result, main_count)
+                    added["results"].append(result)
                     continue
 
         if engine_name in searx.engines.engines:
@@ -151,6 +171,12 @@ class ResultContainer:
             if not self.paging and eng.paging:
                 self.paging = True
 
+        if self.on_extend is not None and added:
+            # other engine threads merge their results into the results that
+            # have been added, they have to wait until on_extend has finished
+            with self._lock:
+                self.on_extend(engine_name, added)  # pylint: disable=not-callable
+
     def _merge_infobox(self, new_infobox: LegacyResult):
         add_infobox = True
 
@@ -5,11 +5,7 @@ __all__ = ["SearchWithPlugins"]
 
 import typing as t
 
-import threading
 from timeit import default_timer
-from uuid import uuid4
-
-from flask import copy_current_request_context
 
 from searx import logger
 from searx import settings
@@ -17,11 +13,13 @@ import searx.answerers
 import searx.plugins
 from searx.engines import load_engines
 from searx.external_bang import get_bang_url
-from searx.metrics import initialize as initialize_metrics, counter_inc
+from searx.metrics import initialize as initialize_metrics, counter_inc, get_engine_timeout
 from searx.network import initialize as initialize_network, check_network_configuration
 from searx.results import ResultContainer
 from searx.search.processors import PROCESSORS
 from searx.search.processors.abstract import RequestParams
+from searx.search.dispatcher import dispatch
+from searx.search.result_cache import RESULT_CACHE
 
 if t.TYPE_CHECKING:
     from .models import SearchQuery
@@ -55,6 +53,9 @@ class Search:
         self.result_container: ResultContainer = ResultContainer()
         self.start_time: float | None = None
         self.actual_timeout: float | None = None
+        self.engine_timeouts: dict[str, float] = {}
+        """Effective timeouts of the engines (:ref:`search.adaptive_timeout
+        <settings search>`)."""
 
     def search_external_bang(self) -> bool:
         """Check if there is a external bang.  If yes, update
@@ -82,6 +83,11 @@ class Search:
         # max of all selected engine timeout
         default_timeout = 0
 
+        adaptive_timeout: bool = settings['search']['adaptive_timeout']['enabled']
+
+        # results of the engines from the result cache
+        cached_results = RESULT_CACHE.get(self.search_query) if RESULT_CACHE.enabled else None
+
         # start search-request for all selected engines
         for engineref in self.search_query.engineref_list:
             processor = PROCESSORS.get(engineref.name)
@@ -99,13 +105,25 @@ class Search:
             if request_params is None:
                 continue
 
+            if cached_results is not None:
+                results = cached_results.pop(engineref.name, None)
+                if results is not None:
+                    counter_inc('engine', engineref.name, 'result_cache', 'hit')
+                    self.result_container.extend(engineref.name, results)
+                    continue
+                counter_inc('engine', engineref.name, 'result_cache', 'miss')
+
             counter_inc('engine', engineref.name, 'search', 'count', 'sent')
 
             # append request to list
             requests.append((engineref.name, self.search_query.query, request_params))
 
             # update default_timeout
-            default_timeout = max(default_timeout, processor.engine.timeout)
+            if adaptive_timeout:
+                self.engine_timeouts[engineref.name] = get_engine_timeout(engineref.name)
+                default_timeout = max(default_timeout, self.engine_timeouts[engineref.name])
+            else:
+                default_timeout = max(default_timeout, processor.engine.timeout)
 
         # adjust timeout
         max_request_timeout = settings['outgoing']['max_request_timeout']
@@ -134,28 +152,9 @@ class Search:
         return requests, actual_timeout
 
     def search_multiple_requests(self, requests: list[tuple[str, str, RequestParams]]):
-        # pylint: disable=protected-access
-        search_id = str(uuid4())
-
-        for engine_name, query, request_params in requests:
-            _search = copy_current_request_context(PROCESSORS[engine_name].search)
-            th = threading.Thread(  # pylint: disable=invalid-name
-                target=_search,
-                args=(query, request_params, self.result_container, self.start_time, self.actual_timeout),
-                name=search_id,
-            )
-            th._timeout = False
-            th._engine_name = engine_name
-            th.start()
-
-        for th in threading.enumerate():  # pylint: disable=invalid-name
-            if th.name == search_id:
-                remaining_time = max(0.0, self.actual_timeout - (default_timer() - self.start_time))
-                th.join(remaining_time)
-                if th.is_alive():
-                    th._timeout = True
-                    self.result_container.add_unresponsive_engine(th._engine_name, 'timeout')
-                    PROCESSORS[th._engine_name].logger.error('engine timeout')
+        if self.start_time is None or self.actual_timeout is None:
+            raise RuntimeError("search_multiple_requests() is called before the search has been started")
+        dispatch(requests, self.result_container, self.start_time, self.actual_timeout, self.engine_timeouts)
 
     def search_standard(self):
         """
@@ -165,7 +164,12 @@ class Search:
 
         # send all search-request
         if requests:
+            if RESULT_CACHE.enabled:
+                self.result_container.engine_results = {}
             self.search_multiple_requests(requests)
+            if self.result_container.engine_results:
+                # a copy, engines that timed out may still be running
+                RESULT_CACHE.set(self.search_query, dict(self.result_container.engine_results))
 
         # return results, suggestions, answers and infoboxes
         return True
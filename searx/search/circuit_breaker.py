@@ -0,0 +1,292 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Circuit breaker of the engines.
+
+A failing engine is not requested for a while, the :py:obj:`CircuitBreaker` of
+the engine is *open* and the engine is shown as suspended.  The breaker is
+configured in :ref:`search.circuit_breaker <settings search>`:
+
+``closed``
+  The engine is requested.  The outcome of the requests is recorded in a
+  sliding window of ``window`` seconds.  When at least ``min_calls`` requests
+  have been recorded and the ratio of the failed requests (HTTP errors,
+  exceptions of the engine, ..) reaches ``failure_rate`` or the ratio of the
+  requests slower than ``slow_call_duration`` reaches ``slow_call_rate``, the
+  breaker opens.  A timeout of the search is not a failure of the engine.
+
+  An exception with a suspend time (:py:obj:`SearxEngineAccessDeniedException
+  <searx.exceptions.SearxEngineAccessDeniedException>`, CAPTCHA, too many
+  requests) opens the breaker immediately for the time of the exception.
+
+``open``
+  The engine is not requested.  The breaker is open for ``ban_time_on_fail``
+  seconds, the time doubles each time the breaker opens again, but not more
+  than ``max_ban_time_on_fail``.  The outcome of requests that have been sent
+  before the breaker opened does not change the state (an exception with a
+  longer suspend time extends the open time).
+
+``half_open``
+  Once the open time has expired, a *probe* request is sent to the engine
+  (one request per ``probe_interval``, the other requests are still
+  suspended).  When the probe succeeds, the breaker is closed, when the probe
+  fails, the breaker is opened again (with the doubled ban time).
+
+The open state is shared by the worker processes (when a :ref:`Valkey DB
+<settings valkey>` is available): a worker that opens the breaker stores the
+state in the DB, the other workers read the states from the DB every
+``sync_interval`` seconds.  In half-open state, only one probe is sent by the
+workers of the node.
+"""
+
+__all__ = ["CircuitBreaker", "get_circuit_breaker"]
+
+import typing as t
+
+import json
+import threading
+import time
+from collections import deque
+
+from searx import get_setting, logger, valkeydb
+
+log = logger.getChild("search.circuit_breaker")
+
+StateType: t.TypeAlias = t.Literal["closed", "open", "half_open"]
+
+SHARED_KEY = "SearXNG_circuit_breaker"
+"""Key of the Valkey hash with the open circuit breakers (field is the name
+of the breaker, value is a JSON object)."""
+
+PROBE_KEY = "SearXNG_circuit_breaker_probe"
+
+BUCKET_SIZE = 5
+"""Width (sec.) of the buckets in the sliding window of a breaker."""
+
+CIRCUIT_BREAKERS: dict[str, "CircuitBreaker"] = {}
+
+
+class SharedState:
+    """Cache of the open circuit breakers stored in the Valkey DB."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.states: dict[str, dict[str, t.Any]] = {}
+        self.next_sync: float = 0
+
+    @staticmethod
+    def client():
+        if not get_setting("search.circuit_breaker.shared"):
+            return None
+        return valkeydb.client()
+
+    def get(self, name: str) -> dict[str, t.Any] | None:
+        client = self.client()
+        if client is None:
+            return None
+        now = time.time()
+        with self.lock:
+            if now >= self.next_sync:
+                self.next_sync = now + get_setting("search.circuit_breaker.sync_interval")
+                try:
+                    self.states = {k.decode(): json.loads(v) for k, v in client.hgetall(SHARED_KEY).items()}
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    log.error("can't read the circuit breakers: %s", e)
+            return self.states.get(name)
+
+    def set(self, name: str, state: dict[str, t.Any] | None):
+        client = self.client()
+        if client is None:
+            return
+        try:
+            if state is None:
+                client.hdel(SHARED_KEY, name)
+            else:
+                client.hset(SHARED_KEY, name, json.dumps(state))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            log.error("can't store the circuit breaker %s: %s", name, e)
+            return
+        with self.lock:
+            if state is None:
+                self.states.pop(name, None)
+            else:
+                self.states[name] = state
+
+    def acquire_probe(self, name: str, ttl: int) -> bool:
+        client = self.client()
+        if client is None:
+            return True
+        try:
+            return bool(client.set(f"{PROBE_KEY}|{name}", 1, nx=True, ex=max(ttl, 1)))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            log.error("can't acquire the probe of circuit breaker %s: %s", name, e)
+            return True
+
+
+SHARED_STATE = SharedState()
+
+
+class CircuitBreaker:
+    """Circuit breaker of an engine (or of the engines that share a
+    :ref:`network <engine network>`)."""
+
+    def __init__(self, name: str):
+        self.name: str = name
+        self.lock = threading.Lock()
+        self.state: StateType = "closed"
+        self.open_until: float = 0
+        self.reason: str = ""
+        self.trips: int = 0
+        # buckets of the sliding window: [start time, calls, failures, slow calls]
+        self._window: deque[list[float]] = deque()
+        self._next_probe: float = 0
+        self._opened_at: float = 0
+        # time the (last) probe request has been granted in half-open state
+        self._probe_time: float = 0
+
+    @property
+    def suspend_reason(self) -> str:
+        return self.reason
+
+    def _sync(self, now: float):
+        if SHARED_STATE.client() is None:
+            return
+        shared = SHARED_STATE.get(self.name)
+        if shared is None:
+            if self.state == "half_open":
+                # closed by the probe of another worker
+                self.state = "closed"
+                self.reason = ""
+                self.trips = 0
+        elif shared["open_until"] > max(self.open_until, now):
+            # opened by another worker
+            self.state = "open"
+            self._opened_at = now
+            self.open_until = shared["open_until"]
+            self.reason = shared["reason"]
+            self.trips = shared["trips"]
+            self._window.clear()
+
+    def allow_request(self) -> bool:
+        """Returns ``True`` if the engine can be requested.  In half-open
+        state, the request is the probe request of the breaker."""
+        now = time.time()
+        with self.lock:
+            self._sync(now)
+            if self.state == "open":
+                if now < self.open_until:
+                    return False
+                self.state = "half_open"
+            if self.state == "half_open":
+                if now < self._next_probe:
+                    return False
+                probe_interval = get_setting("search.circuit_breaker.probe_interval")
+                self._next_probe = now + probe_interval
+                if not SHARED_STATE.acquire_probe(self.name, probe_interval):
+                    return False
+                self._probe_time = now
+                log.debug("%s: half-open, send probe request", self.name)
+            return True
+
+    def _record(self, now: float, failure: bool, slow: bool) -> tuple[int, int, int]:
+        window: float = get_setting("search.circuit_breaker.window")
+        while self._window and self._window[0][0] <= now - window:
+            self._window.popleft()
+        if not self._window or self._window[-1][0] <= now - BUCKET_SIZE:
+            self._window.append([now, 0, 0, 0])
+        bucket = self._window[-1]
+        bucket[1] += 1
+        bucket[2] += int(failure)
+        bucket[3] += int(slow)
+        calls = failures = slow_calls = 0
+        for b in self._window:
+            calls += int(b[1])
+            failures += int(b[2])
+            slow_calls += int(b[3])
+        return calls, failures, slow_calls
+
+    def _open(self, now: float, reason: str, open_time: float | None = None):
+        if open_time is None:
+            ban_time: float = get_setting("search.ban_time_on_fail")
+            max_ban_time: float = get_setting("search.max_ban_time_on_fail")
+            open_time = min(ban_time * 2**self.trips, max_ban_time)
+        self.trips += 1
+        self.state = "open"
+        self.open_until = now + open_time
+        self.reason = reason
+        self._opened_at = now
+        self._next_probe = 0
+        self._probe_time = 0
+        self._window.clear()
+        log.debug("%s: open for %s seconds (%s)", self.name, open_time, reason)
+        SHARED_STATE.set(self.name, {"open_until": self.open_until, "reason": reason, "trips": self.trips})
+
+    def _extend(self, now: float, reason: str, open_time: float):
+        # extends the open time, the ban time is not escalated
+        self.state = "open"
+        self.open_until = now + open_time
+        self.reason = reason
+        self._next_probe = 0
+        self._probe_time = 0
+        log.debug("%s: open for %s seconds (%s)", self.name, open_time, reason)
+        SHARED_STATE.set(self.name, {"open_until": self.open_until, "reason": reason, "trips": self.trips})
+
+    def _close(self):
+        self.state = "closed"
+        self.open_until = 0
+        self.reason = ""
+        self.trips = 0
+        self._probe_time = 0
+        self._window.clear()
+        log.debug("%s: closed", self.name)
+        SHARED_STATE.set(self.name, None)
+
+    def record_success(self, duration: float):
+        """Records a successful request of the engine, ``duration`` is the
+        response time (sec.)."""
+        cfg = get_setting("search.circuit_breaker")
+        now = time.time()
+        with self.lock:
+            if self.state == "open":
+                # late response of a request sent before the breaker opened
+                return
+            if self.state == "half_open":
+                # only the probe closes the breaker: the probe has been sent
+                # after the breaker opened, a late response has not
+                if self._probe_time and now - duration >= self._opened_at:
+                    self._close()
+                return
+            slow_call_duration = cfg["slow_call_duration"]
+            slow = bool(slow_call_duration) and duration >= slow_call_duration
+            calls, _, slow_calls = self._record(now, failure=False, slow=slow)
+            if slow and calls >= cfg["min_calls"] and slow_calls / calls >= cfg["slow_call_rate"]:
+                self._open(now, "slow responses")
+
+    def record_failure(self, reason: str, suspended_time: float | None = None):
+        """Records a failed request of the engine.  If ``suspended_time`` is
+        given (and not zero), the breaker is opened for this time."""
+        cfg = get_setting("search.circuit_breaker")
+        now = time.time()
+        with self.lock:
+            if self.state == "half_open" and self._probe_time:
+                # the probe failed
+                self._open(now, reason, suspended_time or None)
+                return
+            if self.state != "closed":
+                # failure of a request sent before the breaker opened
+                if suspended_time and now + suspended_time > self.open_until:
+                    self._extend(now, reason, suspended_time)
+                return
+            if suspended_time:
+                self._open(now, reason, suspended_time)
+                return
+            calls, failures, _ = self._record(now, failure=True, slow=False)
+            if calls >= cfg["min_calls"] and failures / calls >= cfg["failure_rate"]:
+                self._open(now, reason)
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Returns the :py:obj:`CircuitBreaker` with the ``name``, the breaker is
+    created on first use."""
+    breaker = CIRCUIT_BREAKERS.get(name)
+    if breaker is None:
+        breaker = CIRCUIT_BREAKERS.setdefault(name, CircuitBreaker(name))
+    return breaker
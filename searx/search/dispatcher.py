@@ -0,0 +1,394 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Dispatch the engine requests of a search.
+
+The engines of SearXNG are synchronous: an engine's ``request`` and
+``response`` functions (and the HTTP request in between) are blocking calls.
+The HTTP requests themselves are already bounced to the asyncio loop of
+:py:obj:`searx.network`, but the engine code has to run in a thread.  How these
+threads are managed is selected by :ref:`search.dispatcher.mode <settings
+search>`:
+
+``threads`` (default)
+  For each engine request of a search a new thread is started (this is the
+  historical behavior of SearXNG).
+
+``executor``
+  The engine requests are submitted to a bounded :py:obj:`ThreadPoolExecutor
+  <concurrent.futures.ThreadPoolExecutor>` shared by all searches of the worker
+  process.  No thread is created per search, the size of the pool is limited
+  by ``search.dispatcher.max_workers``.  Requests still waiting in the queue of
+  the pool when the search timed out are canceled and never sent.
+
+  A request that timed out can't be canceled once it is running, it keeps its
+  worker until the engine has finished (at the latest when the HTTP request of
+  the engine times out).  While all workers are busy, no request waits in the
+  queue of the pool behind them: the request is run in a thread of its own (as
+  in mode ``threads``) and no hedged requests are sent.
+
+In mode ``executor`` the dispatcher can be tuned to trade a sliver of recall for
+a lower tail latency:
+
+``early_return``
+  The search does not wait for the slowest engines, once enough results have
+  been collected (``min_results`` results from ``min_engines`` engines with a
+  total :ref:`weight <settings engines>` of ``min_weight``).  The results of
+  the engines that are still running are ignored (these engines are not
+  reported as unresponsive).
+
+``hedging``
+  When the request to an (online) engine is still running after the
+  ``percentile`` of its response times (``('engine', name, 'time', 'total')``
+  in :py:obj:`searx.metrics`), a second request (*hedged request*) is sent to
+  the engine and the results of the request that answers first are used.  An
+  engine is hedged once its histogram has ``min_count`` values.
+
+"""
+
+__all__ = ["SearchTask", "RequestGroup", "dispatch", "get_executor", "submit_task"]
+
+import typing as t
+
+import copy
+import threading
+import concurrent.futures
+from timeit import default_timer
+from uuid import uuid4
+
+from flask import copy_current_request_context
+
+from searx import get_setting, logger
+from searx.engines import engines
+from searx.metrics import histogram
+from searx.search.processors import PROCESSORS, OnlineProcessor
+
+if t.TYPE_CHECKING:
+    from searx.results import ResultContainer
+    from searx.search.processors import RequestParams
+
+DispatchType = t.Literal["threads", "executor"]
+
+log = logger.getChild("search.dispatcher")
+
+_EXECUTOR: concurrent.futures.ThreadPoolExecutor | None = None
+_EXECUTOR_LOCK = threading.Lock()
+_IN_FLIGHT = 0
+"""Number of requests submitted to the executor that have not finished yet
+(including the requests that timed out but are still running)."""
+
+
+class RequestGroup:
+    """The requests to an engine in a search: the request and the hedged
+    request (if one has been sent).  Only the results of the first request
+    that answers are added to the :py:obj:`ResultContainer
+    <searx.results.ResultContainer>`, an error is only reported when all
+    requests of the group have failed."""
+
+    __slots__ = ("engine_name", "tasks", "claimed", "hedge_at", "_lock")
+
+    def __init__(self, engine_name: str):
+        self.engine_name: str = engine_name
+        self.tasks: list[SearchTask] = []
+        self.claimed: bool = False
+        self.hedge_at: float | None = None
+        self._lock = threading.Lock()
+
+    def claim(self) -> bool:
+        """Returns ``True`` if the results of the calling task are the first
+        results of the group."""
+        with self._lock:
+            if self.claimed:
+                return False
+            self.claimed = True
+            return True
+
+    def fail(self, task: "SearchTask") -> bool:
+        """Marks ``task`` as failed, returns ``True`` if the error has to be
+        reported (no other request of the group can answer)."""
+        with self._lock:
+            task.failed = True
+            return not self.claimed and all(_t.failed for _t in self.tasks)
+
+    @property
+    def done(self) -> bool:
+        return self.claimed or all(_t.failed for _t in self.tasks)
+
+
+class SearchTask:  # pylint: disable=too-few-public-methods
+    """State of an engine request that has been submitted to the executor.
+
+    The processors check the ``_timeout`` flag of the task before the results
+    of an engine are added to the :py:obj:`ResultContainer
+    <searx.results.ResultContainer>` (compare
+    :py:obj:`EngineProcessor.extend_container
+    <searx.search.processors.abstract.EngineProcessor.extend_container>`).
+    A task with the ``_skipped`` flag is no longer awaited (early return),
+    its results are ignored.
+    """
+
+    __slots__ = ("engine_name", "future", "group", "failed", "_timeout", "_skipped")
+
+    def __init__(self, engine_name: str, group: RequestGroup | None = None):
+        self.engine_name: str = engine_name
+        self.future: concurrent.futures.Future[None] = concurrent.futures.Future()
+        self.group: RequestGroup = group or RequestGroup(engine_name)
+        self.group.tasks.append(self)
+        self.failed: bool = False
+        self._timeout: bool = False
+        self._skipped: bool = False
+
+    def run(self, func: t.Callable[..., None], *args: t.Any):
+        """Runs ``func`` in the calling thread (a thread of the executor), the
+        task is registered in the thread for the duration of the call.  The
+        result is set in :py:obj:`SearchTask.future`, nothing is done if the
+        future has been canceled before."""
+        if not self.future.set_running_or_notify_cancel():
+            return
+        th = threading.current_thread()  # pylint: disable=invalid-name
+        th._search_task = self  # type: ignore # pylint: disable=protected-access
+        try:
+            func(*args)
+        except BaseException as e:  # pylint: disable=broad-exception-caught
+            self.future.set_exception(e)
+        else:
+            self.future.set_result(None)
+        finally:
+            del th._search_task  # type: ignore # pylint: disable=protected-access
+
+
+def get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Returns the thread pool of the worker process, the pool is created on
+    first use."""
+    global _EXECUTOR  # pylint: disable=global-statement
+
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+                max_workers=get_setting("search.dispatcher.max_workers"),
+                thread_name_prefix="search",
+            )
+        return _EXECUTOR
+
+
+def _done(_future: concurrent.futures.Future[None]):
+    global _IN_FLIGHT  # pylint: disable=global-statement
+
+    with _EXECUTOR_LOCK:
+        _IN_FLIGHT -= 1
+
+
+def submit_task(task: SearchTask, func: t.Callable[..., None], *args: t.Any, hedged: bool = False) -> bool:
+    """Submits ``task`` to the executor (:py:obj:`get_executor`).  If all
+    workers of the executor are busy, the task is run in a thread of its own,
+    a hedged request is not sent at all (``False`` is returned)."""
+    global _IN_FLIGHT  # pylint: disable=global-statement
+
+    executor = get_executor()
+    with _EXECUTOR_LOCK:
+        saturated = _IN_FLIGHT >= get_setting("search.dispatcher.max_workers")
+        if saturated and hedged:
+            return False
+        if not saturated:
+            _IN_FLIGHT += 1
+
+    if saturated:
+        log.debug("%s: all workers are busy, run the request in a new thread", task.engine_name)
+        threading.Thread(target=task.run, args=(func, *args), name="search").start()
+        return True
+
+    task.future.add_done_callback(_done)
+    executor.submit(task.run, func, *args)
+    return True
+
+
+def timeout_limit(engine_name: str, actual_timeout: float, engine_timeouts: dict[str, float] | None) -> float:
+    """Returns the timeout of the requests of an engine, the timeout of the
+    engine in ``engine_timeouts`` (if any) but not more than
+    ``actual_timeout``."""
+    if engine_timeouts and engine_name in engine_timeouts:
+        return min(engine_timeouts[engine_name], actual_timeout)
+    return actual_timeout
+
+
+def _timeout(engine_name: str, result_container: "ResultContainer"):
+    result_container.add_unresponsive_engine(engine_name, 'timeout')
+    PROCESSORS[engine_name].logger.error('engine timeout')
+
+
+def dispatch_threads(
+    requests: "list[tuple[str, str, RequestParams]]",
+    result_container: "ResultContainer",
+    start_time: float,
+    actual_timeout: float,
+    engine_timeouts: dict[str, float] | None = None,
+):
+    """Starts one thread per engine request and waits for them until
+    ``actual_timeout`` is reached.  The HTTP requests of an engine are limited
+    by its timeout in ``engine_timeouts`` (see :py:obj:`timeout_limit`)."""
+    # pylint: disable=protected-access
+    search_id = str(uuid4())
+
+    for engine_name, query, request_params in requests:
+        _search = copy_current_request_context(PROCESSORS[engine_name].search)
+        th = threading.Thread(  # pylint: disable=invalid-name
+            target=_search,
+            args=(
+                query,
+                request_params,
+                result_container,
+                start_time,
+                timeout_limit(engine_name, actual_timeout, engine_timeouts),
+            ),
+            name=search_id,
+        )
+        th._timeout = False
+        th._engine_name = engine_name
+        th.start()
+
+    for th in threading.enumerate():  # pylint: disable=invalid-name
+        if th.name == search_id:
+            remaining_time = max(0.0, actual_timeout - (default_timer() - start_time))
+            th.join(remaining_time)
+            if th.is_alive():
+                th._timeout = True
+                _timeout(th._engine_name, result_container)
+
+
+def hedge_delay(engine_name: str) -> float | None:
+    """Returns the time (sec.) after which a hedged request is sent to the
+    engine, ``None`` if the engine is not hedged."""
+    if not isinstance(PROCESSORS[engine_name], OnlineProcessor):
+        return None
+    h = histogram('engine', engine_name, 'time', 'total', raise_on_not_found=False)
+    if h is None or h.count < get_setting("search.dispatcher.hedging.min_count"):
+        return None
+    delay = h.percentage(get_setting("search.dispatcher.hedging.percentile"))
+    return None if delay is None else float(delay)
+
+
+def enough_results(result_container: "ResultContainer") -> bool:
+    """Returns ``True`` if the results in the container fulfill the conditions
+    of ``search.dispatcher.early_return``."""
+    cfg = get_setting("search.dispatcher.early_return")
+    if len(result_container.main_results_map) < cfg["min_results"]:
+        return False
+    engine_names = {timing.engine for timing in result_container.timings}
+    if len(engine_names) < cfg["min_engines"]:
+        return False
+    weight = sum(getattr(engines.get(name), "weight", 1.0) for name in engine_names)
+    return weight >= cfg["min_weight"]
+
+
+def dispatch_executor(
+    requests: "list[tuple[str, str, RequestParams]]",
+    result_container: "ResultContainer",
+    start_time: float,
+    actual_timeout: float,
+    engine_timeouts: dict[str, float] | None = None,
+):  # pylint: disable=too-many-locals, too-many-branches, too-many-statements
+    """Submits the engine requests to the executor (:py:obj:`get_executor`)
+    and waits for them until ``actual_timeout`` is reached (or, with
+    ``early_return``, until there are enough results)."""
+
+    early_return: bool = get_setting("search.dispatcher.early_return.enabled")
+    hedging: bool = get_setting("search.dispatcher.hedging.enabled")
+
+    def submit(engine_name: str, query: str, request_params: "RequestParams", group: RequestGroup | None = None):
+        _search = copy_current_request_context(PROCESSORS[engine_name].search)
+        task = SearchTask(engine_name, group)
+        if submit_task(
+            task,
+            _search,
+            query,
+            request_params,
+            result_container,
+            start_time,
+            timeout_limit(engine_name, actual_timeout, engine_timeouts),
+            hedged=group is not None,
+        ):
+            pending[task.future] = task
+        else:
+            task.group.tasks.remove(task)
+        return task
+
+    pending: dict[concurrent.futures.Future[None], SearchTask] = {}
+    groups: dict[str, tuple[RequestGroup, str, "RequestParams"]] = {}
+
+    for engine_name, query, request_params in requests:
+        hedge_params = copy.deepcopy(request_params) if hedging else request_params
+        group = submit(engine_name, query, request_params).group
+        if hedging:
+            delay = hedge_delay(engine_name)
+            if delay is not None and delay < actual_timeout:
+                group.hedge_at = start_time + delay
+        groups[engine_name] = (group, query, hedge_params)
+
+    skipped = False
+    while pending:
+        now = default_timer()
+        remaining_time = actual_timeout - (now - start_time)
+        if remaining_time <= 0:
+            break
+
+        wait_time = remaining_time
+        for group, _, _ in groups.values():
+            if group.hedge_at is not None and not group.done:
+                wait_time = min(wait_time, max(0.0, group.hedge_at - now))
+
+        done, _ = concurrent.futures.wait(
+            list(pending), timeout=wait_time, return_when=concurrent.futures.FIRST_COMPLETED
+        )
+        for future in done:
+            task = pending.pop(future)
+            group = task.group
+            if group.done:
+                # don't wait for the other request of the group
+                for other in group.tasks:
+                    if other is not task and other.future in pending:
+                        del pending[other.future]
+                        other._skipped = True  # pylint: disable=protected-access
+                        other.future.cancel()
+
+        if early_return and enough_results(result_container):
+            skipped = True
+            break
+
+        now = default_timer()
+        for engine_name, (group, query, hedge_params) in groups.items():
+            if group.hedge_at is not None and group.hedge_at <= now:
+                group.hedge_at = None
+                if not group.done:
+                    log.debug("%s: send hedged request", engine_name)
+                    submit(engine_name, query, hedge_params, group)
+
+    reported: set[str] = set()
+    for task in pending.values():
+        # a request still waiting in the queue of the executor will never be
+        # sent, a running one is no longer awaited.
+        task.future.cancel()
+        if skipped:
+            task._skipped = True  # pylint: disable=protected-access
+            continue
+        task._timeout = True  # pylint: disable=protected-access
+        if task.engine_name not in reported:
+            reported.add(task.engine_name)
+            _timeout(task.engine_name, result_container)
+
+
+DISPATCHERS: dict[DispatchType, t.Callable[..., None]] = {
+    "threads": dispatch_threads,
+    "executor": dispatch_executor,
+}
+
+
+def dispatch(
+    requests: "list[tuple[str, str, RequestParams]]",
+    result_container: "ResultContainer",
+    start_time: float,
+    actual_timeout: float,
+    engine_timeouts: dict[str, float] | None = None,
+):
+    """Sends the engine requests with the dispatcher selected in
+    ``search.dispatcher.mode``."""
+    DISPATCHERS[get_setting("search.dispatcher.mode")](
+        requests, result_container, start_time, actual_timeout, engine_timeouts
+    )
@@ -12,21 +12,22 @@ from timeit import default_timer
 from searx import get_setting
 from searx import logger
 from searx.engines import engines
-from searx.network import get_time_for_thread, get_network
+from searx.network import get_time_for_thread
 from searx.metrics import histogram_observe, counter_inc, count_exception, count_error
 from searx.exceptions import SearxEngineAccessDeniedException
+from searx.search.circuit_breaker import CircuitBreaker, get_circuit_breaker
 from searx.utils import get_engine_from_settings
 
 if t.TYPE_CHECKING:
     import types
     from searx.enginelib import Engine
+    from searx.enginelib.lazy import LazyEngine
     from searx.search.models import SearchQuery
     from searx.results import ResultContainer
     from searx.result_types import Result, LegacyResult  # pyright: ignore[reportPrivateLocalImportUsage]
 
 
 logger = logger.getChild("searx.search.processor")
-SUSPENDED_STATUS: dict[int | str, "SuspendedStatus"] = {}
 
 
 class RequestParams(t.TypedDict):
@@ -75,51 +76,18 @@ class RequestParams(t.TypedDict):
     :py:obj:`searx.locales`."""
 
 
-class SuspendedStatus:
-    """Class to handle suspend state."""
-
-    def __init__(self):
-        self.lock: threading.Lock = threading.Lock()
-        self.continuous_errors: int = 0
-        self.suspend_end_time: float = 0
-        self.suspend_reason: str = ""
-
-    @property
-    def is_suspended(self):
-        return self.suspend_end_time >= default_timer()
-
-    def suspend(self, suspended_time: int | None, suspend_reason: str):
-        with self.lock:
-            # update continuous_errors / suspend_end_time
-            self.continuous_errors += 1
-            if suspended_time is None:
-                max_ban: int = get_setting("search.max_ban_time_on_fail")
-                ban_fail: int = get_setting("search.ban_time_on_fail")
-                suspended_time = min(max_ban, ban_fail)
-
-            self.suspend_end_time = default_timer() + suspended_time
-            self.suspend_reason = suspend_reason
-            logger.debug("Suspend for %i seconds", suspended_time)
-
-    def resume(self):
-        with self.lock:
-            # reset the suspend variables
-            self.continuous_errors = 0
-            self.suspend_end_time = 0
-            self.suspend_reason = ""
-
-
 class EngineProcessor(ABC):
     """Base classes used for all types of request processors."""
 
     engine_type: str
 
-    def __init__(self, engine: "Engine|types.ModuleType"):
+    def __init__(self, engine: "Engine|types.ModuleType|LazyEngine"):
         self.engine: "Engine" = engine  # pyright: ignore[reportAttributeAccessIssue]
         self.logger: logging.Logger = engines[engine.name].logger
-        key = get_network(self.engine.name)
-        key = id(key) if key else self.engine.name
-        self.suspended_status: SuspendedStatus = SUSPENDED_STATUS.setdefault(key, SuspendedStatus())
+        # engines that share a network share the circuit breaker
+        network = getattr(self.engine, "network", None)
+        key = network if isinstance(network, str) else self.engine.name
+        self.circuit_breaker: CircuitBreaker = get_circuit_breaker(key)
 
     def initialize(self, callback: t.Callable[["EngineProcessor", bool], bool]):
         """Initialization of *this* :py:obj:`EngineProcessor`.
@@ -178,6 +146,11 @@ class EngineProcessor(ABC):
         exception_or_message: BaseException | str,
         suspend: bool = False,
     ):
+        task = getattr(threading.current_thread(), '_search_task', None)
+        if task is not None and (task._skipped or not task.group.fail(task)):  # pylint: disable=protected-access
+            # the search has returned early or the other request of the engine
+            # (hedged request) is still answering
+            return
         # update result_container
         if isinstance(exception_or_message, BaseException):
             exception_class = exception_or_message.__class__
@@ -198,7 +171,7 @@ class EngineProcessor(ABC):
             suspended_time = None
             if isinstance(exception_or_message, SearxEngineAccessDeniedException):
                 suspended_time = exception_or_message.suspended_time
-            self.suspended_status.suspend(suspended_time, error_message)  # pylint: disable=no-member
+            self.circuit_breaker.record_failure(error_message, suspended_time)
 
     def _extend_container_basic(
         self,
@@ -223,19 +196,30 @@ class EngineProcessor(ABC):
         start_time: float,
         search_results: "list[Result | LegacyResult]|None",
     ):
-        if getattr(threading.current_thread(), '_timeout', False):
+        # the timeout flag is set on the thread or, when the request has been
+        # dispatched to the executor, on the task running in the thread.
+        th = threading.current_thread()  # pylint: disable=invalid-name
+        task = getattr(th, '_search_task', None)
+        if getattr(task or th, '_timeout', False):
             # the main thread is not waiting anymore
             self.handle_exception(result_container, 'timeout', False)
+        elif task is not None and (task._skipped or not task.group.claim()):  # pylint: disable=protected-access
+            # the search has returned early or the results of the other request
+            # of the engine (hedged request) have already been added
+            pass
         else:
             # check if the engine accepted the request
             if search_results is not None:
                 self._extend_container_basic(result_container, start_time, search_results)
-            self.suspended_status.resume()
+            self.circuit_breaker.record_success(default_timer() - start_time)
 
     def extend_container_if_suspended(self, result_container: "ResultContainer") -> bool:
-        if self.suspended_status.is_suspended:
+        """Returns ``True`` if the :py:obj:`circuit breaker
+        <searx.search.circuit_breaker>` of the engine is open, the engine is
+        added to the unresponsive engines of the ``result_container``."""
+        if not self.circuit_breaker.allow_request():
             result_container.add_unresponsive_engine(
-                self.engine.name, self.suspended_status.suspend_reason, suspended=True
+                self.engine.name, self.circuit_breaker.suspend_reason, suspended=True
             )
             return True
         return False
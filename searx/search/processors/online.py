@@ -1,7 +1,7 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 """Processor used for ``online`` engines."""
 
-__all__ = ["OnlineProcessor", "OnlineParams"]
+__all__ = ["OnlineProcessor", "OnlineParams", "get_response_cache"]
 
 import typing as t
 
@@ -11,6 +11,8 @@ import ssl
 import httpx
 
 import searx.network
+from searx.cache import ExpireCache, ExpireCacheCfg
+from searx.enginelib import EngineCache
 from searx.utils import gen_useragent
 from searx.exceptions import (
     SearxEngineAccessDeniedException,
@@ -110,11 +112,60 @@ def default_request_params() -> HTTPParams:
     }
 
 
+_RESPONSE_CACHE: ExpireCache | None = None
+
+
+def get_response_cache() -> ExpireCache:
+    """Returns the cache of the parsed engine responses (``RESPONSE_CACHE``).
+    The responses are not stored in :py:obj:`ENGINES_CACHE
+    <searx.enginelib.ENGINES_CACHE>`, where the engines keep their (small)
+    tokens: a list of results is much larger than a token and would evict the
+    tokens from the memory of the ``ENGINES_CACHE``.  The cache is build on
+    first use."""
+    global _RESPONSE_CACHE  # pylint: disable=global-statement
+
+    if _RESPONSE_CACHE is None:
+        _RESPONSE_CACHE = ExpireCache.build_cache(
+            ExpireCacheCfg(
+                name="RESPONSE_CACHE",
+                MAXHOLD_TIME=60 * 60 * 24,  # 1 day
+                MAINTENANCE_PERIOD=60 * 60,  # 1h
+                MAX_VALUE_LEN=1024 * 1024,  # 1MB
+            )
+        )
+    return _RESPONSE_CACHE
+
+
 class OnlineProcessor(EngineProcessor):
     """Processor class for ``online`` engines."""
 
     engine_type: str = "online"
 
+    _response_cache: EngineCache | None = None
+
+    @property
+    def response_cache(self) -> EngineCache:
+        """Cache of the parsed engine responses (see
+        :py:obj:`Engine.cache_ttl <searx.enginelib.Engine.cache_ttl>`)."""
+        if self._response_cache is None:
+            self._response_cache = EngineCache(self.engine.name, cache=get_response_cache())
+        return self._response_cache
+
+    def response_cache_key(self, query: str, params: OnlineParams) -> str:
+        """Returns the key of the request in the :py:obj:`response_cache`.
+        The key is formed from the arguments of the search request that are
+        passed to the engine (the query term is not stored in plain text)."""
+        args = (
+            query,
+            params["category"],
+            params["pageno"],
+            params["searxng_locale"],
+            params["safesearch"],
+            params["time_range"],
+            sorted(params["engine_data"].items()),
+        )
+        return "response-" + self.response_cache.secret_hash(repr(args))
+
     def init_engine(self) -> bool:
         """This method is called in a thread, and before the base method is
         called, the network must be set up for the ``online`` engines."""
@@ -223,6 +274,15 @@ class OnlineProcessor(EngineProcessor):
         return response
 
     def _search_basic(self, query: str, params: OnlineParams) -> "EngineResults|None":
+        # results of the same request from the response cache
+        cache_ttl: int = getattr(self.engine, "cache_ttl", 0) or 0
+        cache_key = None
+        if cache_ttl > 0:
+            cache_key = self.response_cache_key(query, params)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         # update request parameters dependent on
         # search-engine (contained in engines folder)
         self.engine.request(query, params)
@@ -236,7 +296,11 @@ class OnlineProcessor(EngineProcessor):
 
         # parse the response
         response.search_params = params
-        return self.engine.response(response)
+        search_results = self.engine.response(response)
+
+        if cache_key is not None and search_results is not None:
+            self.response_cache.set(cache_key, list(search_results), expire=cache_ttl)
+        return search_results
 
     def search(  # pyright: ignore[reportIncompatibleMethodOverride]
         self,
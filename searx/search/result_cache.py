@@ -0,0 +1,138 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Query-level cache of the engine results.
+
+The result cache is *opt-in* and activated in :ref:`search.result_cache
+<settings search>`.  When it is active, the results of the engines of a search
+are stored under a key, which is formed from the normalized
+:py:obj:`SearchQuery <searx.search.models.SearchQuery>`.  A repetition of the
+same search (trending queries, pagination back and forth, reload of a result
+page) is answered from the cache without sending requests to the engines.
+
+The results are cached per engine (the list of results returned by the engine,
+pickled when the search has finished).  Each engine has its own TTL
+(``result_cache_ttl`` in the :ref:`engine settings <settings engines>`, default
+is ``search.result_cache.ttl``), so a partial hit is possible: engines whose
+results are still valid are served from the cache, only the others are
+requested.  Engines that did not respond (errors, timeouts) are not cached.
+
+Hits and misses are counted per engine and shown in ``/metrics``.
+"""
+
+__all__ = ["ResultCache", "RESULT_CACHE"]
+
+import typing as t
+
+import pickle
+import time
+
+from searx import get_setting, logger
+from searx.cache import ExpireCache, ExpireCacheCfg
+from searx.engines import engines
+
+if t.TYPE_CHECKING:
+    from searx.result_types import Result, LegacyResult  # pyright: ignore[reportPrivateLocalImportUsage]
+    from searx.search.models import SearchQuery
+
+log = logger.getChild("search.result_cache")
+
+CachedEntryType: t.TypeAlias = dict[str, tuple[int, bytes]]
+"""Value of a cache entry, maps engine names to a tuple with the expire time
+(unix epoch) and the pickled list of results of the engine."""
+
+
+class ResultCache:
+    """Cache for the results of the engines, stored in a
+    :py:obj:`searx.cache.ExpireCache`."""
+
+    def __init__(self):
+        self._cache: ExpireCache | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return get_setting("search.result_cache.enabled")
+
+    @property
+    def cache(self) -> ExpireCache:
+        if self._cache is None:
+            self._cache = ExpireCache.build_cache(
+                ExpireCacheCfg(
+                    name="RESULT_CACHE",
+                    MAXHOLD_TIME=get_setting("search.result_cache.max_ttl"),
+                    MAINTENANCE_PERIOD=5 * 60,
+                    MAX_VALUE_LEN=1024 * 1024 * 5,  # 5MB
+                )
+            )
+        return self._cache
+
+    def key(self, search_query: "SearchQuery") -> str:
+        """Returns the key of the normalized ``search_query``.  Arguments of the
+        query that have no influence on the results of the engines
+        (``timeout_limit``, ``redirect_to_first_result``) are not part of the
+        key.  The key is a hash value, the query term is not stored in plain
+        text."""
+        norm = (
+            search_query.query,
+            sorted((ref.name, ref.category) for ref in search_query.engineref_list),
+            search_query.lang,
+            search_query.safesearch,
+            search_query.pageno,
+            search_query.time_range,
+            sorted((name, sorted(data.items())) for name, data in search_query.engine_data.items()),
+        )
+        return self.cache.secret_hash(repr(norm))
+
+    @staticmethod
+    def engine_ttl(engine_name: str) -> int:
+        """Returns the TTL (sec.) of the results of engine ``engine_name``, if
+        the results should not be cached, ``0`` is returned."""
+        ttl = getattr(engines.get(engine_name), "result_cache_ttl", None)
+        if ttl is None:
+            ttl = get_setting("search.result_cache.ttl")
+        return min(int(ttl), get_setting("search.result_cache.max_ttl"))
+
+    def get(self, search_query: "SearchQuery") -> "dict[str, list[Result | LegacyResult]]":
+        """Returns the cached results (mapped by engine names) of the
+        ``search_query``, expired results are not returned."""
+        entry: CachedEntryType | None = self.cache.get(self.key(search_query))
+        if not entry:
+            return {}
+
+        now = int(time.time())
+        results: "dict[str, list[Result | LegacyResult]]" = {}
+        for engine_name, (expire, data) in entry.items():
+            if expire < now:
+                continue
+            results[engine_name] = pickle.loads(data)
+        return results
+
+    def set(self, search_query: "SearchQuery", engine_results: "dict[str, list[Result | LegacyResult]]") -> bool:
+        """Stores the ``engine_results`` of the ``search_query`` in the cache,
+        results of engines with a TTL of ``0`` are not stored.  Results of
+        engines from a previous search that are still valid are kept in the
+        cache entry."""
+
+        key = self.key(search_query)
+        now = int(time.time())
+
+        entry: CachedEntryType = {}
+        for engine_name, (expire, data) in (self.cache.get(key) or {}).items():
+            if expire >= now:
+                entry[engine_name] = (expire, data)
+
+        for engine_name, results in engine_results.items():
+            ttl = self.engine_ttl(engine_name)
+            if ttl <= 0:
+                continue
+            try:
+                entry[engine_name] = (now + ttl, pickle.dumps(results))
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                log.warning("can't pickle results of engine %s: %s", engine_name, e)
+
+        if not entry:
+            return False
+        expire = max(max(v[0] for v in entry.values()) - now, 1)
+        return self.cache.set(key=key, value=entry, expire=expire)
+
+
+RESULT_CACHE = ResultCache()
+"""Global :py:obj:`ResultCache` instance."""
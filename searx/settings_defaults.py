@@ -20,7 +20,7 @@ from ._settings import SettingsPref
 searx_dir = abspath(dirname(__file__))
 
 logger = logging.getLogger('searx')
-OUTPUT_FORMATS = ['html', 'csv', 'json', 'rss']
+OUTPUT_FORMATS = ['html', 'csv', 'json', 'rss', 'ndjson']
 SXNG_LOCALE_TAGS = ['all', 'auto'] + list(l[0] for l in sxng_locales)
 SIMPLE_STYLE = ('auto', 'light', 'dark', 'black')
 CATEGORIES_AS_TABS: dict[str, dict[str, t.Any]] = {
@@ -188,6 +188,10 @@ SCHEMA: dict[str, t.Any] = {
         'donation_url': SettingsValue((bool, str), "https://docs.searxng.org/donate.html"),
         'enable_metrics': SettingsValue(bool, True),
         'open_metrics': SettingsValue(str, ''),
+        'metrics': {
+            'backend': SettingsValue(('local', 'valkey'), 'local'),
+            'flush_interval': SettingsValue(numbers.Real, 5),
+        },
     },
     'brand': SettingsBrand,
     'search': {
@@ -199,6 +203,16 @@ SCHEMA: dict[str, t.Any] = {
         'languages': SettingSublistValue(SXNG_LOCALE_TAGS, SXNG_LOCALE_TAGS),  # type: ignore
         'ban_time_on_fail': SettingsValue(numbers.Real, 5),
         'max_ban_time_on_fail': SettingsValue(numbers.Real, 120),
+        'circuit_breaker': {
+            'window': SettingsValue(numbers.Real, 60),
+            'min_calls': SettingsValue(int, 5),
+            'failure_rate': SettingsValue(numbers.Real, 0.5),
+            'slow_call_duration': SettingsValue(numbers.Real, 0),
+            'slow_call_rate': SettingsValue(numbers.Real, 0.8),
+            'probe_interval': SettingsValue(numbers.Real, 10),
+            'shared': SettingsValue(bool, True),
+            'sync_interval': SettingsValue(numbers.Real, 1),
+        },
         'suspended_times': {
             'SearxEngineAccessDenied': SettingsValue(numbers.Real, 86400),
             'SearxEngineCaptcha': SettingsValue(numbers.Real, 86400),
@@ -209,6 +223,39 @@ SCHEMA: dict[str, t.Any] = {
         },
         'formats': SettingsValue(list, OUTPUT_FORMATS),
         'max_page': SettingsValue(int, 0),
+        'result_cache': {
+            'enabled': SettingsValue(bool, False),
+            'ttl': SettingsValue(int, 300),
+            'max_ttl': SettingsValue(int, 3600),
+        },
+        'engines_cache': {
+            'memory_cache_size': SettingsValue(int, 0),
+            'write_behind_delay': SettingsValue(numbers.Real, 0),
+        },
+        'adaptive_timeout': {
+            'enabled': SettingsValue(bool, False),
+            'percentile': SettingsValue(numbers.Real, 95),
+            'factor': SettingsValue(numbers.Real, 1.5),
+            'min_count': SettingsValue(int, 20),
+            'min': SettingsValue(numbers.Real, 1.0),
+            'max': SettingsValue(numbers.Real, 6.0),
+        },
+        'dispatcher': {
+            'mode': SettingsValue(('threads', 'executor'), 'threads'),
+            'max_workers': SettingsValue(int, 64),
+            'early_return': {
+                'enabled': SettingsValue(bool, False),
+                'min_results': SettingsValue(int, 20),
+                'min_engines': SettingsValue(int, 3),
+                'min_weight': SettingsValue(numbers.Real, 0),
+            },
+            'hedging': {
+                'enabled': SettingsValue(bool, False),
+                'percentile': SettingsValue(numbers.Real, 95),
+                'min_count': SettingsValue(int, 20),
+            },
+        },
+        'lazy_engines': SettingsValue(bool, False),
     },
     'server': {
         'port': SettingsValue((int, str), 8888, 'SEARXNG_PORT'),
@@ -218,6 +265,11 @@ SCHEMA: dict[str, t.Any] = {
         'secret_key': SettingsValue(str, environ_name='SEARXNG_SECRET'),
         'base_url': SettingsValue((False, str), False, 'SEARXNG_BASE_URL'),
         'image_proxy': SettingsValue(bool, False, 'SEARXNG_IMAGE_PROXY'),
+        'image_proxy_cache': {
+            'enabled': SettingsValue(bool, False),
+            'path': SettingsValue(str, ''),
+            'max_bytes': SettingsValue(int, 512 * 1024 * 1024),
+        },
         'http_protocol_version': SettingsValue(('1.0', '1.1'), '1.0'),
         'method': SettingsValue(('POST', 'GET'), 'GET', 'SEARXNG_METHOD'),
         'default_http_headers': SettingsValue(dict, {}),
@@ -228,6 +280,7 @@ SCHEMA: dict[str, t.Any] = {
     },
     'valkey': {
         'url': SettingsValue((None, False, str), False, 'SEARXNG_VALKEY_URL'),
+        'caches': SettingsValue(list, []),
     },
     'ui': {
         'static_path': SettingsDirectoryValue(str, os.path.join(searx_dir, 'static')),
@@ -264,6 +317,10 @@ SCHEMA: dict[str, t.Any] = {
         # Tor configuration
         'using_tor_proxy': SettingsValue(bool, False),
         'extra_proxy_timeout': SettingsValue(int, 0),
+        'warmup': {
+            'enabled': SettingsValue(bool, False),
+            'keepalive_interval': SettingsValue(numbers.Real, 0),
+        },
         'networks': {},
     },
     'plugins': SettingsValue(dict, {}),
@@ -87,6 +87,13 @@ def secret_hash(name: str):
     return m.hexdigest()
 
 
+def counter_key(name: str) -> str:
+    """Returns the valkey key ``SearXNG_counter_<name>`` of a counter, the
+    replacement ``<name>`` is a *secret hash* of the value from argument
+    ``name`` (see :py:func:`secret_hash`)."""
+    return "SearXNG_counter_" + secret_hash(name)
+
+
 INCR_COUNTER = """
 local limit = tonumber(ARGV[1])
 local expire = tonumber(ARGV[2])
@@ -151,8 +158,7 @@ def incr_counter(client, name: str, limit: int = 0, expire: int = 0):
 
     """
     script = lua_script_storage(client, INCR_COUNTER)
-    name = "SearXNG_counter_" + secret_hash(name)
-    c = script(args=[limit, expire], keys=[name])
+    c = script(args=[limit, expire], keys=[counter_key(name)])
     return c
 
 
@@ -162,8 +168,7 @@ def drop_counter(client, name):
     The replacement ``<name>`` is a *secret hash* of the value from argument
     ``name`` (see :py:func:`incr_counter` and :py:func:`incr_sliding_window`).
     """
-    name = "SearXNG_counter_" + secret_hash(name)
-    client.delete(name)
+    client.delete(counter_key(name))
 
 
 INCR_SLIDING_WINDOW = """
@@ -235,6 +240,5 @@ def incr_sliding_window(client, name: str, duration: int):
 
     """
     script = lua_script_storage(client, INCR_SLIDING_WINDOW)
-    name = "SearXNG_counter_" + secret_hash(name)
-    c = script(args=[duration], keys=[name])
+    c = script(args=[duration], keys=[counter_key(name)])
     return c
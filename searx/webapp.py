@@ -7,6 +7,8 @@ import json
 import os
 import sys
 import base64
+import queue
+import threading
 
 from timeit import default_timer
 from html import escape
@@ -26,6 +28,7 @@ from pygments.formatters import HtmlFormatter  # pylint: disable=no-name-in-modu
 
 from whitenoise import WhiteNoise
 from whitenoise.base import Headers
+from werkzeug.http import parse_date, unquote_etag
 
 import flask
 
@@ -36,6 +39,8 @@ from flask import (
     make_response,
     redirect,
     send_from_directory,
+    stream_with_context,
+    copy_current_request_context,
 )
 from flask.wrappers import Response
 from flask.json import jsonify
@@ -97,7 +102,16 @@ import searx.answerers
 import searx.plugins
 
 
-from searx.metrics import get_engines_stats, get_engine_errors, get_reliabilities, histogram, counter, openmetrics
+from searx.metrics import (
+    get_engines_stats,
+    get_engine_errors,
+    get_reliabilities,
+    histogram,
+    counter,
+    counter_add,
+    openmetrics,
+    sync as sync_metrics,
+)
 from searx.flaskfix import patch_application
 
 from searx.locales import (
@@ -112,11 +126,12 @@ from searx.locales import (
 # renaming names from searx imports ...
 from searx.autocomplete import search_autocomplete, backends as autocomplete_backends
 from searx import favicons
+from searx import image_proxy_cache
 
 from searx.valkeydb import initialize as valkey_initialize
 from searx.sxng_locales import sxng_locales
 import searx.search
-from searx.network import stream as http_stream, set_context_network_name
+from searx.network import stream as http_stream, set_context_network_name, warmup as network_warmup
 
 
 logger = logger.getChild('webapp')
@@ -447,6 +462,10 @@ def render(template_name: str, **kwargs):
     )
     kwargs['urlparse'] = urlparse
 
+    if kwargs.get('results') and kwargs.get('favicon_resolver'):
+        # look up the favicons of all results in one query to the favicon cache
+        favicons.prefetch_favicon_urls(r.parsed_url.netloc for r in kwargs['results'] if getattr(r, 'parsed_url', None))
+
     start_time = default_timer()
     result = render_template('{}/{}'.format(kwargs['theme'], template_name), **kwargs)
     sxng_request.render_time += default_timer() - start_time  # pylint: disable=assigning-non-slot
@@ -549,7 +568,7 @@ def post_request(response: flask.Response):
 
 
 def index_error(output_format: str, error_message: str):
-    if output_format == 'json':
+    if output_format in ('json', 'ndjson'):
         return Response(json.dumps({'error': error_message}), mimetype='application/json')
     if output_format == 'csv':
         response = Response('', mimetype='application/csv')
@@ -613,11 +632,45 @@ def rss_xsl():
     )
 
 
+def search_stream(search_obj: searx.search.SearchWithPlugins) -> typing.Iterator[str]:
+    """Runs the search in a thread and yields the lines of the ``ndjson``
+    output format: a line for each engine as soon as the results of the engine
+    have been added to the result container, and a final line with the ranked
+    results (compare :py:obj:`searx.webutils.get_ndjson_final_line`)."""
+
+    lines: queue.SimpleQueue[str | None] = queue.SimpleQueue()
+    failed = threading.Event()
+
+    def on_extend(engine_name, added):
+        lines.put(webutils.get_ndjson_engine_line(engine_name, added))
+
+    search_obj.result_container.on_extend = on_extend
+
+    @copy_current_request_context
+    def _search():
+        try:
+            search_obj.search()
+        except Exception as e:  # pylint: disable=broad-except
+            logger.exception(e, exc_info=True)
+            failed.set()
+            lines.put(json.dumps({'type': 'error', 'error': gettext('search error')}) + "\n")
+        finally:
+            lines.put(None)
+
+    threading.Thread(target=_search, name="search_stream").start()
+
+    while (line := lines.get()) is not None:
+        yield line
+
+    if not failed.is_set():
+        yield webutils.get_ndjson_final_line(search_obj.search_query, search_obj.result_container)
+
+
 @app.route('/search', methods=['GET', 'POST'])
 def search():
     """Search query in q and return results.
 
-    Supported outputs: html, json, csv, rss.
+    Supported outputs: html, json, csv, rss, ndjson.
     """
     # pylint: disable=too-many-locals, too-many-return-statements, too-many-branches
     # pylint: disable=too-many-statements
@@ -650,6 +703,8 @@ def search():
             sxng_request.preferences, sxng_request.form
         )
         search_obj = searx.search.SearchWithPlugins(search_query, sxng_request, sxng_request.user_plugins)
+        if output_format == 'ndjson':
+            return Response(stream_with_context(search_stream(search_obj)), mimetype='application/x-ndjson')
         result_container = search_obj.search()
 
     except SearxParameterException as e:
@@ -885,6 +940,7 @@ def preferences():
     allowed_plugins = sxng_request.preferences.plugins.get_enabled()
 
     # stats for preferences page
+    sync_metrics()
     filtered_engines = dict(filter(lambda kv: sxng_request.preferences.validate_token(kv[1]), engines.items()))
 
     engines_by_category = {}
@@ -989,7 +1045,7 @@ app.add_url_rule('/favicon_proxy', methods=['GET'], endpoint="favicon_proxy", vi
 
 @app.route('/image_proxy', methods=['GET'])
 def image_proxy():
-    # pylint: disable=too-many-return-statements, too-many-branches
+    # pylint: disable=too-many-return-statements, too-many-branches, too-many-statements
 
     url = sxng_request.args.get('url')
     if not url:
@@ -999,6 +1055,12 @@ def image_proxy():
         return '', 400
 
     maximum_size = 5 * 1024 * 1024
+    cache = image_proxy_cache.CACHE
+    if cache is not None:
+        response = _image_proxy_cached(cache, url)
+        if response is not None:
+            return response
+
     forward_resp = False
     resp = None
     try:
@@ -1008,12 +1070,21 @@ def image_proxy():
             'Sec-GPC': '1',
             'DNT': '1',
         }
+        # pass-through of the validators, the browser revalidates its copy of
+        # the image and a "304 Not Modified" of the upstream is forwarded
+        for name in ('If-None-Match', 'If-Modified-Since'):
+            if name in sxng_request.headers:
+                request_headers[name] = sxng_request.headers[name]
+
         set_context_network_name('image_proxy')
         resp, stream = http_stream(method='GET', url=url, headers=request_headers, allow_redirects=True)
         content_length = resp.headers.get('Content-Length')
         if content_length and content_length.isdigit() and int(content_length) > maximum_size:
             return 'Max size', 400
 
+        if resp.status_code == 304:
+            return Response(status=304, headers=dict_subset(resp.headers, {'ETag', 'Last-Modified'}))
+
         if resp.status_code != 200:
             logger.debug('image-proxy: wrong response code: %i', resp.status_code)
             if resp.status_code >= 400:
@@ -1049,16 +1120,76 @@ def image_proxy():
         except httpx.HTTPError as e:
             logger.debug('Exception while closing response', e)
 
+    writer = None
+    if cache is not None and resp.headers.get('Content-Encoding', 'identity') == 'identity':
+        # the stream contains the raw bytes of the response, only images
+        # without a content encoding are cached
+        writer = cache.writer(
+            url, resp.headers['Content-Type'], resp.headers.get('ETag'), resp.headers.get('Last-Modified'), maximum_size
+        )
+
+    def image_stream():
+        bytes_c = 0
+        complete = False
+        try:
+            for chunk in stream:
+                bytes_c += len(chunk)
+                if writer:
+                    writer.write(chunk)
+                yield chunk
+            complete = True
+        finally:
+            counter_add(bytes_c, 'image_proxy', 'bytes', 'upstream')
+            if writer and complete:
+                writer.commit()
+            elif writer:
+                writer.discard()
+
     try:
-        headers = dict_subset(resp.headers, {'Content-Type', 'Content-Encoding', 'Content-Length', 'Length'})
-        response = Response(stream, mimetype=resp.headers['Content-Type'], headers=headers, direct_passthrough=True)
+        headers = dict_subset(
+            resp.headers, {'Content-Type', 'Content-Encoding', 'Content-Length', 'Length', 'ETag', 'Last-Modified'}
+        )
+        response = Response(
+            image_stream(), mimetype=resp.headers['Content-Type'], headers=headers, direct_passthrough=True
+        )
         response.call_on_close(close_stream)
+        if writer:
+            # the stream is not consumed (HEAD request, client disconnected
+            # before the first chunk): image_stream's finally is not called
+            response.call_on_close(writer.discard)
         return response
     except httpx.HTTPError:
         close_stream()
         return '', 400
 
 
+def _image_proxy_cached(cache: image_proxy_cache.ImageProxyCache, url: str) -> Response | None:
+    """Serves the image of the ``url`` from the cache of the image proxy,
+    returns ``None`` if the image is not in the cache.  The file is sent by
+    :py:obj:`flask.send_file`, conditional requests (``If-None-Match``,
+    ``If-Modified-Since``) and ranges are answered from the cache."""
+
+    image = cache.get(url)
+    if image is None:
+        return None
+
+    etag = image.sha256
+    if image.etag:
+        etag = unquote_etag(image.etag)[0] or etag
+    last_modified = parse_date(image.last_modified) if image.last_modified else None
+    try:
+        response = flask.send_file(
+            image.path, mimetype=image.mime, etag=etag, last_modified=last_modified, conditional=True
+        )
+    except FileNotFoundError:
+        # evicted by a concurrent worker
+        return None
+
+    if response.status_code in (200, 206):
+        counter_add(response.content_length or 0, 'image_proxy', 'bytes', 'cache')
+    return response
+
+
 @app.route('/engine_descriptions.json', methods=['GET'])
 def engine_descriptions():
     sxng_ui_lang_tag = get_locale().replace("_", "-")
@@ -1097,6 +1228,7 @@ def stats():
         else:
             filtered_engines = [selected_engine_name]
 
+    sync_metrics()
     engine_stats = get_engines_stats(filtered_engines)
     engine_reliabilities = get_reliabilities(filtered_engines)
 
@@ -1148,6 +1280,7 @@ def stats():
 @app.route('/stats/errors', methods=['GET'])
 def stats_errors():
     filtered_engines = dict(filter(lambda kv: sxng_request.preferences.validate_token(kv[1]), engines.items()))
+    sync_metrics()
     result = get_engine_errors(filtered_engines)
     return jsonify(result)
 
@@ -1164,6 +1297,7 @@ def stats_open_metrics():
 
     filtered_engines = dict(filter(lambda kv: sxng_request.preferences.validate_token(kv[1]), engines.items()))
 
+    sync_metrics()
     engine_stats = get_engines_stats(filtered_engines)
     engine_reliabilities = get_reliabilities(filtered_engines)
     metrics_text = openmetrics(engine_stats, engine_reliabilities)
@@ -1363,14 +1497,17 @@ def init():
 
     # init database schema first / DB schema is created with the first connect
     from searx.data import get_cache
+    from searx.cache import ExpireCacheSQLite
     from searx.enginelib import ENGINES_CACHE
 
     conn = get_cache().connect()
     conn.close()
-    conn = ENGINES_CACHE.connect()
-    conn.close()
+    if isinstance(ENGINES_CACHE, ExpireCacheSQLite):
+        conn = ENGINES_CACHE.connect()
+        conn.close()
 
     favicons.init()
+    image_proxy_cache.init()
 
     # init application
     locales_initialize()
@@ -1379,6 +1516,8 @@ def init():
 
     metrics: bool = get_setting("general.enable_metrics")  # type: ignore
     searx.search.initialize(check_network=True, enable_metrics=metrics)
+    if get_setting("outgoing.warmup.enabled"):
+        network_warmup(get_setting("outgoing.warmup.keepalive_interval"))  # type: ignore
 
     limiter.initialize(app, settings)
 
@@ -11,7 +11,7 @@ import re
 import itertools
 import json
 from datetime import datetime, timedelta
-from typing import Iterable, List, Tuple, TYPE_CHECKING
+from typing import Any, Iterable, List, Tuple, TYPE_CHECKING
 
 from io import StringIO
 from codecs import getincrementalencoder
@@ -159,9 +159,10 @@ class JSONEncoder(json.JSONEncoder):  # pylint: disable=missing-class-docstring
         return super().default(o)
 
 
-def get_json_response(sq: "SearchQuery", rc: "ResultContainer") -> str:
-    """Returns the JSON string of the results to a query (``application/json``)"""
-    data = {
+def get_json_data(sq: "SearchQuery", rc: "ResultContainer") -> dict[str, Any]:
+    """Returns the results to a query, the data of the :py:obj:`JSON response
+    <get_json_response>`"""
+    return {
         'query': sq.query,
         'results': [_.as_dict() for _ in rc.get_ordered_results()],
         'answers': [_.as_dict() for _ in rc.answers],
@@ -170,10 +171,39 @@ def get_json_response(sq: "SearchQuery", rc: "ResultContainer") -> str:
         'suggestions': list(rc.suggestions),
         'unresponsive_engines': get_translated_errors(rc.unresponsive_engines),
     }
-    response = json.dumps(data, cls=JSONEncoder)
+
+
+def get_json_response(sq: "SearchQuery", rc: "ResultContainer") -> str:
+    """Returns the JSON string of the results to a query (``application/json``)"""
+    response = json.dumps(get_json_data(sq, rc), cls=JSONEncoder)
     return response
 
 
+def get_ndjson_engine_line(engine_name: str | None, added: dict[str, list[Any]]) -> str:
+    """Returns the line of a :ref:`ndjson <search API>` stream with the results
+    that have been added by engine ``engine_name`` (see
+    :py:obj:`ResultContainer.on_extend <searx.results.ResultContainer.on_extend>`)."""
+    data = {
+        'type': 'engine',
+        'engine': engine_name,
+        'results': [_.as_dict() for _ in added.get('results', [])],
+        'answers': [_.as_dict() for _ in added.get('answers', [])],
+        'infoboxes': added.get('infoboxes', []),
+        'suggestions': added.get('suggestions', []),
+        'corrections': added.get('corrections', []),
+    }
+    return json.dumps(data, cls=JSONEncoder) + "\n"
+
+
+def get_ndjson_final_line(sq: "SearchQuery", rc: "ResultContainer") -> str:
+    """Returns the last line of a :ref:`ndjson <search API>` stream, the
+    (ranked) results of the :py:obj:`JSON response <get_json_response>`."""
+    data = {'type': 'final', **get_json_data(sq, rc)}
+    if rc.redirect_url:
+        data['redirect_url'] = rc.redirect_url
+    return json.dumps(data, cls=JSONEncoder) + "\n"
+
+
 def get_themes(templates_path):
     """Returns available themes list."""
     return os.listdir(templates_path)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Benchmark of :py:obj:`searx.botdetection.ip_limit.filter_request`.
+
+Compares the throughput (requests/sec) and the round trips to the valkey DB of
+the :py:obj:`FILTER_REQUEST <searx.botdetection.ip_limit.FILTER_REQUEST>`
+script with the previous implementation, which called one script per sliding
+window and a ``GET`` / ``SET`` for the ping of the link_token method::
+
+  $ python searxng_extra/benchmarks/bench_ip_limit.py [rounds] [valkey-url]
+
+Without a ``valkey-url`` a local stand-in of the valkey DB is used (fakeredis_
+with lupa_, both are not a requirement of SearXNG and have to be installed).
+To take the network into account, each round trip to the stand-in is delayed
+by :py:obj:`RTT`.
+
+.. _fakeredis: https://pypi.org/project/fakeredis/
+.. _lupa: https://pypi.org/project/lupa/
+"""
+# pylint: disable=invalid-name,import-outside-toplevel
+
+import ipaddress
+import itertools
+import sys
+import time
+from timeit import default_timer
+
+import flask
+import valkey
+
+import searx
+from searx.botdetection import config, ip_limit, link_token, valkeydb
+from searx.limiter import LIMITER_CFG_SCHEMA
+from searx.valkeylib import incr_sliding_window, drop_counter
+
+RTT = 0.0002
+"""Delay (sec) of a round trip to the local stand-in of the valkey DB."""
+
+ROUND_TRIPS = 0
+
+app = flask.Flask(__name__)
+app.add_url_rule('/', 'index', lambda: '')
+
+
+def filter_request_round_trips(network, request, cfg) -> bool:
+    """The algorithm of :py:obj:`ip_limit.filter_request` with one round trip
+    per sliding window (reference for the benchmark), returns ``True`` if the
+    request is blocked."""
+    # pylint: disable=too-many-return-statements
+    client = valkeydb.get_valkey_client()
+    if request.args.get('format', 'html') != 'html':
+        c = incr_sliding_window(client, 'ip_limit.API_WINDOW:' + network.compressed, ip_limit.API_WINDOW)
+        if c > ip_limit.API_MAX:
+            return True
+    if cfg['botdetection.ip_limit.link_token']:
+        if not link_token.is_suspicious(network, request, True):
+            drop_counter(client, 'ip_limit.SUSPICIOUS_IP_WINDOW' + network.compressed)
+            return False
+        name = 'ip_limit.SUSPICIOUS_IP_WINDOW' + network.compressed
+        if incr_sliding_window(client, name, ip_limit.SUSPICIOUS_IP_WINDOW) > ip_limit.SUSPICIOUS_IP_MAX:
+            return True
+        name = 'ip_limit.BURST_WINDOW' + network.compressed
+        if incr_sliding_window(client, name, ip_limit.BURST_WINDOW) > ip_limit.BURST_MAX_SUSPICIOUS:
+            return True
+        name = 'ip_limit.LONG_WINDOW' + network.compressed
+        return incr_sliding_window(client, name, ip_limit.LONG_WINDOW) > ip_limit.LONG_MAX_SUSPICIOUS
+    name = 'ip_limit.BURST_WINDOW' + network.compressed
+    if incr_sliding_window(client, name, ip_limit.BURST_WINDOW) > ip_limit.BURST_MAX:
+        return True
+    name = 'ip_limit.LONG_WINDOW' + network.compressed
+    return incr_sliding_window(client, name, ip_limit.LONG_WINDOW) > ip_limit.LONG_MAX
+
+
+def filter_request_script(network, request, cfg) -> bool:
+    return ip_limit.filter_request(network, request, cfg) is not None
+
+
+def stand_in_client() -> valkey.Valkey:
+    """Returns a fakeredis client, each round trip is delayed by
+    :py:obj:`RTT`."""
+    import fakeredis  # pyright: ignore[reportMissingImports]
+
+    class Client(fakeredis.FakeValkey):  # pylint: disable=too-many-ancestors,abstract-method
+        """Counts the round trips."""
+
+        def execute_command(self, *args, **options):
+            global ROUND_TRIPS  # pylint: disable=global-statement
+            ROUND_TRIPS += 1
+            time.sleep(RTT)
+            return super().execute_command(*args, **options)
+
+    return Client()
+
+
+def measure(func, cfg, fmt: str, rounds: int) -> tuple[float, float]:
+    """Returns requests/sec and round trips/request of ``func``, each request
+    comes from a new client network (the limits are not exceeded)."""
+    global ROUND_TRIPS  # pylint: disable=global-statement
+    ROUND_TRIPS = 0
+    client = valkeydb.get_valkey_client()
+    headers = {'User-Agent': 'bench', 'Accept-Language': 'en'}
+    with app.test_request_context('/search', query_string={'format': fmt}, headers=headers):
+        networks = [ipaddress.ip_network(f"10.{i >> 8 & 255}.{i & 255}.1/32") for i in range(rounds)]
+        for network in networks[::2]:
+            # half of the clients have sent a ping
+            client.set(link_token.get_ping_key(network, flask.request), 1, ex=60)
+        round_trips = ROUND_TRIPS
+        start = default_timer()
+        for network in networks:
+            func(network, flask.request, cfg)
+        duration = default_timer() - start
+    return rounds / duration, (ROUND_TRIPS - round_trips) / rounds
+
+
+def main(rounds: int = 1000, valkey_url: str | None = None):
+    client = valkey.Valkey.from_url(valkey_url) if valkey_url else stand_in_client()
+    valkeydb.set_valkey_client(client)
+    cfg = config.Config(cfg_schema=config.toml_load(LIMITER_CFG_SCHEMA), deprecated={})
+
+    print(f"valkey: {valkey_url or f'stand-in (RTT {RTT * 1000:.1f}ms)'} / rounds: {rounds}")
+    for use_link_token, fmt in itertools.product([False, True], ['html', 'json']):
+        cfg.set('botdetection.ip_limit.link_token', use_link_token)
+        print(f"link_token: {use_link_token!s:5} / format: {fmt}")
+        results = []
+        for name, func in [("round trips", filter_request_round_trips), ("script", filter_request_script)]:
+            client.flushdb()
+            results.append(measure(func, cfg, fmt, rounds))
+            req_sec, trips = results[-1]
+            print(f"  {name:12}: {req_sec:8.0f} requests/sec  {trips:4.1f} round trips/request")
+        print(f"  speedup     : {results[1][0] / results[0][0]:8.1f}x")
+
+
+if __name__ == '__main__':
+    searx.init_settings()
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000, sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Load test of the memory the sliding windows of
+:py:obj:`searx.botdetection.ip_limit` require in the valkey DB.
+
+Sends ``requests`` requests from ``networks`` (client) networks through
+:py:obj:`ip_limit.filter_request <searx.botdetection.ip_limit.filter_request>`,
+once with the sliding window *log* and once with the *approximate* sliding
+windows (``[botdetection.ip_limit] sliding_window``) and reports the memory of
+the counters after the requests (by default 1M requests)::
+
+  $ python -m searxng_extra.benchmarks.bench_ip_limit_memory [requests] [networks] [valkey-url]
+
+The memory is measured by MEMORY_USAGE_ of the counter keys, this requires a
+``valkey-url`` (the DB is flushed!).  Without a ``valkey-url`` a local stand-in
+of the valkey DB is used (see :py:obj:`bench_ip_limit
+<searxng_extra.benchmarks.bench_ip_limit>`), the stand-in can't measure the
+memory and only the number of stored entries (members of the sorted sets / fields
+of the hashes) is reported (and the stand-in needs a while for 1M requests).
+
+.. _MEMORY_USAGE: https://valkey.io/commands/memory-usage/
+"""
+# pylint: disable=invalid-name
+
+import ipaddress
+import sys
+
+import flask
+import valkey
+
+import searx
+from searx.botdetection import config, ip_limit, valkeydb
+from searx.limiter import LIMITER_CFG_SCHEMA
+from searxng_extra.benchmarks import bench_ip_limit
+
+app = flask.Flask(__name__)
+app.add_url_rule('/', 'index', lambda: '')
+
+
+def counter_memory(client: valkey.Valkey, measure_bytes: bool) -> tuple[int, int, int]:
+    """Returns the number of counter keys, the number of stored entries and the
+    memory (bytes) of the counters (``0`` if not ``measure_bytes``)."""
+    keys = entries = bytes_c = 0
+    for key in client.scan_iter(match="SearXNG_counter_*"):
+        keys += 1
+        if client.type(key) == b'zset':
+            entries += client.zcard(key)
+        else:
+            entries += client.hlen(key)
+        if measure_bytes:
+            bytes_c += client.memory_usage(key, samples=0) or 0
+    return keys, entries, bytes_c
+
+
+def load(cfg, requests: int, networks: int):
+    """Sends ``requests`` requests round robin from ``networks`` networks, every
+    second request is an API request (``format=json``)."""
+    nets = [ipaddress.ip_network(f"10.{i >> 8 & 255}.{i & 255}.1/32") for i in range(networks)]
+    headers = {'User-Agent': 'bench', 'Accept-Language': 'en'}
+    for fmt in ['html', 'json']:
+        with app.test_request_context('/search', query_string={'format': fmt}, headers=headers):
+            for i in range(requests // 2):
+                ip_limit.filter_request(nets[i % networks], flask.request, cfg)
+
+
+def main(requests: int = 1_000_000, networks: int = 10, valkey_url: str | None = None):
+    # the round trips are not delayed, only the memory is of interest
+    bench_ip_limit.RTT = 0
+    client = valkey.Valkey.from_url(valkey_url) if valkey_url else bench_ip_limit.stand_in_client()
+    valkeydb.set_valkey_client(client)
+    cfg = config.Config(cfg_schema=config.toml_load(LIMITER_CFG_SCHEMA), deprecated={})
+
+    print(f"valkey: {valkey_url or 'stand-in'} / requests: {requests} / networks: {networks}")
+    for sliding_window in ["log", "approximate"]:
+        cfg.set('botdetection.ip_limit.sliding_window', sliding_window)
+        client.flushdb()
+        load(cfg, requests, networks)
+        keys, entries, bytes_c = counter_memory(client, bool(valkey_url))
+        print(f"  {sliding_window:12}: {keys:4} keys  {entries:10} entries", end="")
+        if valkey_url:
+            print(f"  {bytes_c / 1024:10.1f} KiB ({bytes_c / keys:.0f} bytes / key)")
+        else:
+            print()
+
+
+if __name__ == '__main__':
+    searx.init_settings()
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10,
+        sys.argv[3] if len(sys.argv) > 3 else None,
+    )
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Benchmark of :py:obj:`TrackerPatternsDB.clean_url
+<searx.data.tracker_patterns.TrackerPatternsDB.clean_url>`.
+
+Compares the throughput (URLs/sec) of the precompiled rule set with the
+previous implementation, which iterated over the rules from the SQLite cache
+and matched the uncompiled patterns for every URL::
+
+  $ python searxng_extra/benchmarks/bench_tracker_patterns.py [rounds]
+
+The ClearURLs rules are taken from the data cache (they are fetched from
+ClearURLs if the cache is empty).
+"""
+# pylint: disable=invalid-name
+
+import re
+import sys
+from timeit import default_timer
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+import searx
+import searx.network
+from searx.data.tracker_patterns import TrackerPatternsDB
+
+URLS = [
+    "https://www.amazon.com/dp/B0C7JZ1ZZ?pf_rd_r=ABC&pf_rd_p=123&ref_=pd_sl&keywords=foo",
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ&feature=share&si=abc",
+    "https://www.google.com/search?q=searxng&ei=abc&ved=xyz&sourceid=chrome",
+    "https://example.org/article?id=42&utm_source=newsletter&utm_medium=email",
+    "https://en.wikipedia.org/wiki/Metasearch_engine",
+    "https://github.com/searxng/searxng/issues?q=is%3Aopen",
+    "https://news.example.com/2024/01/01/story.html?fbclid=IwAR0abc",
+    "https://www.ebay.de/itm/123456?_trkparms=abc&_trksid=p2047675",
+    "https://stackoverflow.com/questions/123/how-to?noredirect=1&lq=1",
+    "https://docs.searxng.org/admin/settings/index.html",
+]
+
+
+def clean_url_uncompiled(db: TrackerPatternsDB, url: str) -> bool | str:
+    """The algorithm of :py:obj:`TrackerPatternsDB.clean_url` without
+    precompiled rules (reference for the benchmark)."""
+    new_url = url
+    parsed_new_url = urlparse(url=new_url)
+
+    for url_regexp, url_ignore, del_args in db.rules():
+        query_str: str = parsed_new_url.query
+        if not query_str:
+            break
+        if not re.match(url_regexp, new_url):
+            continue
+        if any(re.match(pattern, new_url) for pattern in url_ignore):
+            continue
+        query_args: list[tuple[str, str]] = list(parse_qsl(parsed_new_url.query))
+        if query_args:
+            for name, val in query_args.copy():
+                for pattern in del_args:
+                    if re.match(pattern, name):
+                        query_args.remove((name, val))
+                        break
+            parsed_new_url = parsed_new_url._replace(query=urlencode(query_args))
+            new_url = urlunparse(parsed_new_url)
+        else:
+            for pattern in del_args:
+                if re.match(pattern, query_str):
+                    parsed_new_url = parsed_new_url._replace(query="")
+                    new_url = urlunparse(parsed_new_url)
+                    break
+
+    if new_url != url:
+        return new_url
+    return True
+
+
+def measure(func, rounds: int) -> float:
+    """Returns URLs/sec of ``func`` applied to :py:obj:`URLS`."""
+    start = default_timer()
+    for _ in range(rounds):
+        for url in URLS:
+            func(url)
+    return rounds * len(URLS) / (default_timer() - start)
+
+
+def main(rounds: int = 100):
+    db = TrackerPatternsDB()
+    rules = list(db.rules())
+    if not rules:
+        print("no tracker patterns in the cache (ClearURLs not reachable?)")
+        sys.exit(1)
+
+    for url in URLS:
+        if db.clean_url(url) != clean_url_uncompiled(db, url):
+            print(f"different results for URL: {url}")
+            sys.exit(1)
+
+    print(f"rules: {len(rules)} / URLs: {len(URLS)} / rounds: {rounds}")
+    before = measure(lambda url: clean_url_uncompiled(db, url), rounds)
+    after = measure(db.clean_url, rounds)
+    print(f"uncompiled rules : {before:10.0f} URLs/sec")
+    print(f"compiled rules   : {after:10.0f} URLs/sec ({after / before:.1f}x)")
+
+
+if __name__ == '__main__':
+    searx.init_settings()
+    searx.network.initialize()
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
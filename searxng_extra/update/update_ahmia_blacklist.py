@@ -2,8 +2,9 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 """This script saves `Ahmia's blacklist`_ for onion sites.
 
-Output file: :origin:`searx/data/ahmia_blacklist.txt` (:origin:`CI Update data
-...  <.github/workflows/data-update.yml>`).
+Output file: :origin:`searx/data/ahmia_blacklist.bin` (:origin:`CI Update data
+...  <.github/workflows/data-update.yml>`), the format of the file is described in
+:origin:`searx/data/ahmia_blacklist.py`.
 
 .. _Ahmia's blacklist: https://ahmia.fi/blacklist/
 
@@ -12,9 +13,10 @@ Output file: :origin:`searx/data/ahmia_blacklist.txt` (:origin:`CI Update data
 
 import requests
 from searx.data import data_dir
+from searx.data.ahmia_blacklist import AhmiaBlacklist
 from searx.utils import searxng_useragent
 
-DATA_FILE = data_dir / 'ahmia_blacklist.txt'
+DATA_FILE = data_dir / 'ahmia_blacklist.bin'
 URL = 'https://ahmia.fi/blacklist/banned/'
 
 
@@ -27,7 +29,4 @@ def fetch_ahmia_blacklist():
 
 
 if __name__ == '__main__':
-    blacklist = fetch_ahmia_blacklist()
-    blacklist.sort()
-    with DATA_FILE.open("w", encoding='utf-8') as f:
-        f.write('\n'.join(blacklist))
+    AhmiaBlacklist.dump(fetch_ahmia_blacklist(), DATA_FILE)
@@ -55,7 +55,8 @@ setup(
             '*.toml',
             '*.msg',
             'data/*.json',
-            'data/*.txt',
+            'data/*.bin',
+            'data/*.snapshot',
             'data/*.ftz',
             'favicons/*.toml',
             'infopage/**',
@@ -2,8 +2,9 @@
 # pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
 
 import httpx
-from mock import patch
+from mock import Mock, patch
 
+from searx.network import network as network_module
 from searx.network.network import Network, NETWORKS
 from tests import SearxTestCase
 
@@ -119,6 +120,54 @@ class TestNetwork(SearxTestCase):
             self.assertEqual(response.text, a_text)
             await network.aclose()
 
+    def test_client_count(self):
+        def client_count(**kwargs) -> int:
+            return network_module.NetworkWarmup(Network(**kwargs)).client_count()
+
+        self.assertEqual(client_count(), 1)
+        self.assertEqual(client_count(local_addresses=['192.168.0.1', '192.168.0.2']), 2)
+        self.assertEqual(client_count(local_addresses="fe80::/64"), network_module.WARMUP_MAX_CLIENTS)
+        proxies = {'http': ['http://p1', 'http://p2'], 'https': ['http://p1', 'http://p2', 'http://p3']}
+        self.assertEqual(client_count(proxies=proxies), 6)
+
+    def test_engine_base_url(self):
+        self.assertEqual(
+            network_module.engine_base_url(Mock(base_url='https://example.org/search?q={query}')),
+            'https://example.org/',
+        )
+        self.assertEqual(
+            network_module.engine_base_url(Mock(base_url=['http://a.example.org/x'])), 'http://a.example.org/'
+        )
+        self.assertIsNone(network_module.engine_base_url(Mock(base_url='https://{lang}.example.org/', search_url=None)))
+        self.assertIsNone(network_module.engine_base_url(Mock(base_url=None, search_url=None)))
+
+    async def test_warmup(self):
+        urls = []
+
+        async def head(_client, url, **kwargs):
+            await kwargs['extensions']['trace']('connection.start_tls.complete', {})
+            urls.append(url)
+            if 'fail' in url:
+                raise httpx.ConnectError('fail')
+            return httpx.Response(status_code=200)
+
+        with patch.object(httpx.AsyncClient, 'head', new=head):
+            n = Network(local_addresses=['192.168.0.1', '192.168.0.2'])
+            n.warmup_urls = ['https://example.org/', 'https://fail.example.org/']
+            warmup = network_module.NetworkWarmup(n)
+            self.assertEqual(await warmup.warmup(), 2)
+            self.assertEqual(len(urls), 4)
+            self.assertEqual(len(n._clients), 2)  # pylint: disable=protected-access
+
+            # keepalive pings the hosts with the existing clients
+            self.assertEqual(await warmup.keepalive(), 2)
+            self.assertEqual(len(n._clients), 2)  # pylint: disable=protected-access
+
+            stats = network_module.network_stats(n)
+            self.assertEqual(stats['tls_handshakes'], 8)
+            self.assertEqual(stats['connections'], 0)
+            await n.aclose()
+
 
 class TestNetworkRequestRetries(SearxTestCase):
 
@@ -1,9 +1,12 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
 
+from unittest import mock
+
 from searx.search.models import EngineRef, SearchQuery
 from searx.search.processors import online
 from searx import engines
+from searx.enginelib import ENGINES_CACHE
 
 from tests import SearxTestCase
 
@@ -36,3 +39,49 @@ class TestOnlineProcessor(SearxTestCase):
         search_query = SearchQuery('test', [EngineRef(TEST_ENGINE_NAME, 'general')], 'all', 0, 1, None, None, None)
         params = self._get_params(online_processor, search_query, 'general')
         self.assertIn('User-Agent', params['headers'])
+
+    def test_response_cache(self):
+        engine = engines.engines[TEST_ENGINE_NAME]
+        online_processor = online.OnlineProcessor(engine)
+        calls = []
+
+        def request(query, params):
+            params['url'] = 'https://example.org/?q=' + query
+
+        def response(resp):
+            calls.append(resp)
+            return [{'url': 'https://example.org/1', 'title': 'one', 'content': ''}]
+
+        for name, func in (('request', request), ('response', response)):
+            setattr(engine, name, func)
+            self.addCleanup(delattr, engine, name)
+        self.setattr4test(engine, 'cache_ttl', 60)
+        self.setattr4test(online_processor, '_send_http_request', lambda params: mock.Mock())
+        self.setattr4test(online_processor, '_response_cache', mock.Mock())
+        cache: dict = {}
+        online_processor.response_cache.get.side_effect = cache.get
+        online_processor.response_cache.set.side_effect = lambda key, value, expire: cache.update({key: value})
+        online_processor.response_cache.secret_hash.side_effect = str
+
+        search_query = SearchQuery('test', [EngineRef(TEST_ENGINE_NAME, 'general')], 'all', 0, 1, None, None, None)
+        params = self._get_params(online_processor, search_query, 'general')
+        first = online_processor._search_basic('test', params)  # pylint: disable=protected-access
+        params = self._get_params(online_processor, search_query, 'general')
+        second = online_processor._search_basic('test', params)  # pylint: disable=protected-access
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(first, second)
+
+        search_query = SearchQuery('other', [EngineRef(TEST_ENGINE_NAME, 'general')], 'all', 0, 1, None, None, None)
+        params = self._get_params(online_processor, search_query, 'general')
+        online_processor._search_basic('other', params)  # pylint: disable=protected-access
+        self.assertEqual(len(calls), 2)
+
+    def test_response_cache_separated(self):
+        engine = engines.engines[TEST_ENGINE_NAME]
+        online_processor = online.OnlineProcessor(engine)
+        self.assertIs(online_processor.response_cache.cache, online.get_response_cache())
+        self.assertIsNot(online_processor.response_cache.cache, ENGINES_CACHE)
+        cfg = online_processor.response_cache.cache.cfg
+        self.assertEqual(cfg.MEMORY_CACHE_SIZE, 0)
+        self.assertEqual(cfg.MAX_VALUE_LEN, 1024 * 1024)
@@ -0,0 +1,43 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import pathlib
+import tempfile
+from hashlib import md5
+
+from searx.data.ahmia_blacklist import AhmiaBlacklist
+from tests import SearxTestCase
+
+ONIONS = ["foo.onion", "bar.onion", "baz.onion", "qux.onion", "quux.onion"]
+
+
+class AhmiaBlacklistTest(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp_dir.cleanup)
+        self.file_name = pathlib.Path(tmp_dir.name) / "ahmia_blacklist.bin"
+
+    def test_lookup(self):
+        # duplicates are removed
+        digests = [md5(onion.encode()).hexdigest() for onion in ONIONS + ONIONS[:2]]
+        AhmiaBlacklist.dump(digests, self.file_name)
+        blacklist = AhmiaBlacklist.from_file(self.file_name)
+
+        self.assertEqual(len(blacklist), len(ONIONS))
+        for onion in ONIONS:
+            self.assertIn(md5(onion.encode()).digest(), blacklist)
+            self.assertIn(md5(onion.encode()).hexdigest(), blacklist)
+        self.assertNotIn(md5(b"example.onion").digest(), blacklist)
+        self.assertNotIn("not a md5 value", blacklist)
+
+    def test_empty(self):
+        AhmiaBlacklist.dump([], self.file_name)
+        blacklist = AhmiaBlacklist.from_file(self.file_name)
+        self.assertEqual(len(blacklist), 0)
+        self.assertNotIn(md5(b"foo.onion").digest(), blacklist)
+
+    def test_invalid_data(self):
+        with self.assertRaises(ValueError):
+            AhmiaBlacklist(b"\x00" * 17)
@@ -0,0 +1,147 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import ipaddress
+import pathlib
+import tempfile
+from unittest.mock import patch
+
+import fakeredis
+import flask
+
+import searx.limiter
+import searx.valkeylib
+from searx.botdetection import config, ip_limit, link_token
+from searx.limiter import LIMITER_CFG_SCHEMA
+from searx.valkeylib import counter_key
+from tests import SearxTestCase
+
+
+class FakeScript:  # pylint: disable=too-few-public-methods
+    """Records the calls of the :py:obj:`ip_limit.FILTER_REQUEST` script and
+    returns the ``verdict``."""
+
+    def __init__(self, verdict: int = 0, suspicious: int = 0):
+        self.result = [verdict, suspicious]
+        self.calls: list[tuple[list[str], list[int]]] = []
+
+    def __call__(self, keys, args):
+        self.calls.append((keys, args))
+        return self.result
+
+
+class IPLimitTest(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cfg = config.Config(cfg_schema=config.toml_load(LIMITER_CFG_SCHEMA), deprecated={})
+        self.network = ipaddress.ip_network("192.0.2.1/32")
+        self.setattr4test(ip_limit.valkeydb, "get_valkey_client", lambda: None)
+
+    def filter_request(self, script: FakeScript, **query):
+        with patch.object(ip_limit, "lua_script_storage", return_value=script):
+            with self.app.test_request_context("/search", query_string=query, headers={"User-Agent": "test"}):
+                return ip_limit.filter_request(self.network, flask.request, self.cfg)
+
+    def test_one_script_call(self):
+        script = FakeScript()
+        self.assertIsNone(self.filter_request(script, format="json"))
+        self.assertEqual(len(script.calls), 1)
+        keys, args = script.calls[0]
+        self.assertEqual(keys[0], counter_key("ip_limit.API_WINDOW:192.0.2.1/32"))
+        self.assertEqual(keys[1], link_token.PING_KEY)
+        self.assertEqual(keys[3], counter_key("ip_limit.BURST_WINDOW192.0.2.1/32"))
+        self.assertEqual(args[:2], [1, 0])
+
+        self.cfg.set("botdetection.ip_limit.link_token", True)
+        self.filter_request(script)
+        keys, args = script.calls[1]
+        self.assertTrue(keys[1].startswith(link_token.PING_KEY + "["))
+        self.assertEqual(args[:3], [0, 1, link_token.PING_LIVE_TIME])
+
+    def test_verdict(self):
+        for verdict in [1, 3, 4, 5, 6]:
+            self.assertEqual(self.filter_request(FakeScript(verdict)).status_code, 429)
+        response = self.filter_request(FakeScript(2, 1))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.headers["Cache-Control"], "no-store, max-age=0")
+
+    def test_approximate_sliding_window(self):
+        script = FakeScript()
+        self.filter_request(script)
+        self.cfg.set("botdetection.ip_limit.sliding_window", "approximate")
+        self.filter_request(script)
+        log_keys, log_args = script.calls[0]
+        keys, args = script.calls[1]
+        self.assertEqual((log_args[-1], args[-1]), (0, 1))
+        self.assertEqual(keys[3], counter_key("ip_limit.approximate.BURST_WINDOW192.0.2.1/32"))
+        # the counters of both implementations are not mixed up
+        self.assertTrue(set(log_keys).isdisjoint(set(keys) - {link_token.PING_KEY}))
+
+
+class IPLimitValkeyTest(SearxTestCase):
+    """Runs the :py:obj:`ip_limit.FILTER_REQUEST` script in a fake valkey DB."""
+
+    def setUp(self):
+        super().setUp()
+        self.cfg = config.Config(cfg_schema=config.toml_load(LIMITER_CFG_SCHEMA), deprecated={})
+        self.network = ipaddress.ip_network("192.0.2.1/32")
+        self.client = fakeredis.FakeRedis()
+        self.setattr4test(ip_limit.valkeydb, "get_valkey_client", lambda: self.client)
+        self.setattr4test(searx.valkeylib, "LUA_SCRIPT_STORAGE", {})
+
+    def filter_request(self, **query):
+        with self.app.test_request_context("/search", query_string=query, headers={"User-Agent": "test"}):
+            return ip_limit.filter_request(self.network, flask.request, self.cfg)
+
+    def assert_blocked(self, **query):
+        response = self.filter_request(**query)
+        assert response is not None
+        self.assertEqual(response.status_code, 429)
+
+    def assert_burst_limit(self, prefix: str, key_type: bytes):
+        for _ in range(ip_limit.BURST_MAX):
+            self.assertIsNone(self.filter_request())
+        self.assert_blocked()
+
+        key = counter_key(prefix + "BURST_WINDOW192.0.2.1/32")
+        self.assertEqual(self.client.type(key), key_type)
+        self.assertGreater(self.client.ttl(key), 0)
+
+        # API requests are counted in their own window
+        for _ in range(ip_limit.API_MAX):
+            self.filter_request(format="json")
+        self.assert_blocked(format="json")
+
+    def test_log(self):
+        self.assert_burst_limit("ip_limit.", b"zset")
+
+    def test_approximate(self):
+        self.cfg.set("botdetection.ip_limit.sliding_window", "approximate")
+        self.assert_burst_limit("ip_limit.approximate.", b"hash")
+
+    def test_link_token(self):
+        self.cfg.set("botdetection.ip_limit.link_token", True)
+        for sliding_window in ip_limit.SLIDING_WINDOWS:
+            self.client.flushall()
+            self.cfg.set("botdetection.ip_limit.sliding_window", sliding_window)
+            for _ in range(ip_limit.BURST_MAX_SUSPICIOUS):
+                self.assertIsNone(self.filter_request())
+            self.assert_blocked()
+
+
+class LimiterCfgTest(SearxTestCase):
+
+    def test_sliding_window(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cfg_file = pathlib.Path(tmp_dir) / "limiter.toml"
+            self.setattr4test(searx.limiter, "CFG", None)
+            with patch("searx.settings_loader.get_user_cfg_folder", return_value=pathlib.Path(tmp_dir)):
+                cfg_file.write_text('[botdetection.ip_limit]\nsliding_window = "approximate"\n')
+                self.assertEqual(searx.limiter.get_cfg()["botdetection.ip_limit.sliding_window"], "approximate")
+
+                self.setattr4test(searx.limiter, "CFG", None)
+                cfg_file.write_text('[botdetection.ip_limit]\nsliding_window = "fixed"\n')
+                with self.assertRaises(ValueError):
+                    searx.limiter.get_cfg()
+                self.assertIsNone(searx.limiter.CFG)
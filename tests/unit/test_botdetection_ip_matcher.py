@@ -0,0 +1,44 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+from ipaddress import ip_address, ip_network
+
+from searx.botdetection import config, ip_lists
+from searx.botdetection.ip_matcher import IPMatcher
+from searx.limiter import LIMITER_CFG_SCHEMA
+from tests import SearxTestCase
+
+
+class IPMatcherTest(SearxTestCase):
+
+    def test_longest_prefix_match(self):
+        matcher = IPMatcher(['10.0.0.0/8', '10.1.0.0/16', '10.1.2.3', 'fd00::/8', 'fd00:1::/32'])
+        self.assertEqual(len(matcher), 5)
+        self.assertEqual(matcher.match(ip_address('10.1.2.3')), ip_network('10.1.2.3/32'))
+        self.assertEqual(matcher.match(ip_address('10.1.2.4')), ip_network('10.1.0.0/16'))
+        self.assertEqual(matcher.match(ip_address('10.2.0.1')), ip_network('10.0.0.0/8'))
+        self.assertEqual(matcher.match(ip_address('fd00:1::1')), ip_network('fd00:1::/32'))
+        self.assertEqual(matcher.match(ip_address('fd00:2::1')), ip_network('fd00::/8'))
+        self.assertIsNone(matcher.match(ip_address('11.0.0.1')))
+        self.assertNotIn(ip_address('::ffff:10.1.2.3'), matcher)
+        self.assertNotIn(ip_address('10.1.2.3'), IPMatcher())
+
+    def test_invalid(self):
+        with self.assertLogs("searx.botdetection.ip_matcher", level="ERROR") as ctx:
+            matcher = IPMatcher(['257.1.1.1', '192.0.2.0/24'], 'block_ip')
+        self.assertEqual(ctx.output, ["ERROR:searx.botdetection.ip_matcher:invalid IP 257.1.1.1 in block_ip"])
+        self.assertEqual(len(matcher), 1)
+
+    def test_config_compiled(self):
+        cfg = config.Config(cfg_schema=config.toml_load(LIMITER_CFG_SCHEMA), deprecated={})
+        name = 'botdetection.ip_lists.block_ip'
+        matcher = cfg.compiled(name, IPMatcher)
+        self.assertIs(cfg.compiled(name, IPMatcher), matcher)
+        self.assertFalse(ip_lists.block_ip(ip_address('192.0.2.1'), cfg)[0])
+
+        # changing the config compiles a new matcher
+        cfg.set(name, ['192.0.2.0/24'])
+        self.assertIsNot(cfg.compiled(name, IPMatcher), matcher)
+        self.assertTrue(ip_lists.block_ip(ip_address('192.0.2.1'), cfg)[0])
+        cfg.update({'botdetection': {'ip_lists': {'block_ip': ['198.51.100.0/24']}}})
+        self.assertTrue(ip_lists.block_ip(ip_address('198.51.100.1'), cfg)[0])
@@ -0,0 +1,92 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import ipaddress
+import time
+
+import flask
+from mock import Mock
+
+from searx.botdetection import config, link_token
+from searx.botdetection._helpers import TTLCache
+from searx.limiter import LIMITER_CFG_SCHEMA
+from tests import SearxTestCase
+
+
+class TTLCacheTest(SearxTestCase):
+
+    def test_ttl_and_lru(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        # "b" is the least recently used item
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+
+        cache.set("a", 1, ttl=0)
+        time.sleep(0.01)
+        self.assertIsNone(cache.get("a"))
+        cache.delete("c")
+        self.assertEqual(len(cache), 0)
+
+
+class LinkTokenCacheTest(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client = Mock()
+        self.client.get.return_value = b"1"
+        self.client.pipeline.return_value.execute.return_value = [b"token", 300]
+        self.setattr4test(link_token.valkeydb, "get_valkey_client", lambda: self.client)
+        cfg = config.Config(cfg_schema=config.toml_load(LIMITER_CFG_SCHEMA), deprecated={})
+        self.setattr4test(link_token.config, "get_global_cfg", lambda: cfg)
+        link_token.clear_cache()
+        self.addCleanup(link_token.clear_cache)
+
+    def test_token(self):
+        self.assertEqual(link_token.get_token(), "token")
+        self.assertEqual(link_token.get_token(), "token")
+        self.assertEqual(self.client.pipeline.return_value.execute.call_count, 1)
+
+        self.assertTrue(link_token.token_is_valid("token"))
+        self.assertEqual(self.client.pipeline.return_value.execute.call_count, 1)
+
+        # a token that does not match the cached token is checked against the DB
+        self.client.pipeline.return_value.execute.return_value = [b"new-token", 600]
+        self.assertTrue(link_token.token_is_valid("new-token"))
+        self.assertEqual(link_token.get_token(), "new-token")
+
+    def test_token_race(self):
+        execute = self.client.pipeline.return_value.execute
+        # no token in the DB and another worker stores its token first
+        execute.side_effect = [[None, -2], [b"winner", 599]]
+        self.client.set.return_value = None
+        self.assertEqual(link_token.get_token(), "winner")
+        self.assertEqual(self.client.set.call_args.kwargs, {"ex": link_token.TOKEN_LIVE_TIME, "nx": True})
+        self.assertEqual(link_token.get_token(), "winner")
+        self.assertEqual(execute.call_count, 2)
+
+        link_token.clear_cache()
+        execute.side_effect = [[None, -2]]
+        self.client.set.return_value = True
+        token = link_token.get_token()
+        self.assertEqual(len(token), 16)
+        self.assertEqual(self.client.set.call_args.args, (link_token.TOKEN_KEY, token))
+        self.assertEqual(link_token.get_token(), token)
+
+    def test_ping(self):
+        network = ipaddress.ip_network("192.0.2.1/32")
+        headers = {"User-Agent": "test"}
+        with self.app.test_request_context("/client.css", headers=headers, environ_base={"REMOTE_ADDR": "192.0.2.1"}):
+            link_token.ping(flask.request, "token")
+            link_token.ping(flask.request, "token")
+            self.assertEqual(self.client.set.call_count, 1)
+            # the ping is stored by this worker: no round trip to the DB
+            self.assertFalse(link_token.is_suspicious(network, flask.request, True))
+            self.client.get.assert_not_called()
+
+            link_token.clear_cache()
+            self.client.get.return_value = None
+            self.assertTrue(link_token.is_suspicious(network, flask.request, True))
@@ -0,0 +1,272 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import fnmatch
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+from searx.cache import ExpireCache, ExpireCacheCfg, ExpireCacheSQLite, ExpireCacheValkey
+from tests import SearxTestCase
+
+
+class FakePipeline:
+
+    def __init__(self, db: "FakeValkey"):
+        self.db = db
+        self.commands: list = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((getattr(self.db, name), args, kwargs))
+
+    def execute(self):
+        return [func(*args, **kwargs) for func, args, kwargs in self.commands]
+
+
+class FakeValkey:
+    """Keys of a Valkey DB, only the commands used by
+    :py:obj:`ExpireCacheValkey` are implemented."""
+
+    def __init__(self):
+        self.data: dict[str, tuple[bytes, float | None]] = {}
+
+    def pipeline(self, transaction=True):  # pylint: disable=unused-argument
+        return FakePipeline(self)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = (value if isinstance(value, bytes) else str(value).encode(), time.time() + ex if ex else None)
+        return True
+
+    def get(self, key):
+        value, expire = self.data.get(key, (None, None))
+        if expire is not None and expire < time.time():
+            return None
+        return value
+
+    def getset(self, key, value):
+        old = self.data.get(key, (None, None))[0]
+        self.set(key, value)
+        return old
+
+    def ttl(self, key):
+        expire = self.data[key][1]
+        return int(expire - time.time()) if expire else -1
+
+    def unlink(self, key):
+        return int(self.data.pop(key, None) is not None)
+
+    def scan_iter(self, match, count=None):  # pylint: disable=unused-argument
+        return [k.encode() for k in list(self.data) if fnmatch.fnmatchcase(k, match)]
+
+
+class ExpireCacheSQLiteTest(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp_dir.cleanup)
+        self.db_url = tmp_dir.name + "/cache.db"
+
+    def new_cache(self, **kwargs) -> ExpireCacheSQLite:
+        return ExpireCacheSQLite(ExpireCacheCfg(name="TEST_CACHE", db_url=self.db_url, **kwargs))
+
+    def test_get_set(self):
+        cache = self.new_cache()
+        self.assertTrue(cache.set("foo", [1, 2], expire=60))
+        self.assertEqual(cache.get("foo"), [1, 2])
+        self.assertEqual(cache.get("bar", default="x"), "x")
+        self.assertEqual(cache.counters.get, 2)
+        self.assertEqual(cache.counters.hit, 1)
+        self.assertEqual(cache.counters.memory_hit, 0)
+
+    def test_memory_cache(self):
+        cache = self.new_cache(MEMORY_CACHE_SIZE=2)
+        cache.set("a", "A", expire=60, ctx="ctx")
+        cache.set("b", "B", expire=60, ctx="ctx")
+
+        with patch.object(ExpireCacheSQLite, "table_names", property(lambda self: self.fail("DB query"))):
+            self.assertEqual(cache.get("a", ctx="ctx"), "A")
+            self.assertEqual(cache.get("b", ctx="ctx"), "B")
+
+        # "a" is the least recently used value
+        cache.set("c", "C", expire=60, ctx="ctx")
+        self.assertEqual(list(cache._memory), [("ctx", "b"), ("ctx", "c")])  # pylint: disable=protected-access
+        self.assertEqual(cache.get("a", ctx="ctx"), "A")
+        self.assertEqual(cache.counters.memory_hit, 2)
+        self.assertEqual(cache.counters.hit, 3)
+
+        # the values in the LRU cache are copies
+        cache.set("list", [1], expire=60)
+        cache.get("list").append(2)
+        self.assertEqual(cache.get("list"), [1])
+
+    def test_memory_cache_expire(self):
+        cache = self.new_cache(MEMORY_CACHE_SIZE=10)
+        cache.set("a", "A", expire=60)
+        with patch("searx.cache.time.time", return_value=time.time() + 120):
+            self.assertIsNone(cache.get("a"))
+
+    def test_setmany(self):
+        cache = self.new_cache(MEMORY_CACHE_SIZE=10, WRITE_BEHIND_DELAY=60)
+        cache.set("a", "old", expire=60)
+        cache.setmany([("a", "new", 60)])
+        self.assertEqual(cache.get("a"), "new")
+        self.assertEqual(cache.flush(), 0)
+        self.assertEqual(self.new_cache().get("a"), "new")
+
+    def test_setmany_while_flushing(self):
+        cache = self.new_cache(MEMORY_CACHE_SIZE=10, WRITE_BEHIND_DELAY=60)
+        cache.set("a", "old", expire=60)
+
+        write = cache._write  # pylint: disable=protected-access
+        flushing = threading.Event()
+
+        def slow_write(ctx, sql_rows):
+            if not flushing.is_set():
+                flushing.set()
+                time.sleep(0.2)
+            write(ctx, sql_rows)
+
+        with patch.object(cache, "_write", slow_write):
+            flush = threading.Thread(target=cache.flush)
+            flush.start()
+            flushing.wait()
+            cache.setmany([("a", "new", 60)])
+            flush.join()
+
+        self.assertEqual(cache.get("a"), "new")
+        self.assertEqual(self.new_cache().get("a"), "new")
+
+    def test_truncate_while_flushing(self):
+        cache = self.new_cache(MEMORY_CACHE_SIZE=10, WRITE_BEHIND_DELAY=60)
+        cache.set("a", "A", expire=60)
+
+        write = cache._write  # pylint: disable=protected-access
+        flushing = threading.Event()
+
+        def slow_write(ctx, sql_rows):
+            flushing.set()
+            time.sleep(0.2)
+            write(ctx, sql_rows)
+
+        with patch.object(cache, "_write", slow_write):
+            flush = threading.Thread(target=cache.flush)
+            flush.start()
+            flushing.wait()
+            cache.maintenance(force=True, truncate=True)
+            flush.join()
+
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNone(self.new_cache().get("a"))
+
+    def test_write_behind(self):
+        cache = self.new_cache(WRITE_BEHIND_DELAY=60, WRITE_BEHIND_BATCH=3)
+        cache.set("a", "A", expire=60)
+        cache.set("b", "B", expire=60, ctx="ctx")
+
+        # the values are not yet in the DB ..
+        other = self.new_cache()
+        self.assertIsNone(other.get("a"))
+        # .. but are returned by the cache that queued them
+        self.assertEqual(cache.get("a"), "A")
+        self.assertEqual(cache.get("b", ctx="ctx"), "B")
+
+        self.assertEqual(cache.flush(), 2)
+        self.assertEqual(other.get("a"), "A")
+        self.assertEqual(other.get("b", ctx="ctx"), "B")
+        self.assertEqual(cache.counters.flush_rows, 2)
+
+        # a full queue is written immediately
+        for key in ["c", "d", "e"]:
+            cache.set(key, key, expire=60)
+        self.assertEqual(other.get("e"), "e")
+        self.assertEqual(cache.counters.flush, 2)
+
+    def test_write_behind_timer(self):
+        cache = self.new_cache(WRITE_BEHIND_DELAY=0.05)
+        cache.set("a", "A", expire=60)
+        other = self.new_cache()
+        for _ in range(100):
+            if other.get("a") is not None:
+                break
+            time.sleep(0.05)
+        self.assertEqual(other.get("a"), "A")
+
+    def test_state(self):
+        cache = self.new_cache(WRITE_BEHIND_DELAY=60)
+        cache.set("a", "A", expire=60)
+        state = cache.state()
+        self.assertEqual([row[:2] for row in state.cached_items["TEST_CACHE"]], [("a", "A")])
+        self.assertEqual(state.counters.set, 1)
+        self.assertIn("hit rate", state.report())
+
+
+class ExpireCacheValkeyTest(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.db = FakeValkey()
+        patcher = patch("searx.valkeydb.client", lambda: self.db)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def new_cache(self, **kwargs) -> ExpireCache:
+        return ExpireCache.build_cache(ExpireCacheCfg(name="TEST_CACHE", backend="valkey", **kwargs))
+
+    def test_get_set(self):
+        cache = self.new_cache()
+        self.assertIsInstance(cache, ExpireCacheValkey)
+        self.assertTrue(cache.set("foo", [1, 2], expire=60))
+        self.assertTrue(cache.set("foo", "bar", expire=60, ctx="ctx"))
+        self.assertEqual(cache.get("foo"), [1, 2])
+        self.assertEqual(cache.get("foo", ctx="ctx"), "bar")
+        self.assertEqual(cache.get("bar", default="x"), "x")
+        self.assertIn(self.db.ttl("SearXNG_cache|TEST_CACHE|ctx|foo"), (59, 60))
+
+        # the values are shared by the caches connected to the DB
+        self.assertEqual(self.new_cache().get("foo"), [1, 2])
+
+        # values are removed by the DB when they expire
+        with patch("time.time", return_value=time.time() + 120):
+            self.assertIsNone(cache.get("foo"))
+
+    def test_setmany(self):
+        cache = self.new_cache(MAX_VALUE_LEN=100)
+        count = cache.setmany([("a", "A", None), ("b", "B" * 200, None), ("c", "C", 10)], ctx="ctx")
+        self.assertEqual(count, 2)
+        self.assertEqual(dict(cache.pairs("ctx")), {"a": "A", "c": "C"})
+
+    def test_hash_token(self):
+        cache = self.new_cache(password=b"foo")
+        cache.set("a", "A", expire=60)
+        self.assertEqual(self.new_cache(password=b"foo").get("a"), "A")
+
+        # the values can't be used with a new password
+        cache = self.new_cache(password=b"bar")
+        self.assertIsNone(cache.get("a"))
+        self.assertIn("SearXNG_cache|TEST_CACHE|hash_token", self.db.data)
+
+    def test_state(self):
+        cache = self.new_cache()
+        cache.set("a", "A", expire=60)
+        cache.set("b|c", "B", expire=60, ctx="ctx")
+        state = cache.state()
+        self.assertEqual(
+            {k: [r[:2] for r in v] for k, v in state.cached_items.items()},
+            {
+                "TEST_CACHE": [("a", "A")],
+                "ctx": [("b|c", "B")],
+            },
+        )
+
+        cache.maintenance(truncate=True)
+        self.assertEqual(list(self.db.data), ["SearXNG_cache|TEST_CACHE|hash_token"])
+
+    def test_fallback(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, patch("searx.valkeydb.client", lambda: None):
+            cache = self.new_cache(db_url=tmp_dir + "/cache.db")
+            cache.set("a", "A", expire=60)
+            self.assertEqual(cache.get("a"), "A")
+            self.assertIsInstance(cache.fallback, ExpireCacheSQLite)
+        self.assertEqual(self.db.data, {})
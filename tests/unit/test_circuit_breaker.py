@@ -0,0 +1,124 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+from unittest import mock
+
+from searx import settings
+from searx.search.circuit_breaker import CircuitBreaker
+
+from tests import SearxTestCase
+
+
+class CircuitBreakerTestCase(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        settings['search']['ban_time_on_fail'] = 5
+        settings['search']['max_ban_time_on_fail'] = 120
+        settings['search']['circuit_breaker'].update(
+            {
+                'window': 60,
+                'min_calls': 4,
+                'failure_rate': 0.5,
+                'slow_call_duration': 0,
+                'slow_call_rate': 0.8,
+                'probe_interval': 10,
+            }
+        )
+        self.now = 1000.0
+        patcher = mock.patch('searx.search.circuit_breaker.time.time', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker('foo')
+
+    def test_failure_rate(self):
+        self.breaker.record_success(0.5)
+        self.breaker.record_success(0.5)
+        self.breaker.record_failure('timeout')
+        self.assertTrue(self.breaker.allow_request())
+
+        # 2 of 4 requests have failed
+        self.breaker.record_failure('timeout')
+        self.assertEqual(self.breaker.state, 'open')
+        self.assertEqual(self.breaker.suspend_reason, 'timeout')
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_window(self):
+        self.breaker.record_failure('timeout')
+        self.breaker.record_failure('timeout')
+        self.now += 61
+        self.breaker.record_success(0.5)
+        self.breaker.record_success(0.5)
+        self.breaker.record_failure('timeout')
+        self.assertEqual(self.breaker.state, 'closed')
+
+    def test_suspended_time(self):
+        self.breaker.record_failure('CAPTCHA', suspended_time=3600)
+        self.assertFalse(self.breaker.allow_request())
+        self.now += 3599
+        self.assertFalse(self.breaker.allow_request())
+
+        # suspended time of zero: the failure is recorded in the window
+        breaker = CircuitBreaker('bar')
+        breaker.record_failure('too many requests', suspended_time=0)
+        self.assertTrue(breaker.allow_request())
+
+    def test_half_open(self):
+        self.breaker.record_failure('HTTP error', suspended_time=30)
+        self.now += 30
+
+        # one probe request per probe_interval
+        self.assertTrue(self.breaker.allow_request())
+        self.assertEqual(self.breaker.state, 'half_open')
+        self.assertFalse(self.breaker.allow_request())
+
+        self.breaker.record_success(0.5)
+        self.assertEqual(self.breaker.state, 'closed')
+        self.assertTrue(self.breaker.allow_request())
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_backoff(self):
+        for _ in range(4):
+            self.breaker.record_failure('timeout')
+        self.assertEqual(self.breaker.open_until, self.now + 5)
+
+        # the probe fails: the ban time doubles
+        self.now += 5
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_failure('timeout')
+        self.assertEqual(self.breaker.open_until, self.now + 10)
+
+    def test_late_responses(self):
+        for _ in range(4):
+            self.breaker.record_failure('timeout')
+        self.assertEqual(self.breaker.trips, 1)
+
+        # requests sent before the breaker opened neither close the breaker
+        # nor escalate the ban time
+        self.breaker.record_failure('timeout')
+        self.breaker.record_success(0.5)
+        self.assertEqual(self.breaker.state, 'open')
+        self.assertEqual(self.breaker.trips, 1)
+        self.assertEqual(self.breaker.open_until, self.now + 5)
+
+        # .. but a longer suspend time extends the open time
+        self.breaker.record_failure('CAPTCHA', suspended_time=60)
+        self.assertEqual(self.breaker.open_until, self.now + 60)
+        self.assertEqual(self.breaker.trips, 1)
+
+        # in half-open state, a late response doesn't close the breaker
+        self.now += 60
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_success(61)
+        self.assertEqual(self.breaker.state, 'half_open')
+        self.breaker.record_success(0.5)
+        self.assertEqual(self.breaker.state, 'closed')
+
+    def test_slow_calls(self):
+        settings['search']['circuit_breaker']['slow_call_duration'] = 2
+        for _ in range(3):
+            self.breaker.record_success(2.5)
+        self.assertEqual(self.breaker.state, 'closed')
+        self.breaker.record_success(3)
+        self.assertEqual(self.breaker.state, 'open')
+        self.assertEqual(self.breaker.suspend_reason, 'slow responses')
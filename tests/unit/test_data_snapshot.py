@@ -0,0 +1,133 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import copy
+import json
+import pathlib
+import pickle
+import shutil
+import tempfile
+from unittest import mock
+
+import searx.data
+from searx.data import snapshot
+from searx.enginelib import traits
+from searx.engines import annas_archive, zlibrary
+from tests import SearxTestCase
+
+DATA = {
+    "zzz": {"b": [1, 2.5, None, True, False], "a": "foo"},
+    "aaa": {"b": [1, 2.5, None, True, False], "a": "foo"},
+    "ümlaut": [{"nested": {"x": 2**70}}, "bar"],
+    "": -1,
+}
+
+
+class SnapshotTest(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp_dir.cleanup)
+        self.json_file = pathlib.Path(tmp_dir.name) / "data.json"
+        self.snapshot_file = pathlib.Path(tmp_dir.name) / "data.snapshot"
+        self.json_file.write_text(json.dumps(DATA), encoding="utf-8")
+
+    def test_lookup(self):
+        snapshot.dump(self.json_file, self.snapshot_file)
+        data = snapshot.load(self.snapshot_file, self.json_file)
+
+        self.assertIsInstance(data, snapshot.SnapshotMap)
+        self.assertEqual(len(data), len(DATA))
+        # the order of the JSON file is kept
+        self.assertEqual(list(data), list(DATA))
+        self.assertEqual(data["zzz"]["b"], [1, 2.5, None, True, False])
+        self.assertEqual(data["ümlaut"], [{"nested": {"x": 2**70}}, "bar"])
+        self.assertEqual(data.get(""), -1)
+        self.assertIn("aaa", data)
+        self.assertNotIn("bbb", data)
+        self.assertNotIn(1, data)
+        self.assertIsNone(data.get("bbb"))
+        with self.assertRaises(KeyError):
+            data["bbb"]  # pylint: disable=pointless-statement
+
+    def test_copy(self):
+        snapshot.dump(self.json_file, self.snapshot_file)
+        data = snapshot.load(self.snapshot_file, self.json_file)
+
+        self.assertEqual(data.to_dict(), DATA)
+        self.assertEqual(data, DATA)
+        self.assertIsInstance(data.copy(), dict)
+        self.assertEqual(copy.deepcopy(data), DATA)
+        self.assertEqual(pickle.loads(pickle.dumps(data)), DATA)
+
+    def test_stale(self):
+        self.assertIsNone(snapshot.load(self.snapshot_file, self.json_file))
+
+        snapshot.dump(self.json_file, self.snapshot_file)
+        self.json_file.write_text(json.dumps({"foo": "bar"}), encoding="utf-8")
+        self.assertIsNone(snapshot.load(self.snapshot_file, self.json_file))
+
+    def test_value(self):
+        value = {"version": 1, "a": b"\x01\x00\x00\x00\x02\x00\x00\x00", "b": b"xyz"}
+        snapshot.dump(self.json_file, self.snapshot_file, value)
+        data = snapshot.load(self.snapshot_file, self.json_file)
+
+        self.assertEqual(data["version"], 1)
+        self.assertIsInstance(data["a"], memoryview)
+        self.assertEqual(data["a"].cast("i").tolist(), [1, 2])
+        self.assertEqual(bytes(data["b"]), b"xyz")
+
+
+class DataSnapshotsTest(SearxTestCase):
+    """The data loaders and the consumers of the data with the snapshots of
+    the JSON files in the data folder."""
+
+    def setUp(self):
+        super().setUp()
+        tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp_dir.cleanup)
+        data_dir = pathlib.Path(tmp_dir.name)
+        for name in searx.data.data_snapshots:
+            json_file = searx.data.data_json_files[name]
+            shutil.copy(searx.data.data_dir / json_file, data_dir / json_file)
+
+        for patcher in (
+            mock.patch.object(searx.data, "data_dir", data_dir),
+            mock.patch.dict(searx.data.lazy_globals, {name: None for name in searx.data.data_snapshots}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        for name in searx.data.data_snapshots:
+            snapshot.dump(data_dir / searx.data.data_json_files[name], searx.data.snapshot_file(name))
+
+    def test_loaders(self):
+        for name in sorted(searx.data.data_snapshots):
+            data = getattr(searx.data, name)
+            self.assertIsInstance(data, snapshot.SnapshotMap, name)
+            self.assertIs(getattr(searx.data, name), data)
+
+        with open(searx.data.data_dir / "engine_traits.json", encoding="utf-8") as f:
+            self.assertEqual(searx.data.ENGINE_TRAITS, json.load(f))
+
+    def test_engine_traits(self):
+        engine_traits = searx.data.ENGINE_TRAITS
+
+        with mock.patch.object(traits, "ENGINE_TRAITS", engine_traits):
+            traits_map = traits.EngineTraitsMap.from_data()
+        for name, engine_traits_obj in traits_map.items():
+            for value in (engine_traits_obj.regions, engine_traits_obj.languages, engine_traits_obj.custom):
+                self.assertIsInstance(value, dict, name)
+            json.dumps(engine_traits_obj.custom)
+            json.dumps(engine_traits_obj, cls=traits.EngineTraitsEncoder)
+
+        aa_content = traits_map["annas archive"].custom["content"][0]
+        with mock.patch.multiple(
+            annas_archive, ENGINE_TRAITS=engine_traits, base_url="https://example.org", aa_content=aa_content
+        ):
+            self.assertTrue(annas_archive.setup({}))
+
+        zlib_ext = traits_map["z-library"].custom["ext"][0]
+        with mock.patch.multiple(zlibrary, ENGINE_TRAITS=engine_traits, zlib_ext=zlib_ext):
+            self.assertTrue(zlibrary.setup({}))
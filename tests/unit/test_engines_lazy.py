@@ -0,0 +1,95 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name,no-member
+
+import pathlib
+import tempfile
+import types
+from unittest import mock
+
+from searx import settings, engines
+from searx.enginelib.lazy import EngineManifest, LazyEngine
+from tests import SearxTestCase
+
+
+class TestLazyEngines(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        manifest_file = pathlib.Path(self.tmp_dir.name) / "manifest.json"
+        patcher = mock.patch.object(EngineManifest, "MANIFEST_FILE", manifest_file)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp_dir.cleanup)
+        settings['outgoing']['using_tor_proxy'] = False
+        settings['search']['lazy_engines'] = True
+
+    def test_manifest(self):
+        manifest = EngineManifest(engines.ENGINE_DIR)
+        self.assertIsNone(manifest.get('dummy'))
+
+        module = types.ModuleType('dummy')
+        vars(module).update({'categories': ['general'], 'paging': True, 'CONSTANT': [1], 'request': print})
+        manifest.add('dummy', module)
+        module.categories.append('other')
+        manifest.save()
+
+        entry = EngineManifest.load(engines.ENGINE_DIR).get('dummy')
+        assert entry is not None
+        self.assertEqual(entry['attributes'], {'categories': ['general'], 'paging': True})
+        self.assertEqual(sorted(entry['names']), ['CONSTANT', 'request'])
+        self.assertTrue(EngineManifest.is_lazy(entry))
+
+        # the entry is stale when the source of the module has been changed
+        manifest = EngineManifest.load(engines.ENGINE_DIR)
+        manifest.modules['dummy']['digest'] = 'changed'
+        self.assertIsNone(manifest.get('dummy'))
+
+    def test_lazy_engine(self):
+        module = types.ModuleType('lazy')
+        module.request = print  # type: ignore
+        loader = mock.Mock(return_value=module)
+        entry = {'digest': '', 'attributes': {'paging': False, 'categories': ['general']}, 'names': ['request']}
+        engine = LazyEngine(entry, loader)  # type: ignore
+        engine.name = 'lazy'
+        engine.categories.append('other')
+
+        self.assertFalse(hasattr(engine, 'init'))
+        self.assertFalse(engine.paging)
+        self.assertFalse(engine.lazy_loaded)
+        loader.assert_not_called()
+
+        # first access to the module loads the module and sets the attributes
+        # that have been changed
+        self.assertIs(engine.request, module.request)
+        self.assertTrue(engine.lazy_loaded)
+        loader.assert_called_once_with(engine)
+        self.assertEqual(module.name, 'lazy')
+        self.assertEqual(module.categories, ['general', 'other'])
+        self.assertFalse(hasattr(loader.return_value, 'paging'))
+
+        engine.timeout = 3.0
+        self.assertEqual(module.timeout, 3.0)
+        self.assertEqual(entry['attributes']['categories'], ['general'])
+
+    def test_load_engines(self):
+        engine_list = [
+            {'engine': 'dummy', 'name': 'engine1', 'shortcut': 'e1'},
+            {'engine': 'dummy', 'name': 'engine2', 'shortcut': 'e2'},
+        ]
+        engines.load_engines(engine_list)
+        self.assertNotIsInstance(engines.engines['engine1'], LazyEngine)
+        self.assertTrue(EngineManifest.MANIFEST_FILE.exists())  # type: ignore
+
+        engines.load_engines(engine_list)
+        engine = engines.engines['engine1']
+        self.assertIsInstance(engine, LazyEngine)
+        self.assertFalse(engine.lazy_loaded)
+        self.assertEqual(engine.about.results, 'empty array')
+        self.assertEqual(engines.categories['general'], [engine, engines.engines['engine2']])
+
+        params = engine.request('test', {})
+        self.assertEqual(params, {})
+        self.assertTrue(engine.lazy_loaded)
+        self.assertEqual(engine.shortcut, 'e1')
+        self.assertFalse(engines.engines['engine2'].lazy_loaded)
@@ -2,6 +2,7 @@
 # pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
 
 from searx.external_bang import (
+    BangTrie,
     get_node,
     resolve_bang_definition,
     get_bang_url,
@@ -111,6 +112,44 @@ class TestGetBangDefinitionAndAutocomplete(SearxTestCase):
         self.assertEqual(new_autocomplete, [])
 
 
+class TestBangTrie(SearxTestCase):
+
+    def test_definition(self):
+        trie = BangTrie.build(TEST_DB)
+        self.assertEqual(trie.definition('sea'), TEST_DB['trie']['sea'][LEAF_KEY])
+        self.assertEqual(trie.definition('searching'), TEST_DB['trie']['sea']['rch']['ing'])
+        self.assertIsNone(trie.definition('sear'))
+        self.assertIsNone(trie.definition('error'))
+        self.assertIsNone(trie.definition(''))
+
+    def test_autocomplete_rank(self):
+        db = {
+            'trie': {
+                'a': {
+                    LEAF_KEY: 'a' + chr(1) + '5',
+                    'b': 'ab' + chr(1) + '1',
+                    'c': 'ac' + chr(1) + '10',
+                    'd': 'ad' + chr(1),
+                },
+            }
+        }
+        trie = BangTrie.build(db)
+        self.assertEqual(trie.autocomplete(''), ['ac', 'a', 'ab', 'ad'])
+        self.assertEqual(trie.autocomplete('a'), ['ac', 'ab', 'ad'])
+        self.assertEqual(trie.autocomplete('ab'), [])
+        self.assertEqual(trie.autocomplete('x'), [])
+
+    def test_snapshot(self):
+        trie = BangTrie.build(TEST_DB)
+        value = trie.to_snapshot()
+        self.assertIsNone(BangTrie.from_snapshot({**value, 'version': 0}))
+
+        copy = BangTrie.from_snapshot({k: memoryview(v) if isinstance(v, bytes) else v for k, v in value.items()})
+        for bang in ['sea', 'exam', 'examp', 'seas', 'error']:
+            self.assertEqual(copy.definition(bang), trie.definition(bang))
+            self.assertEqual(copy.autocomplete(bang), trie.autocomplete(bang))
+
+
 class TestExternalBangJson(SearxTestCase):
 
     def test_no_external_bang_query(self):
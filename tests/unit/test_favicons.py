@@ -0,0 +1,106 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from searx.favicons import proxy
+from searx.favicons.cache import FaviconCacheConfig, FaviconCacheMEM, FaviconCacheSQLite
+from tests import SearxTestCase
+
+
+class FaviconCacheTest(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp_dir.cleanup)
+        self.cfg = FaviconCacheConfig(db_url=tmp_dir.name + "/favicons.db")
+
+    def fill(self, cache):
+        cache.set("duckduckgo", "a.org", "image/png", b"A")
+        cache.set("duckduckgo", "b.org", "image/png", b"B")
+        cache.set("duckduckgo", "same.org", "image/png", b"A")
+        cache.set("duckduckgo", "nofavicon.org", None, None)
+        cache.set("google", "c.org", "image/png", b"C")
+
+    def test_get_many(self):
+        authorities = ["a.org", "b.org", "same.org", "nofavicon.org", "c.org", "unknown.org", "a.org"]
+        for cache in [FaviconCacheSQLite(self.cfg), FaviconCacheMEM(self.cfg)]:
+            self.fill(cache)
+            expected = {a: cache("duckduckgo", a) for a in authorities if cache("duckduckgo", a) is not None}
+            self.assertEqual(
+                expected,
+                {
+                    "a.org": (b"A", "image/png"),
+                    "b.org": (b"B", "image/png"),
+                    "same.org": (b"A", "image/png"),
+                    "nofavicon.org": (None, None),
+                },
+            )
+            self.assertEqual(cache.get_many("duckduckgo", authorities), expected)
+            self.assertEqual(cache.get_many("duckduckgo", []), {})
+
+    def test_get_many_chunks(self):
+        cache = FaviconCacheSQLite(self.cfg)
+        authorities = [f"{i}.org" for i in range(3 * cache.SQL_MAX_PARAMS + 1)]
+        for authority in authorities[::7]:
+            cache.set("duckduckgo", authority, "image/png", authority.encode())
+        self.assertEqual(
+            cache.get_many("duckduckgo", authorities),
+            {a: (a.encode(), "image/png") for a in authorities[::7]},
+        )
+
+    def test_fallback_hold_time(self):
+        for cache in [FaviconCacheSQLite(self.cfg), FaviconCacheMEM(self.cfg)]:
+            self.fill(cache)
+            later = time.time() + self.cfg.FALLBACK_HOLD_TIME + 10
+            with mock.patch("searx.favicons.cache.time.time", return_value=later):
+                # negative results are resolved again ..
+                self.assertIsNone(cache("duckduckgo", "nofavicon.org"))
+                self.assertEqual(
+                    cache.get_many("duckduckgo", ["a.org", "nofavicon.org"]), {"a.org": (b"A", "image/png")}
+                )
+                # .. favicons are kept
+                self.assertEqual(cache("duckduckgo", "a.org"), (b"A", "image/png"))
+
+    def test_maintenance(self):
+        cfg = FaviconCacheConfig(db_url=self.cfg.db_url, FALLBACK_HOLD_TIME=-10)
+        cache = FaviconCacheSQLite(cfg)
+        self.fill(cache)
+        cache.maintenance(force=True)
+        self.assertEqual(cache.DB.execute("SELECT count(*) FROM blob_map").fetchone()[0], 4)
+        self.assertIsNone(cache("duckduckgo", "nofavicon.org"))
+
+
+class FaviconPrefetcherTest(SearxTestCase):
+
+    def test_prefetch(self):
+        release = threading.Event()
+        resolved: list[tuple[str, str]] = []
+
+        def search_favicon(resolver, authority):
+            release.wait(5)
+            resolved.append((resolver, authority))
+            return None, None
+
+        prefetcher = proxy.FaviconPrefetcher(workers=1, max_pending=2)
+        with mock.patch("searx.favicons.proxy.search_favicon", search_favicon):
+            self.assertTrue(prefetcher.submit("duckduckgo", "a.org"))
+            self.assertFalse(prefetcher.submit("duckduckgo", "a.org"))
+            self.assertTrue(prefetcher.submit("duckduckgo", "b.org"))
+            # the queue is full
+            self.assertFalse(prefetcher.submit("duckduckgo", "c.org"))
+            self.assertTrue(prefetcher.in_flight("duckduckgo", "a.org"))
+            self.assertFalse(prefetcher.in_flight("google", "a.org"))
+
+            release.set()
+            for _ in range(100):
+                if not prefetcher.in_flight("duckduckgo", "b.org"):
+                    break
+                time.sleep(0.05)
+
+        self.assertFalse(prefetcher.in_flight("duckduckgo", "a.org"))
+        self.assertEqual(resolved, [("duckduckgo", "a.org"), ("duckduckgo", "b.org")])
@@ -0,0 +1,150 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import hashlib
+import pathlib
+import tempfile
+
+from mock import Mock
+
+import searx.webapp
+from searx import image_proxy_cache, metrics, settings
+from searx.image_proxy_cache import ImageProxyCache
+from searx.webutils import new_hmac
+from tests import SearxTestCase
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"x" * 100
+
+
+class ImageProxyCacheTest(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = pathlib.Path(tmp_dir.name)
+
+    def add(self, cache: ImageProxyCache, url: str, data: bytes, max_file_bytes: int = 1000):
+        writer = cache.writer(url, "image/png", '"etag"', None, max_file_bytes)
+        writer.write(data[:10])
+        writer.write(data[10:])
+        writer.commit()
+
+    def test_content_addressed(self):
+        cache = ImageProxyCache(self.path, 1000)
+        self.assertIsNone(cache.get("https://example.org/a.png"))
+
+        self.add(cache, "https://example.org/a.png", PNG)
+        self.add(cache, "https://example.org/b.png", PNG)
+        image = cache.get("https://example.org/a.png")
+        self.assertEqual(image.sha256, hashlib.sha256(PNG).hexdigest())
+        self.assertEqual(image.path.read_bytes(), PNG)
+        self.assertEqual((image.mime, image.etag), ("image/png", '"etag"'))
+        self.assertEqual(cache.get("https://example.org/b.png").path, image.path)
+        self.assertEqual(cache.state(), {"files": 1, "bytes": len(PNG), "urls": 2})
+        self.assertEqual(list((self.path / "tmp").iterdir()), [])
+
+    def test_max_file_bytes(self):
+        cache = ImageProxyCache(self.path, 1000)
+        self.add(cache, "https://example.org/a.png", PNG, max_file_bytes=50)
+        self.assertIsNone(cache.get("https://example.org/a.png"))
+        self.assertEqual(list((self.path / "tmp").iterdir()), [])
+
+    def test_no_tmp_file_before_write(self):
+        cache = ImageProxyCache(self.path, 1000)
+        writer = cache.writer("https://example.org/a.png", "image/png", None, None, 1000)
+        self.assertEqual(list((self.path / "tmp").iterdir()), [])
+        writer.discard()
+        writer.write(PNG)
+        self.assertEqual(list((self.path / "tmp").iterdir()), [])
+
+    def test_evict(self):
+        cache = ImageProxyCache(self.path, 2 * len(PNG + b"a"))
+        self.add(cache, "a", PNG + b"a")
+        self.add(cache, "b", PNG + b"b")
+        with cache.DB as conn:
+            conn.execute("UPDATE files SET a_time = 100")
+        # access of "a" --> "b" is the least recently used file
+        cache.get("a")
+
+        self.add(cache, "c", PNG + b"c")
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertEqual(cache.state()["files"], 2)
+        self.assertEqual(len(list((self.path / "files").glob("*/*"))), 2)
+
+
+class ImageProxyViewTest(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp_dir.cleanup)
+        self.setattr4test(image_proxy_cache, "CACHE", ImageProxyCache(pathlib.Path(tmp_dir.name), 10000))
+        self.upstream = Mock(side_effect=self.upstream_stream)
+        self.setattr4test(searx.webapp, "http_stream", self.upstream)
+        self.url = "https://example.org/image.png"
+
+    @staticmethod
+    def upstream_stream(method, url, headers, **kwargs):  # pylint: disable=unused-argument
+        if headers.get("If-None-Match") == '"v1"':
+            resp = Mock(status_code=304, headers={"ETag": '"v1"'})
+            return resp, iter([])
+        resp = Mock(
+            status_code=200,
+            headers={"Content-Type": "image/png", "Content-Length": str(len(PNG)), "ETag": '"v1"'},
+        )
+        return resp, iter([PNG[:50], PNG[50:]])
+
+    def get(self, **headers):
+        h = new_hmac(settings["server"]["secret_key"], self.url.encode())
+        return self.client.get("/image_proxy", query_string={"url": self.url, "h": h}, headers=headers)
+
+    def test_cache(self):
+        upstream_bytes = metrics.counter("image_proxy", "bytes", "upstream")
+        cache_bytes = metrics.counter("image_proxy", "bytes", "cache")
+
+        resp = self.get()
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, PNG)
+        self.assertEqual(resp.headers["ETag"], '"v1"')
+        resp.close()
+        self.assertEqual(metrics.counter("image_proxy", "bytes", "upstream"), upstream_bytes + len(PNG))
+
+        # the second request is served from the cache
+        resp = self.get()
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, PNG)
+        self.assertEqual(resp.headers["ETag"], '"v1"')
+        resp.close()
+        self.assertEqual(self.upstream.call_count, 1)
+        self.assertEqual(metrics.counter("image_proxy", "bytes", "cache"), cache_bytes + len(PNG))
+
+        # conditional requests and ranges are answered from the cache
+        resp = self.get(**{"If-None-Match": '"v1"'})
+        self.assertEqual(resp.status_code, 304)
+        resp = self.get(Range="bytes=0-7")
+        self.assertEqual(resp.status_code, 206)
+        self.assertEqual(resp.data, PNG[:8])
+        resp.close()
+        self.assertEqual(self.upstream.call_count, 1)
+
+    def test_head(self):
+        # the stream of a HEAD request is never consumed
+        resp = self.client.head(
+            "/image_proxy",
+            query_string={"url": self.url, "h": new_hmac(settings["server"]["secret_key"], self.url.encode())},
+        )
+        self.assertEqual(resp.status_code, 200)
+        resp.close()
+        cache = image_proxy_cache.CACHE
+        self.assertIsNone(cache.get(self.url))
+        self.assertEqual(list((cache.path / "tmp").iterdir()), [])
+
+    def test_not_modified(self):
+        self.setattr4test(image_proxy_cache, "CACHE", None)
+        resp = self.get(**{"If-None-Match": '"v1"'})
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp.headers["ETag"], '"v1"')
+        self.assertEqual(self.upstream.call_args.kwargs["headers"]["If-None-Match"], '"v1"')
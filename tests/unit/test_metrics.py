@@ -0,0 +1,159 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+from collections import defaultdict
+
+from searx import metrics, settings
+from searx.metrics.error_recorder import ErrorContext
+from searx.metrics.models import CounterStorage, HistogramStorage
+from searx.metrics.shared import ValkeyMetrics
+
+from tests import SearxTestCase
+
+
+class FakeValkey:
+    """Hashes of a Valkey DB, only the commands used by
+    :py:obj:`ValkeyMetrics` are implemented."""
+
+    def __init__(self):
+        self.hashes: dict[str, dict[bytes, float]] = defaultdict(dict)
+        self.ttls: dict[str, int] = {}
+        self.commands: list = []
+
+    def pipeline(self, transaction=True):  # pylint: disable=unused-argument
+        self.commands = []
+        return self
+
+    def hincrby(self, key, field, value):
+        self.commands.append(("hincr", key, field, value))
+
+    hincrbyfloat = hincrby
+
+    def hgetall(self, key):
+        self.commands.append(("hgetall", key))
+
+    def expire(self, key, seconds):
+        self.commands.append(("expire", key, seconds))
+
+    def execute(self):
+        ret = []
+        for cmd in self.commands:
+            if cmd[0] == "hincr":
+                _, key, field, value = cmd
+                h = self.hashes[key]
+                h[field.encode()] = h.get(field.encode(), 0) + value
+                ret.append(h[field.encode()])
+            elif cmd[0] == "expire":
+                _, key, seconds = cmd
+                if key in self.hashes:
+                    self.ttls[key] = seconds
+                ret.append(key in self.hashes)
+            else:
+                ret.append({k: str(v).encode() for k, v in self.hashes[cmd[1]].items()})
+        return ret
+
+
+class Worker:  # pylint: disable=too-few-public-methods
+
+    def __init__(self, db: FakeValkey):
+        self.counters = CounterStorage()
+        self.counters.configure('engine', 'foo', 'search', 'count', 'sent')
+        self.histograms = HistogramStorage()
+        self.histograms.configure(1, 10, 'engine', 'foo', 'result', 'count')
+        self.errors: dict = {}
+        self.shared = ValkeyMetrics(db, self.counters, self.histograms, self.errors, flush_interval=5)
+
+
+class ValkeyMetricsTestCase(SearxTestCase):
+
+    def test_sync(self):
+        db = FakeValkey()
+        w1, w2 = Worker(db), Worker(db)
+
+        w1.counters.add(2, 'engine', 'foo', 'search', 'count', 'sent')
+        w2.counters.add(3, 'engine', 'foo', 'search', 'count', 'sent')
+        w1.histograms.get('engine', 'foo', 'result', 'count').observe(4)
+        w2.histograms.get('engine', 'foo', 'result', 'count').observe(6)
+        ctx = ErrorContext('searx/engines/foo.py', 'response', 1, 'code', 'KeyError', None, ('a',), False)
+        w2.errors['foo'] = {ctx: 1}
+
+        w1.shared.sync(load=False)
+        w2.shared.sync()
+        self.assertEqual(w2.counters.get('engine', 'foo', 'search', 'count', 'sent'), 5)
+        h = w2.histograms.get('engine', 'foo', 'result', 'count')
+        self.assertEqual(h.count, 2)
+        self.assertEqual(h.sum, 10)
+        self.assertEqual(h.quartiles[4], 1)
+        self.assertEqual(h.quartiles[6], 1)
+
+        # increments recorded after the flush are not lost by the load
+        w1.counters.add(1, 'engine', 'foo', 'search', 'count', 'sent')
+        w1.shared.sync()
+        self.assertEqual(w1.counters.get('engine', 'foo', 'search', 'count', 'sent'), 6)
+        self.assertEqual(w1.histograms.get('engine', 'foo', 'result', 'count').count, 2)
+        self.assertEqual(w1.errors, {'foo': {ctx: 1}})
+
+        # a second sync does not count the increments twice
+        w2.shared.sync()
+        w2.shared.sync()
+        self.assertEqual(w2.counters.get('engine', 'foo', 'search', 'count', 'sent'), 6)
+        self.assertEqual(w2.errors, {'foo': {ctx: 1}})
+
+        # the keys of the node expire when no worker flushes its increments
+        self.assertEqual(sorted(db.ttls), sorted(db.hashes))
+        self.assertEqual(set(db.ttls.values()), {60})
+
+    def test_sync_error(self):
+        db = FakeValkey()
+        w = Worker(db)
+        w.counters.add(2, 'engine', 'foo', 'search', 'count', 'sent')
+
+        def execute():
+            raise ConnectionError("DB is down")
+
+        with self.assertLogs('searx.searx.metrics.shared', level='ERROR'):
+            setattr(db, 'execute', execute)
+            w.shared.sync()
+        del db.execute
+
+        # the increments are pushed with the next sync
+        w.shared.sync()
+        self.assertEqual(w.counters.get('engine', 'foo', 'search', 'count', 'sent'), 2)
+        self.assertEqual(db.hashes[f"{w.shared.prefix}|counter"][b'engine|foo|search|count|sent'], 2)
+
+
+class EngineTimeoutTestCase(SearxTestCase):
+
+    ENGINE_NAME = "dummy engine"  # from the ./settings/test_settings.yml
+
+    def setUp(self):
+        super().setUp()
+        metrics.initialize([self.ENGINE_NAME])
+        settings['search']['adaptive_timeout'].update(
+            {'enabled': True, 'percentile': 95, 'factor': 1.5, 'min_count': 20, 'min': 1.0, 'max': 6.0}
+        )
+
+    def observe(self, value, count=20):
+        for _ in range(count):
+            metrics.histogram_observe(value, 'engine', self.ENGINE_NAME, 'time', 'total')
+
+    def test_static(self):
+        # not enough response times
+        self.observe(2.0, count=19)
+        self.assertEqual(metrics.get_engine_timeout(self.ENGINE_NAME), 3)
+
+        settings['search']['adaptive_timeout']['enabled'] = False
+        self.observe(2.0)
+        self.assertEqual(metrics.get_engine_timeout(self.ENGINE_NAME), 3)
+
+    def test_adaptive(self):
+        self.observe(1.0)
+        self.assertEqual(metrics.get_engine_timeout(self.ENGINE_NAME), 1.5)
+
+    def test_bounds(self):
+        self.observe(0.1)
+        self.assertEqual(metrics.get_engine_timeout(self.ENGINE_NAME), 1.0)
+
+        metrics.initialize([self.ENGINE_NAME])
+        self.observe(4.4)
+        self.assertEqual(metrics.get_engine_timeout(self.ENGINE_NAME), 6.0)
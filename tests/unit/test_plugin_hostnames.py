@@ -0,0 +1,64 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import re
+
+from parameterized.parameterized import parameterized
+
+from searx.plugins.hostnames import HostnameMatcher
+from tests import SearxTestCase
+
+PATTERNS = [
+    r"^example\.org$",
+    r"^(.*\.)?example\.com$",
+    r"(.*\.)?example\.net$",
+    r"facebook.com$",
+    r"(.*\.)?google(\..*)?$",
+    r"^(?:.*\.)?wikipedia\.org$",
+]
+
+
+class HostnameMatcherTest(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.patterns = [re.compile(p) for p in PATTERNS]
+        self.matcher = HostnameMatcher(self.patterns)
+
+    @parameterized.expand(
+        [
+            "example.org",
+            "www.example.org",
+            "example.org.evil",
+            "example.com",
+            "www.example.com",
+            "notexample.com",
+            "example.net",
+            "notexample.net",
+            "facebook.com",
+            "facebookXcom",
+            "www.google.de",
+            "google",
+            "en.wikipedia.org",
+            "wikipedia.org:443",
+            "searxng.org",
+            "",
+        ]
+    )
+    def test_match(self, hostname: str):
+        # same result as the search of each regular expression
+        expected = next((p for p in self.patterns if p.search(hostname)), None)
+        self.assertIs(self.matcher.match(hostname), expected)
+
+    def test_order(self):
+        patterns = [re.compile(p) for p in (r"^(.*\.)?google(\..*)?$", r"^(.*\.)?google\.com$", r"google\.com$")]
+        matcher = HostnameMatcher(patterns)
+        self.assertIs(matcher.match("www.google.com"), patterns[0])
+        self.assertIs(HostnameMatcher(patterns[1:]).match("www.google.com"), patterns[1])
+
+    def test_backreference(self):
+        patterns = [re.compile(r"^(\w+)\.\1\.org$"), re.compile(r"^(\w+)\.com$")]
+        matcher = HostnameMatcher(patterns)
+        self.assertIs(matcher.match("foo.foo.org"), patterns[0])
+        self.assertIsNone(matcher.match("foo.bar.org"))
+        self.assertIs(matcher.match("foo.com"), patterns[1])
@@ -1,6 +1,7 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
 
+import threading
 
 from searx.result_types import LegacyResult
 from searx.results import ResultContainer
@@ -40,6 +41,46 @@ class ResultContainerTestCase(SearxTestCase):
         self.assertEqual(len(container.suggestions), 1)
         self.assertIn(result["suggestion"], container.suggestions)
 
+    def test_on_extend(self):
+        calls = []
+        container = ResultContainer()
+        container.on_extend = lambda engine_name, added: calls.append((engine_name, added))
+        container.extend(
+            "google",
+            [
+                dict(url="https://example.org", title="title ..", content="Lorem .."),
+                dict(suggestion="lorem ipsum .."),
+            ],
+        )
+
+        self.assertEqual(len(calls), 1)
+        engine_name, added = calls[0]
+        self.assertEqual(engine_name, "google")
+        self.assertEqual([r.url for r in added["results"]], ["https://example.org"])
+        self.assertEqual(added["suggestions"], ["lorem ipsum .."])
+        self.assertEqual(added["answers"], [])
+
+    def test_on_extend_locked(self):
+        # while on_extend serializes the results, other engine threads can't
+        # merge their results into them
+        acquired = []
+        container = ResultContainer()
+
+        def try_lock():
+            lock = container._lock  # pylint: disable=protected-access
+            acquired.append(lock.acquire(blocking=False))  # pylint: disable=consider-using-with
+            if acquired[-1]:
+                lock.release()
+
+        def on_extend(_engine_name, _added):
+            thread = threading.Thread(target=try_lock)
+            thread.start()
+            thread.join()
+
+        container.on_extend = on_extend
+        container.extend("google", [dict(url="https://example.org", title="title ..", content="Lorem ..")])
+        self.assertEqual(acquired, [False])
+
     def test_merge_url_result(self):
         # from the merge of eng1 and eng2 we expect this result
         result = LegacyResult(
@@ -58,3 +99,23 @@ class ResultContainerTestCase(SearxTestCase):
         self.assertIn(result, result_list)
         self.assertEqual(result_list[0].title, result.title)
         self.assertEqual(result_list[0].content, result.content)
+
+    def test_ordered_results(self):
+        results = [
+            dict(url="https://example.org/0", title="result 0"),
+            dict(url="https://example.org/1", title="result 1", thumbnail="https://example.org/1.jpg"),
+            dict(url="https://example.org/2", title="result 2"),
+            dict(url="https://example.org/3", title="result 3", thumbnail="https://example.org/3.jpg"),
+        ]
+
+        container = ResultContainer()
+        container.extend("google", results)
+        # result 3 is found by two engines
+        container.extend("duckduckgo", [dict(url="https://example.org/3", title="result 3")])
+        container.close()
+
+        result_list = container.get_ordered_results()
+        # results with a thumbnail are grouped
+        self.assertEqual([r.url for r in result_list], [f"https://example.org/{i}" for i in (3, 1, 0, 2)])
+        self.assertEqual(result_list[0].score, 2 * (1 / 4 + 1 / 1))
+        self.assertEqual(result_list[1].score, 1 / 2)
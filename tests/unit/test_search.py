@@ -1,17 +1,23 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
 
+import tempfile
+import threading
 from copy import copy
 
 import searx.search
+import searx.search.dispatcher
 from searx.search.models import SearchQuery, EngineRef
 from searx import settings
+from searx.cache import ExpireCacheCfg, ExpireCacheSQLite
+from searx.search.result_cache import RESULT_CACHE
 from tests import SearxTestCase
 
 
 SAFESEARCH = 0
 PAGENO = 1
 PUBLIC_ENGINE_NAME = "dummy engine"  # from the ./settings/test_settings.yml
+PRIVATE_ENGINE_NAME = "dummy private engine"
 
 
 class SearchQueryTestCase(SearxTestCase):
@@ -118,3 +124,181 @@ class SearchTestCase(SearxTestCase):
             results = search.search()
         # This should not redirect
         self.assertIsNone(results.redirect_url)
+
+
+class SearchDispatcherTestCase(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.setattr4test(searx.search.dispatcher, "_EXECUTOR", None)
+        settings['search']['dispatcher']['mode'] = 'executor'
+        settings['outgoing']['max_request_timeout'] = None
+
+    def _search(self, timeout_limit=None, engine_names=(PUBLIC_ENGINE_NAME,)) -> searx.search.Search:
+        search_query = SearchQuery(
+            'test',
+            [EngineRef(name, 'general') for name in engine_names],
+            'en-US',
+            SAFESEARCH,
+            PAGENO,
+            None,
+            timeout_limit,
+        )
+        search = searx.search.Search(search_query)
+        with self.app.test_request_context('/search'):
+            search.search()
+        return search
+
+    def test_executor(self):
+        search = self._search()
+        self.assertEqual(search.result_container.unresponsive_engines, set())
+        self.assertEqual(len(search.result_container.timings), 1)
+        self.assertIsNotNone(searx.search.dispatcher._EXECUTOR)  # pylint: disable=protected-access
+
+    def test_executor_timeout(self):
+        processor = searx.search.PROCESSORS[PUBLIC_ENGINE_NAME]
+        engine_search = processor.engine.search
+        done = threading.Event()
+
+        def slow_search(query, params):
+            done.wait(5)
+            return engine_search(query, params)
+
+        self.setattr4test(processor.engine, "search", slow_search)
+        search = self._search(timeout_limit=0.1)
+        done.set()
+
+        self.assertEqual(len(search.result_container.unresponsive_engines), 1)
+        self.assertEqual(list(search.result_container.unresponsive_engines)[0].error_type, 'timeout')
+
+    def test_early_return(self):
+        settings['search']['dispatcher']['early_return'].update(
+            {'enabled': True, 'min_results': 1, 'min_engines': 1, 'min_weight': 0}
+        )
+        processor = searx.search.PROCESSORS[PRIVATE_ENGINE_NAME]
+        done = threading.Event()
+
+        def slow_search(query, params):  # pylint: disable=unused-argument
+            done.wait(5)
+            return []
+
+        self.setattr4test(processor.engine, "search", slow_search)
+        search = self._search(timeout_limit=3, engine_names=(PUBLIC_ENGINE_NAME, PRIVATE_ENGINE_NAME))
+        done.set()
+
+        # the slow engine is not awaited and not reported as unresponsive
+        self.assertEqual(search.result_container.unresponsive_engines, set())
+        self.assertEqual([timing.engine for timing in search.result_container.timings], [PUBLIC_ENGINE_NAME])
+
+    def test_hedging(self):
+        settings['search']['dispatcher']['hedging']['enabled'] = True
+        self.setattr4test(searx.search.dispatcher, "hedge_delay", lambda engine_name: 0.05)
+
+        processor = searx.search.PROCESSORS[PUBLIC_ENGINE_NAME]
+        engine_search = processor.engine.search
+        done = threading.Event()
+        calls = []
+
+        def first_slow_search(query, params):
+            calls.append(query)
+            if len(calls) == 1:
+                done.wait(5)
+            return engine_search(query, params)
+
+        self.setattr4test(processor.engine, "search", first_slow_search)
+        search = self._search(timeout_limit=1)
+        done.set()
+
+        # the results of the hedged request are added once
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(search.result_container.unresponsive_engines, set())
+        self.assertEqual(len(search.result_container.timings), 1)
+
+    def test_saturated(self):
+        settings['search']['dispatcher']['max_workers'] = 1
+        settings['search']['dispatcher']['hedging']['enabled'] = True
+        self.setattr4test(searx.search.dispatcher, "hedge_delay", lambda engine_name: 0.05)
+
+        processor = searx.search.PROCESSORS[PUBLIC_ENGINE_NAME]
+        engine_search = processor.engine.search
+        done = threading.Event()
+        calls = []
+
+        def first_slow_search(query, params):
+            calls.append(threading.current_thread().name)
+            if len(calls) == 1:
+                done.wait(5)
+            return engine_search(query, params)
+
+        self.setattr4test(processor.engine, "search", first_slow_search)
+        self.addCleanup(done.set)
+
+        # the request that timed out keeps the only worker of the pool busy,
+        # no hedged request is sent
+        search = self._search(timeout_limit=0.2)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(search.result_container.unresponsive_engines), 1)
+
+        # the request of the next search is not queued behind the busy worker
+        search = self._search(timeout_limit=1)
+        self.assertEqual(len(calls), 2)
+        self.assertFalse(calls[1].startswith("search_"))
+        self.assertEqual(search.result_container.unresponsive_engines, set())
+        self.assertEqual(len(search.result_container.timings), 1)
+
+
+class SearchResultCacheTestCase(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        settings['search']['result_cache']['enabled'] = True
+        self.cache_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.cache_dir.cleanup)
+        cache = ExpireCacheSQLite(ExpireCacheCfg(name="RESULT_CACHE", db_url=self.cache_dir.name + "/cache.db"))
+        self.setattr4test(RESULT_CACHE, "_cache", cache)
+
+        processor = searx.search.PROCESSORS[PUBLIC_ENGINE_NAME]
+        engine_search = processor.engine.search
+        self.calls = 0
+
+        def counting_search(query, params):
+            self.calls += 1
+            return engine_search(query, params)
+
+        self.setattr4test(processor.engine, "search", counting_search)
+
+    def _search(self, query='test', lang='en-US') -> searx.search.Search:
+        search_query = SearchQuery(query, [EngineRef(PUBLIC_ENGINE_NAME, 'general')], lang, SAFESEARCH, PAGENO)
+        search = searx.search.Search(search_query)
+        with self.app.test_request_context('/search'):
+            search.search()
+        return search
+
+    def test_hit(self):
+        first = self._search()
+        second = self._search()
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(
+            [r.url for r in first.result_container.get_ordered_results()],
+            [r.url for r in second.result_container.get_ordered_results()],
+        )
+
+    def test_miss(self):
+        self._search()
+        self._search(lang='de-DE')
+        self._search(query='other')
+        self.assertEqual(self.calls, 3)
+
+    def test_ttl_zero(self):
+        engine = searx.search.PROCESSORS[PUBLIC_ENGINE_NAME].engine
+        engine.result_cache_ttl = 0
+        self.addCleanup(delattr, engine, "result_cache_ttl")
+        self._search()
+        self._search()
+        self.assertEqual(self.calls, 2)
+
+    def test_unpicklable(self):
+        search_query = SearchQuery('test', [EngineRef(PUBLIC_ENGINE_NAME, 'general')], 'en-US', SAFESEARCH, PAGENO)
+        with self.assertLogs('searx.search.result_cache', level='WARNING'):
+            self.assertFalse(RESULT_CACHE.set(search_query, {PUBLIC_ENGINE_NAME: [lambda: None]}))  # type: ignore
+        self.assertEqual(RESULT_CACHE.get(search_query), {})
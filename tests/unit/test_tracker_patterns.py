@@ -0,0 +1,57 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+from parameterized.parameterized import parameterized
+
+from searx.data.tracker_patterns import TrackerPatternsDB, required_literal
+from tests import SearxTestCase
+
+RULES = [
+    (
+        r"^https?:\/\/(?:[a-z0-9-]+\.)*?google(?:\.[a-z]{2,}){1,}",
+        [r"^https?:\/\/mail\.google\.com\/mail\/u\/"],
+        ["ved", "ei", "cd", "cd"],
+    ),
+    (r".*", [], ["(?:%3F)?utm(?:_[a-z_]*)?", "(?:%3F)?fbclid"]),
+    (r"^https?:\/\/(?:[a-z0-9-]+\.)*?youtube\.com", [], ["feature", "si"]),
+]
+
+
+class TrackerPatternsTest(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.db = TrackerPatternsDB()
+        self.setattr4test(self.db, "init", lambda: None)
+        self.setattr4test(self.db, "rules", lambda: iter(RULES))
+
+    @parameterized.expand(
+        [
+            (r"^https?:\/\/(?:[a-z0-9-]+\.)*?amazon(?:\.[a-z]{2,}){1,}", "amazon"),
+            (r"^https?:\/\/(?:[a-z0-9-]+\.)*?youtube\.com", "youtube.com"),
+            (r"^https?:\/\/(?:[a-z0-9-]+\.)*?ebay(?:\.[a-z]{2,}){1,}", "ebay"),
+            (r".*", None),
+            (r"(?i)^https?:\/\/example\.org", None),
+            (r"^https?:\/\/(?:foo|bar)\.org", ".org"),
+        ]
+    )
+    def test_required_literal(self, pattern: str, literal: str | None):
+        self.assertEqual(required_literal(pattern), literal)
+
+    @parameterized.expand(
+        [
+            ("https://www.google.com/search?q=a&ved=1&ei=2&cd=3", "https://www.google.com/search?q=a"),
+            ("https://mail.google.com/mail/u/0?ved=1", True),
+            ("https://example.org/?utm_source=x&a=1", "https://example.org/?a=1"),
+            ("https://www.youtube.com/watch?v=1&feature=share&fbclid=1", "https://www.youtube.com/watch?v=1"),
+            ("https://example.org/foo", True),
+            ("https://example.org/?q=", True),
+        ]
+    )
+    def test_clean_url(self, url: str, expected: bool | str):
+        self.assertEqual(self.db.clean_url(url), expected)
+
+    def test_compiled_rules_cached(self):
+        rules = self.db.compiled_rules()
+        self.assertEqual(len(rules), len(RULES))
+        self.assertIs(self.db.compiled_rules(), rules)
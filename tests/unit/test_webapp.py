@@ -138,6 +138,17 @@ class ViewsTestCase(SearxTestCase):  # pylint: disable=too-many-public-methods
         self.assertEqual(result_dict['results'][0]['content'], 'first test content')
         self.assertEqual(result_dict['results'][0]['url'], 'http://first.test.xyz')
 
+    def test_search_ndjson(self):
+        result = self.client.post('/search', data={'q': 'test', 'format': 'ndjson'})
+        self.assertEqual(result.mimetype, 'application/x-ndjson')
+        lines = [json.loads(line) for line in result.data.decode().splitlines()]
+
+        final = lines[-1]
+        self.assertEqual(final['type'], 'final')
+        self.assertEqual('test', final['query'])
+        self.assertEqual(len(final['results']), 2)
+        self.assertEqual(final['results'][0]['url'], 'http://first.test.xyz')
+
     def test_index_csv(self):
         result = self.client.post('/', data={'q': 'test', 'format': 'csv'})
         self.assertEqual(result.status_code, 308)
@@ -9,6 +9,7 @@ data.:
   useragents    : update searx/data/useragents.json with the most recent versions of Firefox
   locales       : update searx/data/locales.json from babel
   currencies    : update searx/data/currencies.json from wikidata
+  snapshots     : build searx/data/*.snapshot from the JSON files
 EOF
 }
 
@@ -23,7 +24,7 @@ data.all() {
 
         build_msg DATA "update searx/data/osm_keys_tags.json"
         pyenv.cmd python searxng_extra/update/update_osm_keys_tags.py
-        build_msg DATA "update searx/data/ahmia_blacklist.txt"
+        build_msg DATA "update searx/data/ahmia_blacklist.bin"
         python searxng_extra/update/update_ahmia_blacklist.py
         build_msg DATA "update searx/data/wikidata_units.json"
         python searxng_extra/update/update_wikidata_units.py
@@ -33,9 +34,16 @@ data.all() {
         python searxng_extra/update/update_external_bangs.py
         build_msg DATA "update searx/data/engine_descriptions.json"
         python searxng_extra/update/update_engine_descriptions.py
+        data.snapshots
     )
 }
 
+data.snapshots() {
+    build_msg DATA "build searx/data/*.snapshot"
+    pyenv.cmd python -m searx.data snapshot
+    dump_return $?
+}
+
 data.traits() {
     (
         set -e